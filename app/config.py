@@ -1,11 +1,101 @@
 from __future__ import annotations
 
+from typing import List, Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     # Model versiyonunu ortam değişkeniyle yönetmek için tek giriş noktası.
     MODEL_VERSION: str = "churn_lr_v1"
+    # Bellekte aynı anda tutulacak en fazla model versiyonu (aktif dahil).
+    MODEL_REGISTRY_MAX_VERSIONS: int = 3
+
+    # Dinamik micro-batching (opt-in): eşzamanlı küçük /predict request'leri
+    # en fazla BATCH_MAX_WAIT_US mikro saniye bekletilip tek skor çağrısında
+    # birleştirilir. BATCH_MAX_SIZE ve üzeri kayıt içeren request'ler batcher'a
+    # girmeden doğrudan skorlanır.
+    BATCHING_ENABLED: bool = False
+    BATCH_MAX_SIZE: int = 256
+    BATCH_MAX_WAIT_US: int = 2000
+
+    # /predict/stream: NDJSON girdisi bu kadar satırlık parçalarla skorlanır.
+    STREAM_CHUNK_SIZE: int = 1000
+
+    # Prediction cache (opt-in): aynı feature vektörü + model versiyonu için
+    # olasılık tekrar hesaplanmaz. LRU ile sınırlı; TTL verilmezse süresizdir.
+    PREDICTION_CACHE_ENABLED: bool = False
+    PREDICTION_CACHE_MAX_ENTRIES: int = 100_000
+    PREDICTION_CACHE_TTL_SECONDS: Optional[float] = None
+
+    # Prometheus formatında /metrics: aşama bazlı gecikme histogramları,
+    # request/kayıt sayaçları, in-flight gauge'ları. Ek maliyeti request başına
+    # birkaç mikro saniyedir; varsayılan olarak açıktır.
+    METRICS_ENABLED: bool = True
+
+    # Tahmin logları kuyruk + arka plan thread'i ile yazılır; ham olasılık
+    # listesi yerine özet istatistik (count, mean, quantile) JSON olarak loglanır.
+    # Kuyruk doluysa log düşürülür, request beklemez.
+    PREDICTION_LOG_ENABLED: bool = True
+    PREDICTION_LOG_QUEUE_SIZE: int = 10_000
+    # Loglanacak request oranı ve loglanan request'lerde tek tek yazılacak kayıt oranı.
+    PREDICTION_LOG_SAMPLE_RATE: float = 1.0
+    PREDICTION_LOG_RECORD_SAMPLE_RATE: float = 0.0
+
+    # Prediction response'ları bu boyutun (byte) üzerindeyse, client'ın
+    # Accept-Encoding'ine göre zstd (zstandard kuruluysa) veya gzip ile sıkıştırılır.
+    RESPONSE_COMPRESSION_ENABLED: bool = False
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 64 * 1024
+
+    # Shadow scoring: aktif versiyona gelen trafik bu versiyonlarla da skorlanır
+    # (ağırlıklar tek matriste, tek matmul); response sadece aktif versiyondan döner.
+    # Dağılım / uyuşmazlık istatistikleri arka planda hesaplanır, kuyruk doluysa düşürülür.
+    # Env: CHURNGUARD_SHADOW_MODEL_VERSIONS='["churn_lr_v2"]'
+    SHADOW_MODEL_VERSIONS: List[str] = []
+    SHADOW_QUEUE_SIZE: int = 1000
+
+    # Input drift izleme: canlı input'ların feature başına ortalama / varyansı,
+    # sürekli feature'ların ve skorun histogramı batch başına vektörel olarak
+    # güncellenir; /drift, metadata.json'daki eğitim referansıyla karşılaştırır.
+    DRIFT_MONITOR_ENABLED: bool = True
+
+    # Müşteri skor deposu (SQLite): python -m src.score_store ingest ile sadece
+    # yeni / değişmiş / eski versiyonla skorlanmış müşteriler yeniden skorlanır.
+    # Verilirse /top-risk bu dosyadan okur; None → /top-risk 404.
+    SCORE_STORE_PATH: Optional[str] = None
+    TOP_RISK_MAX_K: int = 10_000
+
+    # Admission control (opt-in): /predict, /predict/columnar, /predict/raw,
+    # /predict/binary ve /explain request'leri kayıt sayısına göre small / large lane'e girer; her
+    # lane'in ayrı eşzamanlılık limiti vardır. Limit aşımında beklemeden
+    # 413 (request çok büyük), 503 (kuyruktaki toplam kayıt dolu) veya
+    # 429 (lane ADMISSION_QUEUE_TIMEOUT_MS içinde boşalmadı) + Retry-After döner.
+    ADMISSION_ENABLED: bool = False
+    ADMISSION_LARGE_BATCH_MIN_RECORDS: int = 1000
+    ADMISSION_SMALL_CONCURRENCY: int = 32
+    ADMISSION_LARGE_CONCURRENCY: int = 2
+    ADMISSION_MAX_RECORDS_PER_REQUEST: int = 100_000
+    ADMISSION_MAX_QUEUED_RECORDS: int = 500_000
+    ADMISSION_QUEUE_TIMEOUT_MS: int = 100
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    # > 0 ise large lane'deki /predict ve /predict/columnar request'leri bu kadar
+    # process'lik ayrı bir pool'da parse edilip skorlanır (ana process'in GIL'i boş kalır).
+    ADMISSION_LARGE_BATCH_PROCESS_WORKERS: int = 0
+
+    # Açılışta aktif model bu kadar satırlık sıfır batch'le skorlanıp response
+    # serileştirmesi ısıtılır; /readyz ancak bundan sonra 200 döner (0 = kapalı).
+    STARTUP_WARMUP_ROWS: int = 64
+
+    # python -m src.serve: model parent process'te bir kere yüklenir, worker'lar
+    # fork edilip copy-on-write ile paylaşır. WEB_WORKERS=0 → CPU sayısı kadar.
+    WEB_HOST: str = "0.0.0.0"
+    WEB_PORT: int = 8000
+    WEB_WORKERS: int = 1
+    # Worker bu kadar request'ten sonra düzgünce çıkar ve yerine yenisi fork edilir
+    # (0 = kapalı). Jitter, tüm worker'ların aynı anda yenilenmesini engeller.
+    WORKER_MAX_REQUESTS: int = 0
+    WORKER_MAX_REQUESTS_JITTER: int = 0
+    WORKER_GRACEFUL_TIMEOUT: int = 30
 
     model_config = {
         # Ortam değişkenleri CHURNGUARD_ prefix'i ile okunur.
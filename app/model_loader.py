@@ -26,20 +26,30 @@ def validate_metadata(metadata: Dict[str, Any]) -> None:
         raise ValueError(f"Metadata is missing required fields: {sorted(missing)}")
 
 
+def model_dir_for(model_version: str | None = None) -> Path:
+    return BASE_DIR / "models" / (model_version or settings.MODEL_VERSION)
+
+
+def load_metadata(model_version: str | None = None) -> Dict[str, Any]:
+    # Sadece metadata.json; model artifact'ına dokunmaz.
+    metadata_path = model_dir_for(model_version) / "metadata.json"
+    if not metadata_path.exists():
+        raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
+
+    metadata = json.loads(metadata_path.read_text())
+    validate_metadata(metadata)
+    return metadata
+
+
 def load_model_and_metadata(model_version: str | None = None) -> Tuple[Any, Dict[str, Any]]:
-    version = model_version or settings.MODEL_VERSION
-    model_dir = BASE_DIR / "models" / version
+    model_dir = model_dir_for(model_version)
     model_path = model_dir / "model.pkl"
-    metadata_path = model_dir / "metadata.json"
 
     if not model_path.exists():
         raise FileNotFoundError(f"Model file not found: {model_path}")
-    if not metadata_path.exists():
-        raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
+    metadata = load_metadata(model_version)
 
     with open(model_path, "rb") as f:
         model = pickle.load(f)
-    metadata = json.loads(metadata_path.read_text())
-    validate_metadata(metadata)
 
     return model, metadata
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.model_loader import load_metadata, load_model_and_metadata, model_dir_for
+from src.artifact import has_compact_artifact, load_compact_artifact
+from src.compiled import CompiledModel
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[str], Tuple[CompiledModel, Dict[str, Any]]]
+
+# Her yüklemeye process içinde tekil numara; aynı versiyonun yeniden yüklemelerini ayırır.
+_LOAD_IDS = itertools.count(1)
+
+
+# Versiyon adı dizin adı olarak kullanılır; path traversal'a izin verilmez.
+VERSION_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+class ModelNotLoadedError(LookupError):
+    pass
+
+
+def validate_version_name(version: str) -> None:
+    if not VERSION_PATTERN.match(version) or ".." in version:
+        raise ValueError(f"Invalid model version name: {version!r}")
+
+
+def load_compiled_version(version: str) -> Tuple[CompiledModel, Dict[str, Any]]:
+    """
+    models/<version>/ altındaki artifact'ı yükleyip derler.
+    Compact (mmap) artifact varsa pickle hiç açılmaz.
+    """
+    model_dir = model_dir_for(version)
+    if has_compact_artifact(model_dir):
+        model = load_compact_artifact(model_dir)
+        metadata = load_metadata(version)
+    else:
+        artifact, metadata = load_model_and_metadata(version)
+        if not isinstance(artifact, dict):
+            raise ValueError("Model artifact format is invalid.")
+        model = CompiledModel.from_artifact(
+            artifact["model"], artifact["scaler"], list(artifact["feature_names"])
+        )
+
+    if list(model.feature_names) != list(metadata["features"]):
+        raise ValueError(f"Artifact features do not match metadata for version {version}.")
+    return model, metadata
+
+
+@dataclass
+class LoadedModel:
+    version: str
+    model: CompiledModel
+    metadata: Dict[str, Any]
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    load_id: int = field(default_factory=lambda: next(_LOAD_IDS))
+
+
+class ModelRegistry:
+    """
+    Birden fazla model versiyonunu bellekte tutar.
+
+    - Request'ler versiyon seçebilir; seçmezse aktif versiyon kullanılır.
+    - Yeni versiyon arka planda (thread'de) yüklenir, hazır olunca tek
+      atamayla yerine konur; o anda çalışan request'ler eski nesneyi
+      kullanmaya devam eder.
+    - max_versions aşılınca aktif olmayan, sabitlenmemiş (pinned, örn. shadow)
+      ve kullanımda olmayan en eski versiyon bellekten çıkarılır.
+    """
+
+    def __init__(
+        self,
+        loader: Loader = load_compiled_version,
+        max_versions: int = 3,
+        pinned_versions: Iterable[str] = (),
+    ) -> None:
+        if max_versions < 1:
+            raise ValueError("max_versions must be at least 1")
+
+        self.loader = loader
+        self.max_versions = max_versions
+        self.active_version: Optional[str] = None
+        # Shadow versiyonlar request'lerle last_used güncellemez; eviction'a hiç girmezler.
+        self.pinned_versions = frozenset(pinned_versions)
+        self._models: Dict[str, LoadedModel] = {}
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        # Model değiştiğinde çağrılır (örn. prediction cache temizliği).
+        self._listeners: List[Callable[[str], None]] = []
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        self._listeners.append(callback)
+
+    def _notify(self, version: str) -> None:
+        for callback in self._listeners:
+            callback(version)
+
+    # ---------------- yükleme ----------------
+
+    def load(self, version: str, activate: bool = False) -> LoadedModel:
+        """
+        Versiyonu senkron yükler. Aynı versiyon zaten yüklüyse yeniden
+        yüklenip atomik olarak değiştirilir.
+        """
+        validate_version_name(version)
+        model, metadata = self.loader(version)
+        entry = LoadedModel(version=version, model=model, metadata=metadata)
+
+        with self._lock:
+            replaced = version in self._models
+            self._models[version] = entry
+            self._errors.pop(version, None)
+            if activate or self.active_version is None:
+                self.active_version = version
+            evicted = self._evict_unused(keep=version)
+
+        logger.info(
+            "Model version loaded. version=%s active=%s evicted=%s",
+            version,
+            self.active_version,
+            evicted,
+        )
+        if replaced or activate:
+            self._notify(version)
+        return entry
+
+    async def load_in_background(self, version: str, activate: bool = False) -> asyncio.Task:
+        """
+        Yüklemeyi thread'de başlatır; event loop ve devam eden request'ler beklemez.
+        Aynı versiyon zaten yükleniyorsa mevcut task döner.
+        """
+        validate_version_name(version)
+        task = self._loading.get(version)
+        if task is not None and not task.done():
+            return task
+
+        async def _run() -> Optional[LoadedModel]:
+            try:
+                return await asyncio.to_thread(self.load, version, activate)
+            except Exception as e:
+                # Hata /models üzerinden görünür; task'ın sonucu beklenmediği için raise edilmez.
+                logger.exception("Background model load failed. version=%s", version)
+                with self._lock:
+                    self._errors[version] = str(e)
+                return None
+            finally:
+                self._loading.pop(version, None)
+
+        task = asyncio.create_task(_run())
+        self._loading[version] = task
+        return task
+
+    # ---------------- aktivasyon / boşaltma ----------------
+
+    def activate(self, version: str) -> None:
+        with self._lock:
+            if version not in self._models:
+                raise ModelNotLoadedError(f"Model version not loaded: {version}")
+            changed = self.active_version != version
+            self.active_version = version
+        if changed:
+            logger.info("Active model version changed. version=%s", version)
+            self._notify(version)
+
+    def unload(self, version: str) -> None:
+        """
+        Versiyonu registry'den çıkarır. Devam eden request'ler kendi
+        referanslarıyla tamamlanır; bellek son request bitince serbest kalır.
+        """
+        with self._lock:
+            if version not in self._models:
+                raise ModelNotLoadedError(f"Model version not loaded: {version}")
+            if version == self.active_version:
+                raise ValueError("The active model version cannot be unloaded.")
+            del self._models[version]
+        logger.info("Model version unloaded. version=%s", version)
+
+    def _evict_unused(self, keep: Optional[str] = None) -> List[str]:
+        # self._lock tutulurken çağrılır.
+        evicted = []
+        candidates = sorted(
+            (
+                e for e in self._models.values()
+                if e.version not in (self.active_version, keep)
+                and e.version not in self.pinned_versions
+                and e.in_flight == 0
+            ),
+            key=lambda e: e.last_used,
+        )
+        while len(self._models) > self.max_versions and candidates:
+            entry = candidates.pop(0)
+            del self._models[entry.version]
+            evicted.append(entry.version)
+        return evicted
+
+    # ---------------- request tarafı ----------------
+
+    def is_loaded(self, version: str) -> bool:
+        with self._lock:
+            return version in self._models
+
+    def get(self, version: Optional[str] = None) -> LoadedModel:
+        with self._lock:
+            key = version or self.active_version
+            entry = self._models.get(key) if key is not None else None
+        if entry is None:
+            raise ModelNotLoadedError(f"Model version not loaded: {key}")
+        return entry
+
+    def acquire_entry(self, version: Optional[str] = None) -> LoadedModel:
+        with self._lock:
+            key = version or self.active_version
+            entry = self._models.get(key) if key is not None else None
+            if entry is None:
+                raise ModelNotLoadedError(f"Model version not loaded: {key}")
+            entry.in_flight += 1
+            entry.last_used = time.monotonic()
+        return entry
+
+    def release(self, entry: LoadedModel) -> None:
+        with self._lock:
+            entry.in_flight -= 1
+            self._evict_unused()
+
+    @contextmanager
+    def acquire(self, version: Optional[str] = None) -> Iterator[LoadedModel]:
+        """
+        Request süresince versiyonu kullanımda işaretler; bu sürede
+        versiyon otomatik olarak boşaltılmaz.
+        """
+        entry = self.acquire_entry(version)
+        try:
+            yield entry
+        finally:
+            self.release(entry)
+
+    def describe(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active_version": self.active_version,
+                "max_versions": self.max_versions,
+                "loaded": [
+                    {
+                        "version": e.version,
+                        "model_name": e.metadata.get("model_name"),
+                        "roc_auc": e.metadata.get("roc_auc"),
+                        "trained_at": e.metadata.get("trained_at"),
+                        "loaded_at": e.loaded_at,
+                        "in_flight": e.in_flight,
+                    }
+                    for e in self._models.values()
+                ],
+                "loading": sorted(self._loading),
+                "errors": dict(self._errors),
+            }
+
+
+registry = ModelRegistry(
+    max_versions=settings.MODEL_REGISTRY_MAX_VERSIONS,
+    pinned_versions=settings.SHADOW_MODEL_VERSIONS,
+)
@@ -0,0 +1,466 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.binary_transport import TENSOR_CONTENT_TYPE, encode_tensor
+from src.compiled import CompiledModel
+from src.inference_preprocess import get_encoder, preprocess_input
+from src.predict import (
+    DEFAULT_MODEL_PATH,
+    configure_logging,
+    load_model,
+    predict_churn,
+    validate_input_schema,
+)
+from src.schemas import API_FEATURE_NAMES, API_TO_MODEL_COLUMNS
+from src.score import (
+    COMPACT_CSV_DTYPES,
+    COMPACT_NUMERIC_COLUMNS,
+    chunk_to_compact,
+    chunk_to_matrix,
+)
+
+# ======================================================
+# PATH & DEFAULT'LAR
+# ======================================================
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_PATH = BASE_DIR / "data/processed/X.csv"
+EXAMPLES_DIR = BASE_DIR / "examples"
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_OUTPUT_PATH = Path(__file__).resolve().parent / "results/latest.json"
+
+DEFAULT_SIZES = (1, 10, 100, 1_000, 10_000, 100_000)
+# En iyi süre (min) baseline'dan bu oranda yavaşsa regresyon sayılır (paylaşımlı CI
+# makinelerinde ölçüm gürültüsü %30'a çıkabiliyor). Medyan yerine
+# min kullanılır: paylaşımlı makinelerde gürültü sadece süreyi uzatır.
+DEFAULT_TOLERANCE = 0.5
+# Mikro saniye mertebesindeki ölçümlerde gürültü oranı büyüktür; mutlak fark bundan
+# küçükse regresyon sayılmaz.
+MIN_REGRESSION_SECONDS = 50e-6
+
+# Her ölçüm en az bu kadar süre / en fazla bu kadar tekrar koşulur.
+MIN_TIME_SECONDS = 0.2
+MAX_REPEATS = 50
+
+MODEL_TO_API_COLUMNS = {v: k for k, v in API_TO_MODEL_COLUMNS.items()}
+
+logger = logging.getLogger(__name__)
+
+
+# ======================================================
+# VERİ
+# ======================================================
+@dataclass
+class BenchData:
+    X: pd.DataFrame
+    model: Any
+    scaler: Any
+    feature_names: List[str]
+    compiled: CompiledModel
+    raw_record: Dict[str, Any]
+    example_payload: bytes
+
+    def rows(self, size: int) -> pd.DataFrame:
+        # X.csv'den büyük boyutlar için satırlar döngüsel tekrarlanır.
+        idx = np.arange(size) % len(self.X)
+        return self.X.iloc[idx].reset_index(drop=True)
+
+
+def load_bench_data() -> BenchData:
+    model, scaler, feature_names = load_model()
+    raw_request = json.loads((EXAMPLES_DIR / "raw_request.json").read_text())
+    return BenchData(
+        X=pd.read_csv(DATA_PATH),
+        model=model,
+        scaler=scaler,
+        feature_names=feature_names,
+        compiled=CompiledModel.from_artifact(model, scaler, feature_names),
+        raw_record=raw_request["records"][0],
+        example_payload=(EXAMPLES_DIR / "valid_request.json").read_bytes(),
+    )
+
+
+# ======================================================
+# CASE'LER
+# ======================================================
+# setup(data, size) → ölçülecek argümansız fonksiyon. Hazırlık süresi ölçüme girmez.
+Setup = Callable[[BenchData, int], Callable[[], Any]]
+
+
+@dataclass
+class BenchCase:
+    name: str
+    setup: Setup
+    # None: boyuttan bağımsız tek ölçüm.
+    sizes: Optional[Sequence[int]] = None
+    max_size: Optional[int] = None
+    # True ise süreye ek olarak tek koşunun tracemalloc tepe belleği (peak_mb) ölçülür.
+    memory: bool = False
+
+
+def _setup_predict_churn(data: BenchData, size: int) -> Callable[[], Any]:
+    X = data.rows(size)
+    return lambda: predict_churn(X, data.model, data.scaler, data.feature_names)
+
+
+def _setup_compiled_predict(data: BenchData, size: int) -> Callable[[], Any]:
+    X = data.rows(size)[data.feature_names].to_numpy()
+    return lambda: data.compiled.predict(X)
+
+
+def _setup_compiled_top_contributions(data: BenchData, size: int) -> Callable[[], Any]:
+    X = data.rows(size)[data.feature_names].to_numpy()
+    return lambda: data.compiled.top_contributions(X, 5)
+
+
+def _score_csv_setup(compact: bool) -> Setup:
+    # Offline skorlamanın bir chunk'ı: CSV parse + matrise çevirme + skor.
+    def setup(data: BenchData, size: int) -> Callable[[], Any]:
+        body = data.rows(size).to_csv(index=False).encode()
+        model = data.compiled.bind(API_FEATURE_NAMES)
+        if compact:
+            compact_model = model.compact(COMPACT_NUMERIC_COLUMNS)
+            return lambda: compact_model.predict(
+                chunk_to_compact(pd.read_csv(io.BytesIO(body), dtype=COMPACT_CSV_DTYPES))
+            )
+        return lambda: model.predict(chunk_to_matrix(pd.read_csv(io.BytesIO(body))))
+
+    return setup
+
+
+def _setup_validate_input_schema(data: BenchData, size: int) -> Callable[[], Any]:
+    # Ters kolon sırası: hizalama gerçekten kolon kopyalamalı.
+    X = data.rows(size)[data.feature_names[::-1]]
+    return lambda: validate_input_schema(X, data.feature_names)
+
+
+def _setup_map_api_to_model_columns(data: BenchData, size: int) -> Callable[[], Any]:
+    from src.api import map_api_to_model_columns
+
+    X = data.rows(size).rename(columns=MODEL_TO_API_COLUMNS)
+    return lambda: map_api_to_model_columns(X)
+
+
+def _setup_preprocess_input(data: BenchData, size: int) -> Callable[[], Any]:
+    # preprocess_input tek kayıtlık API'dir; batch için kayıt başına çağrılır.
+    records = [data.raw_record] * size
+    return lambda: [preprocess_input(r, data.feature_names) for r in records]
+
+
+def _setup_encoder_encode(data: BenchData, size: int) -> Callable[[], Any]:
+    encoder = get_encoder(tuple(data.feature_names))
+    records = [data.raw_record] * size
+    return lambda: encoder.encode(records)
+
+
+def _setup_load_model(data: BenchData, size: int) -> Callable[[], Any]:
+    return lambda: load_model(DEFAULT_MODEL_PATH)
+
+
+def _route_setup(path: str) -> Setup:
+    def setup(data: BenchData, size: int) -> Callable[[], Any]:
+        client = _get_client()
+        if size == 1:
+            body = data.example_payload
+        else:
+            frame = data.rows(size).rename(columns=MODEL_TO_API_COLUMNS)
+            body = ('{"records":' + frame.to_json(orient="records") + "}").encode()
+        headers = {"content-type": "application/json"}
+
+        def run() -> Any:
+            response = client.post(path, content=body, headers=headers)
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+            return response
+
+        return run
+
+    return setup
+
+
+def _setup_binary_route(data: BenchData, size: int) -> Callable[[], Any]:
+    # /predict ile aynı satırlar, kolon-major float64 tensor olarak.
+    client = _get_client()
+    frame = data.rows(size)[API_FEATURE_NAMES]
+    body = encode_tensor(list(frame.columns), [frame[c].to_numpy() for c in frame.columns])
+    headers = {"content-type": TENSOR_CONTENT_TYPE}
+
+    def run() -> Any:
+        response = client.post("/predict/binary", content=body, headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"/predict/binary returned {response.status_code}: {response.text[:200]}")
+        return response
+
+    return run
+
+
+_client = None
+
+
+def _get_client():
+    # Startup (model yükleme) bir kere çalışır; kapanış main() sonunda.
+    global _client
+    if _client is None:
+        from fastapi.testclient import TestClient
+
+        from src.api import app
+
+        _client = TestClient(app)
+        _client.__enter__()
+    return _client
+
+
+def _close_client() -> None:
+    global _client
+    if _client is not None:
+        _client.__exit__(None, None, None)
+        _client = None
+
+
+CASES: List[BenchCase] = [
+    BenchCase("predict_churn", _setup_predict_churn),
+    BenchCase("compiled_predict", _setup_compiled_predict),
+    BenchCase("compiled_top_contributions", _setup_compiled_top_contributions),
+    BenchCase("score_csv", _score_csv_setup(compact=False), memory=True),
+    # score_csv ile aynı CSV; uint8 / float32 okuma + compact skor (bkz. peak_mb).
+    BenchCase("score_csv_compact", _score_csv_setup(compact=True), memory=True),
+    BenchCase("validate_input_schema", _setup_validate_input_schema),
+    BenchCase("map_api_to_model_columns", _setup_map_api_to_model_columns),
+    BenchCase("preprocess_input", _setup_preprocess_input, max_size=1_000),
+    BenchCase("encoder_encode", _setup_encoder_encode),
+    BenchCase("load_model", _setup_load_model, sizes=()),
+    BenchCase("predict_route", _route_setup("/predict")),
+    BenchCase("predict_binary_route", _setup_binary_route),
+    # /predict ile aynı payload; fark açıklama maliyetidir.
+    BenchCase("explain_route", _route_setup("/explain")),
+]
+
+
+# ======================================================
+# ÖLÇÜM
+# ======================================================
+def time_callable(
+    fn: Callable[[], Any],
+    min_time: float = MIN_TIME_SECONDS,
+    max_repeats: int = MAX_REPEATS,
+) -> Dict[str, float]:
+    """
+    Bir ısınma koşusundan sonra en az min_time süre (en az 3, en fazla
+    max_repeats tekrar) ölçer. Tek koşu min_time'dan uzunsa tek ölçüm yeterlidir.
+    """
+    warmup_start = time.perf_counter()
+    fn()
+    warmup = time.perf_counter() - warmup_start
+
+    timings: List[float] = []
+    total = 0.0
+    min_repeats = 1 if warmup >= min_time else 3
+    while len(timings) < max_repeats and (len(timings) < min_repeats or total < min_time):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        total += elapsed
+
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "mean_s": statistics.fmean(timings),
+        "repeats": len(timings),
+    }
+
+
+def peak_memory(fn: Callable[[], Any]) -> int:
+    """
+    Tek koşunun tracemalloc ile izlenen tepe bellek kullanımı (byte).
+    numpy / pandas buffer'ları izlenir; sonuç dönüş değeri dahil ölçülür.
+    """
+    tracemalloc.start()
+    try:
+        result = fn()  # noqa: F841 - dönüş değeri ölçüm bitene kadar yaşamalı
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    case_names: Optional[Sequence[str]] = None,
+    min_time: float = MIN_TIME_SECONDS,
+) -> List[Dict[str, Any]]:
+    data = load_bench_data()
+    results = []
+
+    for case in CASES:
+        if case_names and case.name not in case_names:
+            continue
+
+        case_sizes: Sequence[Optional[int]] = [None] if case.sizes == () else (case.sizes or sizes)
+        for size in case_sizes:
+            if size is not None and case.max_size is not None and size > case.max_size:
+                continue
+
+            fn = case.setup(data, size or 0)
+            timing = time_callable(fn, min_time=min_time)
+            result = {"case": case.name, "size": size, **timing}
+            if size:
+                result["rows_per_sec"] = size / timing["median_s"]
+            if case.memory:
+                result["peak_mb"] = peak_memory(fn) / 1e6
+            results.append(result)
+            logger.info(
+                "case=%s size=%s median_ms=%.3f repeats=%d",
+                case.name,
+                size,
+                timing["median_s"] * 1000,
+                timing["repeats"],
+            )
+
+    _close_client()
+    return results
+
+
+# ======================================================
+# BASELINE KARŞILAŞTIRMA
+# ======================================================
+def result_key(result: Dict[str, Any]) -> str:
+    return f"{result['case']}[{result['size'] if result['size'] is not None else '-'}]"
+
+
+def compare_to_baseline(
+    results: Sequence[Dict[str, Any]],
+    baseline: Sequence[Dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE,
+    min_regression_s: float = MIN_REGRESSION_SECONDS,
+) -> List[Dict[str, Any]]:
+    """
+    Baseline'da karşılığı olan her ölçüm için oran hesaplar; en iyi süre
+    baseline'ın (1 + tolerance) katını ve min_regression_s farkını aşıyorsa
+    regressed=True işaretlenir.
+    """
+    baseline_by_key = {result_key(r): r for r in baseline}
+    comparisons = []
+    for result in results:
+        base = baseline_by_key.get(result_key(result))
+        if base is None:
+            continue
+        ratio = result["min_s"] / base["min_s"]
+        regressed = (
+            ratio > 1.0 + tolerance
+            and result["min_s"] - base["min_s"] > min_regression_s
+        )
+        comparisons.append(
+            {
+                "key": result_key(result),
+                "baseline_min_s": base["min_s"],
+                "min_s": result["min_s"],
+                "ratio": ratio,
+                "regressed": regressed,
+            }
+        )
+    return comparisons
+
+
+def build_report(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": list(results),
+    }
+
+
+# ======================================================
+# CLI ENTRYPOINT
+# ======================================================
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmark the inference hot path and gate on a stored baseline.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=list(DEFAULT_SIZES),
+        help="Comma separated batch sizes (default: 1,10,100,1000,10000,100000).",
+    )
+    parser.add_argument("--case", action="append", dest="cases", help="Only run this case.")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME_SECONDS)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT_PATH)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results as the new baseline instead of comparing.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    configure_logging()
+    args = parse_args(argv)
+
+    results = run_benchmarks(sizes=args.sizes, case_names=args.cases, min_time=args.min_time)
+    report = build_report(results)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    logger.info("Results written to %s", args.output)
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        logger.info("Baseline updated: %s", args.baseline)
+        return 0
+
+    if not args.baseline.exists():
+        logger.warning("No baseline at %s; skipping regression check.", args.baseline)
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    comparisons = compare_to_baseline(results, baseline["results"], tolerance=args.tolerance)
+    regressions = [c for c in comparisons if c["regressed"]]
+    for c in comparisons:
+        logger.info(
+            "%s %-36s baseline_ms=%.3f best_ms=%.3f ratio=%.2f",
+            "REGRESSED" if c["regressed"] else "ok       ",
+            c["key"],
+            c["baseline_min_s"] * 1000,
+            c["min_s"] * 1000,
+            c["ratio"],
+        )
+
+    if regressions:
+        logger.error(
+            "%d benchmark(s) regressed more than %.0f%% against %s",
+            len(regressions),
+            args.tolerance * 100,
+            args.baseline,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
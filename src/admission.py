@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+SMALL_LANE = "small"
+LARGE_LANE = "large"
+
+# Reddedilme nedenleri (sayaçlar sabit anahtarlı; okuma sırasında dict boyu değişmez).
+REJECT_TOO_LARGE = "too_large"
+REJECT_QUEUE_FULL = "queue_full"
+REJECT_LANE_BUSY = "lane_busy"
+
+
+class AdmissionRejected(Exception):
+    """
+    Request skorlamaya alınmadı; API katmanında HTTP hatasına çevrilir.
+    """
+
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[int] = None) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+# JSON string literal'i (kaçışlı karakterler dahil).
+_JSON_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+
+
+def estimate_records(body: bytes) -> int:
+    """
+    {"records": [{...}, ...]} body'sindeki kayıt sayısı, parse etmeden.
+    Her kayıt düz bir JSON nesnesidir; dış nesne hariç tutulur. String
+    değerlerdeki '{' karakterleri de sayıldığından sonuç bir üst sınırdır.
+    Geçersiz body'lerde tahmin yanlış olabilir, o durumda zaten validasyon
+    hatası döner.
+    """
+    return max(body.count(b"{") - 1, 0)
+
+
+def count_records(body: bytes) -> int:
+    """
+    estimate_records'un string değerleri atlayan kesin hali. Body'nin bir
+    kopyasını ürettiği için yalnızca tahmin limiti aştığında kullanılır.
+    """
+    return max(_JSON_STRING.sub(b'""', body).count(b"{") - 1, 0)
+
+
+def estimate_rows(body: bytes) -> int:
+    """
+    {"columns": [...], "data": [[...], ...]} body'sindeki satır sayısı, parse etmeden.
+    """
+    return max(body.count(b"[") - 2, 0)
+
+
+class _Lane:
+    """
+    Event loop içinde kullanılan FIFO semafor; bekleme süresi sınırlıdır.
+    Slot bırakılınca doğrudan sıradaki bekleyene devredilir.
+    """
+
+    def __init__(self, name: str, concurrency: int) -> None:
+        self.name = name
+        self.concurrency = concurrency
+        self.active = 0
+        self.admitted = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+            return True
+        if timeout <= 0:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait((waiter,), timeout=timeout)
+        except BaseException:
+            # Client bağlantıyı kapattı (iptal); slot devredildiyse geri bırakılır.
+            self._abandon(waiter)
+            raise
+        if waiter.done():
+            return True
+        self._abandon(waiter)
+        return False
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            self.release()
+        else:
+            self._waiters.remove(waiter)
+            waiter.cancel()
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # active değişmez; slot bekleyene geçer.
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionController:
+    """
+    CPU-bound skorlama için admission control ve load shedding.
+
+    - Kayıt sayısı large_batch_min_records ve üzeri olan request'ler "large",
+      diğerleri "small" lane'e girer; her lane'in kendi eşzamanlılık limiti
+      vardır, büyük batch'ler küçüklerin önünü tıkamaz.
+    - max_records_per_request üzeri → 413.
+    - Kabul edilmiş (bekleyen + skorlanan) kayıt toplamı max_queued_records'u
+      aşacaksa → 503 + Retry-After.
+    - Lane slot'u queue_timeout_ms içinde boşalmazsa → 429 + Retry-After.
+
+    Sadece event loop'tan kullanılır; kilit gerekmez.
+    """
+
+    def __init__(
+        self,
+        small_concurrency: int = 32,
+        large_concurrency: int = 2,
+        large_batch_min_records: int = 1000,
+        max_records_per_request: int = 100_000,
+        max_queued_records: int = 500_000,
+        queue_timeout_ms: float = 100,
+        retry_after_seconds: int = 1,
+    ) -> None:
+        if small_concurrency < 1 or large_concurrency < 1:
+            raise ValueError("Lane concurrency must be at least 1")
+        if max_records_per_request > max_queued_records:
+            raise ValueError("max_records_per_request cannot exceed max_queued_records")
+
+        self.lanes: Dict[str, _Lane] = {
+            SMALL_LANE: _Lane(SMALL_LANE, small_concurrency),
+            LARGE_LANE: _Lane(LARGE_LANE, large_concurrency),
+        }
+        self.large_batch_min_records = large_batch_min_records
+        self.max_records_per_request = max_records_per_request
+        self.max_queued_records = max_queued_records
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.retry_after_seconds = retry_after_seconds
+
+        self.queued_records = 0
+        self.rejected: Dict[str, int] = {
+            REJECT_TOO_LARGE: 0,
+            REJECT_QUEUE_FULL: 0,
+            REJECT_LANE_BUSY: 0,
+        }
+
+    def lane_for(self, n_records: int) -> str:
+        return LARGE_LANE if n_records >= self.large_batch_min_records else SMALL_LANE
+
+    @asynccontextmanager
+    async def admit(self, n_records: int) -> AsyncIterator[str]:
+        """
+        Request'i uygun lane'e alır ve lane adını verir; blok bitince slot bırakılır.
+        Limit aşımında beklemeden AdmissionRejected fırlatır.
+        """
+        if n_records > self.max_records_per_request:
+            self.rejected[REJECT_TOO_LARGE] += 1
+            raise AdmissionRejected(
+                413,
+                f"Too many records in one request: {n_records} > {self.max_records_per_request}.",
+            )
+        if self.queued_records + n_records > self.max_queued_records:
+            self.rejected[REJECT_QUEUE_FULL] += 1
+            raise AdmissionRejected(
+                503,
+                "Too many records queued for scoring; retry later.",
+                self.retry_after_seconds,
+            )
+
+        lane = self.lanes[self.lane_for(n_records)]
+        self.queued_records += n_records
+        try:
+            if not await lane.acquire(self.queue_timeout):
+                self.rejected[REJECT_LANE_BUSY] += 1
+                raise AdmissionRejected(
+                    429,
+                    f"Too many concurrent {lane.name} batches; retry later.",
+                    self.retry_after_seconds,
+                )
+            lane.admitted += 1
+            try:
+                yield lane.name
+            finally:
+                lane.release()
+        finally:
+            self.queued_records -= n_records
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "lanes": {
+                name: {
+                    "concurrency": lane.concurrency,
+                    "active": lane.active,
+                    "waiting": lane.waiting,
+                    "admitted": lane.admitted,
+                }
+                for name, lane in self.lanes.items()
+            },
+            "large_batch_min_records": self.large_batch_min_records,
+            "max_records_per_request": self.max_records_per_request,
+            "max_queued_records": self.max_queued_records,
+            "queued_records": self.queued_records,
+            "rejected": dict(self.rejected),
+        }
@@ -1,131 +1,1224 @@
 import logging
+import multiprocessing
 import time
-from typing import List
 
-import joblib
+# Modül import süresi açılış kırılımına yazılır (bkz. startup_timings).
+_import_started = time.perf_counter()
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, List, Optional
 
-from src.inference_preprocess import preprocess_input
+import numpy as np
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from starlette.background import BackgroundTask
 
-import pandas as pd
-from fastapi import FastAPI, HTTPException
-
-from src.predict import predict_churn, load_model
-from src.schemas import PredictionRequest
+from src.admission import (
+    LARGE_LANE,
+    AdmissionController,
+    AdmissionRejected,
+    count_records,
+    estimate_records,
+    estimate_rows,
+)
+from src.batching import MicroBatcher
+from src.binary_transport import (
+    ARROW_STREAM_CONTENT_TYPE,
+    MAGIC as TENSOR_MAGIC,
+    TENSOR_CONTENT_TYPE,
+    decode_arrow,
+    decode_tensor,
+    encode_arrow,
+    encode_tensor,
+    estimate_tensor_rows,
+)
+from src.cache import PredictionCache
+from src.compiled import DEFAULT_THRESHOLD, CompiledModel
+from src.drift import DriftMonitor
+from src.inference_preprocess import CategoricalEncoder
+from src.fast_json import (
+    dumps,
+    dumps_predictions,
+    inline_json_schema,
+    json_response,
+    parse_json_body,
+)
+from src.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    REGISTRY as METRICS_REGISTRY,
+    MetricsMiddleware,
+    StageTimer,
+    render_gauge,
+    render_histogram,
+)
+from src.prediction_log import PredictionLogger
+from src.score_store import ScoreStore
+from src.shadow import SCORE_BUCKETS, ShadowScorer
+from src.schemas import (
+    API_COLUMNS,
+    API_FEATURE_NAMES,
+    API_TO_MODEL_COLUMNS,
+    ColumnarPredictionRequest,
+    CustomerRecord,
+    PredictionRequest,
+    RawPredictionRequest,
+)
+from src.streaming import NDJSONScoringResponse
 from app.config import settings
+from app.model_registry import LoadedModel, ModelNotLoadedError, registry
+
+# pandas / sklearn / joblib açılışta yüklenmez: servis yolu numpy + compact artifact
+# ile çalışır (bkz. readme "Açılış süresi").
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="ChurnGuard API")
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# BATCHING_ENABLED ise startup'ta oluşturulur.
+batcher: MicroBatcher | None = None
+# PREDICTION_CACHE_ENABLED ise startup'ta oluşturulur.
+prediction_cache: PredictionCache | None = None
+# PREDICTION_LOG_ENABLED ise startup'ta başlatılır.
+prediction_logger: PredictionLogger | None = None
+# SHADOW_MODEL_VERSIONS doluysa startup'ta başlatılır.
+shadow_scorer: ShadowScorer | None = None
+# ADMISSION_ENABLED ise startup'ta oluşturulur; pool ayrıca
+# ADMISSION_LARGE_BATCH_PROCESS_WORKERS > 0 olmasını gerektirir.
+admission: AdmissionController | None = None
+large_batch_pool: ProcessPoolExecutor | None = None
+# DRIFT_MONITOR_ENABLED ise aktif versiyonun referansıyla kurulur; versiyon değişince yenilenir.
+drift_monitor: DriftMonitor | None = None
+# SCORE_STORE_PATH verilmişse startup'ta açılır; /top-risk buradan okur.
+score_store: ScoreStore | None = None
+# Açılış süresi kırılımı (saniye): import, model_load, bind, warmup, startup (handler'lar toplamı).
+startup_timings: Dict[str, float] = {}
+# Tüm startup handler'ları (model yükleme + warmup dahil) bitince True; /readyz buna bakar.
+ready = False
+# src.serve birden fazla worker fork ederken True yapar: registry worker başına olduğundan
+# /models/* değişiklikleri sadece isteği alan worker'ı etkilerdi.
+model_changes_locked = False
+_startup_started = _import_started
+
+# Ham kategorik kayıtlar doğrudan API kolon sırasında encode edilir.
+raw_encoder = CategoricalEncoder(API_FEATURE_NAMES)
+
+# /explain: katkı index'leri API alan isimlerine tek fancy-index ile çevrilir.
+DEFAULT_EXPLAIN_TOP_K = 5
+API_COLUMN_NAMES = np.array(API_COLUMNS, dtype=object)
+
+
+# Columnar request'lerde hem API hem model kolon isimleri kabul edilir;
+# tamsayı tipli kolonlar kolon bazında tek seferde doğrulanır.
+INTEGER_COLUMNS = {
+    name
+    for api_name, field in CustomerRecord.model_fields.items()
+    if field.annotation is int
+    for name in (api_name, API_TO_MODEL_COLUMNS.get(api_name, api_name))
+}
+
+
+def map_api_to_model_columns(df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    API'de kullanılan kolon isimlerini,
+    modelin beklediği kolon isimlerine çevirir.
+    """
+    return df.rename(columns=API_TO_MODEL_COLUMNS)
+
+
+def invalidate_prediction_cache(version: str) -> None:
+    # Model değiştiyse eski olasılıklar geçersizdir.
+    if prediction_cache is not None:
+        prediction_cache.invalidate()
+
+
+registry.add_listener(invalidate_prediction_cache)
+
+
+def reset_drift_monitor(version: str) -> None:
+    """
+    Aktif versiyon yüklenince / değişince drift özetleri o versiyonun
+    eğitim referansıyla sıfırdan başlar.
+    """
+    global drift_monitor
+    if not settings.DRIFT_MONITOR_ENABLED or version != registry.active_version:
+        return
+    try:
+        entry = registry.get(version)
+    except ModelNotLoadedError:
+        return
+    drift_monitor = DriftMonitor.from_metadata(version, entry.metadata)
+    if drift_monitor is None:
+        logger.warning("No drift reference in metadata; drift monitoring disabled. version=%s", version)
+
+
+registry.add_listener(reset_drift_monitor)
+
+
+def observe_drift(X: np.ndarray, entry: LoadedModel, probs: np.ndarray) -> None:
+    # Sadece aktif versiyonun trafiği; seçilmiş versiyonların skorları referansla karşılaştırılamaz.
+    monitor = drift_monitor
+    if monitor is not None and monitor.version == entry.version:
+        monitor.observe(X, API_FEATURE_NAMES, probs)
+
+
+def collect_service_metrics() -> List[str]:
+    """
+    Scrape anında okunan metrikler: model in-flight, aktif versiyon, batch boyutları.
+    """
+    described = registry.describe()
+    lines = render_gauge(
+        "churnguard_model_in_flight",
+        "Requests currently holding a model version.",
+        ("model_version",),
+        [((e["version"],), e["in_flight"]) for e in described["loaded"]],
+    )
+    lines += render_gauge(
+        "churnguard_active_model_info",
+        "Currently active model version.",
+        ("model_version",),
+        [((described["active_version"],), 1)] if described["active_version"] else [],
+    )
+    lines += render_gauge(
+        "churnguard_startup_seconds",
+        "Startup time breakdown of this process by stage.",
+        ("stage",),
+        [((stage,), seconds) for stage, seconds in startup_timings.items()],
+    )
+    if prediction_logger is not None:
+        log_stats = prediction_logger.stats()
+        lines += render_gauge(
+            "churnguard_prediction_log_events",
+            "Prediction log events by outcome since startup.",
+            ("outcome",),
+            [((k,), v) for k, v in log_stats.items()],
+        )
+    if shadow_scorer is not None:
+        snapshot = shadow_scorer.snapshot()
+        lines += render_gauge(
+            "churnguard_shadow_disagreement_ratio",
+            "Share of records where a shadow version's prediction differs from the active version.",
+            ("model_version",),
+            [
+                ((version,), stats["disagreement_rate"])
+                for version, stats in snapshot["versions"].items()
+                if "disagreement_rate" in stats
+            ],
+        )
+        lines += render_gauge(
+            "churnguard_shadow_dropped_batches",
+            "Shadow batches dropped because the comparison queue was full.",
+            (),
+            [((), snapshot["dropped"])],
+        )
+        lines += [
+            "# HELP churnguard_shadow_probability Churn probability distribution per scored version.",
+            "# TYPE churnguard_shadow_probability histogram",
+        ]
+        for version, counts, total in shadow_scorer.histograms():
+            lines += render_histogram(
+                "churnguard_shadow_probability",
+                ("model_version",),
+                (version,),
+                SCORE_BUCKETS,
+                counts,
+                total,
+            )
+    if drift_monitor is not None:
+        lines += render_gauge(
+            "churnguard_drift_psi",
+            "Population stability index of live inputs / scores against the training reference.",
+            ("model_version", "feature"),
+            [
+                ((drift_monitor.version, name), value)
+                for name, value in drift_monitor.psi_values().items()
+            ],
+        )
+    if admission is not None:
+        snapshot = admission.snapshot()
+        lines += render_gauge(
+            "churnguard_admission_active",
+            "Requests currently scoring per admission lane.",
+            ("lane",),
+            [((lane,), s["active"]) for lane, s in snapshot["lanes"].items()],
+        )
+        lines += render_gauge(
+            "churnguard_admission_waiting",
+            "Requests waiting for a slot per admission lane.",
+            ("lane",),
+            [((lane,), s["waiting"]) for lane, s in snapshot["lanes"].items()],
+        )
+        lines += render_gauge(
+            "churnguard_admission_queued_records",
+            "Admitted records that are waiting or being scored.",
+            (),
+            [((), snapshot["queued_records"])],
+        )
+        lines += render_gauge(
+            "churnguard_admission_rejected",
+            "Requests rejected by admission control since startup.",
+            ("reason",),
+            [((reason,), n) for reason, n in snapshot["rejected"].items()],
+        )
+    if batcher is not None:
+        buckets, counts, records = batcher.stats.histogram()
+        lines += [
+            "# HELP churnguard_batch_size_records Records per micro-batch scoring call.",
+            "# TYPE churnguard_batch_size_records histogram",
+        ]
+        lines += render_histogram("churnguard_batch_size_records", (), (), buckets, counts, records)
+    return lines
+
+
+METRICS_REGISTRY.add_collector(collect_service_metrics)
+
 
 @app.on_event("startup")
 def load_artifacts():
     """
-    Model ve scaler'ı uygulama başlarken belleğe alıyoruz.
+    Aktif model versiyonunu uygulama başlarken registry'ye yüklüyoruz.
     Her request'te tekrar yüklenmesin diye.
     """
-    global model, scaler, feature_names
-    logger.info("Loading model artifacts on startup.")
-    model, scaler, feature_names = load_model()
+    global prediction_cache, _startup_started
+    _startup_started = time.perf_counter()
+    if settings.PREDICTION_CACHE_ENABLED and prediction_cache is None:
+        prediction_cache = PredictionCache(
+            max_entries=settings.PREDICTION_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.PREDICTION_CACHE_TTL_SECONDS,
+        )
+
+    if registry.is_loaded(settings.MODEL_VERSION):
+        # Prefork modunda (src.serve) parent'ta yüklendi; worker copy-on-write ile paylaşır.
+        logger.info("Using preloaded model artifacts. version=%s", settings.MODEL_VERSION)
+        entry = registry.get(settings.MODEL_VERSION)
+    else:
+        logger.info("Loading model artifacts on startup. version=%s", settings.MODEL_VERSION)
+        entry = registry.load(settings.MODEL_VERSION, activate=True)
+    loaded = time.perf_counter()
+    startup_timings["model_load"] = loaded - _startup_started
 
+    # API sırasına bağlı model bir kere hazırlanır; şema uyuşmazlığı açılışta patlar.
+    model = entry.model.bind_cached(API_FEATURE_NAMES)
+    bound = time.perf_counter()
+    startup_timings["bind"] = bound - loaded
+
+    # Sahte batch ile skor + serileştirme yolu ısıtılır (BLAS, orjson ilk çağrı
+    # maliyetleri ilk gerçek request'e kalmaz). Cache / drift / metrikler etkilenmez.
+    if settings.STARTUP_WARMUP_ROWS > 0:
+        dummy = np.zeros((settings.STARTUP_WARMUP_ROWS, len(API_FEATURE_NAMES)))
+        dumps_predictions(*model.predict(dummy))
+    startup_timings["warmup"] = time.perf_counter() - bound
+
+    if drift_monitor is None or drift_monitor.version != entry.version:
+        reset_drift_monitor(entry.version)
+
+
+@app.on_event("startup")
+def start_shadow_scoring():
+    global shadow_scorer
+    if not settings.SHADOW_MODEL_VERSIONS or shadow_scorer is not None:
+        return
 
-def map_api_to_model_columns(df: pd.DataFrame) -> pd.DataFrame:
+    for version in settings.SHADOW_MODEL_VERSIONS:
+        if registry.is_loaded(version):
+            continue
+        try:
+            registry.load(version)
+        except Exception:
+            # Shadow versiyon yüklenemezse servis yine açılır; o versiyon atlanır.
+            logger.exception("Failed to load shadow model version. version=%s", version)
+
+    shadow_scorer = ShadowScorer(
+        settings.SHADOW_MODEL_VERSIONS,
+        queue_size=settings.SHADOW_QUEUE_SIZE,
+    )
+    shadow_scorer.start()
+    logger.info("Shadow scoring started. versions=%s", settings.SHADOW_MODEL_VERSIONS)
+
+
+@app.on_event("shutdown")
+def stop_shadow_scoring():
+    global shadow_scorer
+    if shadow_scorer is not None:
+        shadow_scorer.stop()
+        shadow_scorer = None
+
+
+def shadow_models(entry: LoadedModel) -> list:
     """
-    API'de kullanılan kolon isimlerini,
-    modelin beklediği kolon isimlerine çevirir.
+    Aktif versiyonla skorlanan request'ler için yüklü shadow modeller
+    (versiyon, API sırasına bağlı model). Versiyon seçilmiş request'ler shadow'lanmaz.
+    """
+    if shadow_scorer is None or entry.version != registry.active_version:
+        return []
+
+    shadows = []
+    for version in shadow_scorer.shadow_versions:
+        if version == entry.version:
+            continue
+        try:
+            shadow = registry.get(version)
+        except ModelNotLoadedError:
+            continue
+        shadows.append((version, shadow.model.bind_cached(API_FEATURE_NAMES)))
+    return shadows
+
+
+@app.on_event("startup")
+def start_admission_control():
+    global admission, large_batch_pool
+    if not settings.ADMISSION_ENABLED or admission is not None:
+        return
+
+    admission = AdmissionController(
+        small_concurrency=settings.ADMISSION_SMALL_CONCURRENCY,
+        large_concurrency=settings.ADMISSION_LARGE_CONCURRENCY,
+        large_batch_min_records=settings.ADMISSION_LARGE_BATCH_MIN_RECORDS,
+        max_records_per_request=settings.ADMISSION_MAX_RECORDS_PER_REQUEST,
+        max_queued_records=settings.ADMISSION_MAX_QUEUED_RECORDS,
+        queue_timeout_ms=settings.ADMISSION_QUEUE_TIMEOUT_MS,
+        retry_after_seconds=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    )
+
+    workers = settings.ADMISSION_LARGE_BATCH_PROCESS_WORKERS
+    if workers > 0:
+        # spawn: thread'leri çalışan bir process fork edilmez.
+        large_batch_pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        # Worker'lar (import'lar dahil) ilk büyük request'i beklemeden açılır.
+        for _ in range(workers):
+            large_batch_pool.submit(int)
+    logger.info("Admission control enabled. large_batch_process_workers=%d", workers)
+
+
+@app.on_event("shutdown")
+def stop_admission_control():
+    global admission, large_batch_pool
+    if large_batch_pool is not None:
+        large_batch_pool.shutdown(wait=False, cancel_futures=True)
+        large_batch_pool = None
+    admission = None
+
+
+@app.on_event("startup")
+def open_score_store():
+    global score_store
+    if settings.SCORE_STORE_PATH and score_store is None:
+        score_store = ScoreStore(settings.SCORE_STORE_PATH)
+
+
+@app.on_event("shutdown")
+def close_score_store():
+    global score_store
+    if score_store is not None:
+        score_store.close()
+        score_store = None
+
+
+def admitted(
+    estimate: Callable[[bytes], int],
+    exact: Optional[Callable[[bytes], int]] = None,
+):
+    """
+    Body'deki kayıt sayısını parse etmeden tahmin edip request'i admission
+    lane'ine alan dependency üretir. Lane adı (admission kapalıysa None)
+    endpoint'e verilir; slot response bitince bırakılır.
+
+    Tahmin bir üst sınırsa exact verilir: tahmin request limitini aşarsa
+    kayıtlar threadpool'da kesin sayılır, yanlış 413 dönülmez.
+    """
+
+    async def dependency(body: bytes = Depends(request_body)) -> AsyncIterator[Optional[str]]:
+        if admission is None:
+            yield None
+            return
+        n_records = estimate(body)
+        if exact is not None and n_records > admission.max_records_per_request:
+            n_records = await run_in_threadpool(exact, body)
+        try:
+            async with admission.admit(n_records) as lane:
+                yield lane
+        except AdmissionRejected as e:
+            headers = {"Retry-After": str(e.retry_after)} if e.retry_after is not None else None
+            raise HTTPException(status_code=e.status_code, detail=e.detail, headers=headers)
+
+    return dependency
+
+
+@app.on_event("startup")
+def start_prediction_logger():
+    global prediction_logger
+    if not settings.PREDICTION_LOG_ENABLED or prediction_logger is not None:
+        return
+    prediction_logger = PredictionLogger(
+        queue_size=settings.PREDICTION_LOG_QUEUE_SIZE,
+        request_sample_rate=settings.PREDICTION_LOG_SAMPLE_RATE,
+        record_sample_rate=settings.PREDICTION_LOG_RECORD_SAMPLE_RATE,
+    )
+    prediction_logger.start()
+
+
+@app.on_event("shutdown")
+def stop_prediction_logger():
+    global prediction_logger
+    if prediction_logger is not None:
+        # Kuyrukta kalan olaylar yazılır.
+        prediction_logger.stop()
+        prediction_logger = None
+
+
+def log_prediction(endpoint: str, model_version: str, latency_ms: float, probs: np.ndarray) -> None:
+    # Request yolunda sadece kuyruğa ekleme; formatlama arka planda.
+    if prediction_logger is not None:
+        prediction_logger.submit(endpoint, model_version, latency_ms, probs)
+
+
+@app.on_event("startup")
+async def start_batcher():
+    global batcher
+    if not settings.BATCHING_ENABLED:
+        return
+
+    # Her kayıt request'in acquire ettiği versiyonla skorlanır; pencere sırasında
+    # aktif versiyon değişirse eski ve yeni request'ler ayrı gruplarda skorlanır.
+    batcher = MicroBatcher(
+        score_fn=score_matrix,
+        max_batch_size=settings.BATCH_MAX_SIZE,
+        max_wait_us=settings.BATCH_MAX_WAIT_US,
+    )
+    await batcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    global batcher
+    if batcher is not None:
+        await batcher.stop()
+        batcher = None
+
+
+# Son kaydedilen startup handler'ı olmalı: diğer tüm bileşenler hazır olduktan sonra çalışır.
+@app.on_event("startup")
+def mark_ready():
+    global ready
+    startup_timings["startup"] = time.perf_counter() - _startup_started
+    ready = True
+    logger.info(
+        "Startup completed. version=%s %s",
+        registry.active_version,
+        " ".join(f"{stage}_s={seconds:.3f}" for stage, seconds in startup_timings.items()),
+    )
+
+
+@app.on_event("shutdown")
+def mark_not_ready():
+    global ready
+    ready = False
+
+
+def requested_model_version(
+    model_version: Optional[str] = Query(
+        None, description="Model version to score with (default: active version)."
+    ),
+    x_model_version: Optional[str] = Header(None),
+) -> Optional[str]:
+    """
+    Versiyon query parametresi veya X-Model-Version header'ı ile seçilir.
+    """
+    return model_version or x_model_version
+
+
+def score_matrix(X: np.ndarray, entry: LoadedModel) -> np.ndarray:
+    """
+    API kolon sırasındaki matrisin churn olasılıkları. Cache açıksa
+    sadece cache'te olmayan satırlar modele gönderilir.
     """
-    # API input'u (underscore) → model input'u (boşluk + özel karakterler).
-    column_mapping = {
-        "Senior_Citizen": "Senior Citizen",
-        "Phone_Service": "Phone Service",
-        "Paperless_Billing": "Paperless Billing",
-        "Monthly_Charges": "Monthly Charges",
-        "Total_Charges": "Total Charges",
-        "Tenure_Months": "Tenure Months",
-
-        "Multiple_Lines_No": "Multiple Lines_No",
-        "Multiple_Lines_No_phone_service": "Multiple Lines_No phone service",
-        "Multiple_Lines_Yes": "Multiple Lines_Yes",
-
-        "Internet_Service_DSL": "Internet Service_DSL",
-        "Internet_Service_Fiber_optic": "Internet Service_Fiber optic",
-        "Internet_Service_No": "Internet Service_No",
-
-        "Online_Security_No": "Online Security_No",
-        "Online_Security_No_internet_service": "Online Security_No internet service",
-        "Online_Security_Yes": "Online Security_Yes",
-
-        "Online_Backup_No": "Online Backup_No",
-        "Online_Backup_No_internet_service": "Online Backup_No internet service",
-        "Online_Backup_Yes": "Online Backup_Yes",
-
-        "Device_Protection_No": "Device Protection_No",
-        "Device_Protection_No_internet_service": "Device Protection_No internet service",
-        "Device_Protection_Yes": "Device Protection_Yes",
-
-        "Tech_Support_No": "Tech Support_No",
-        "Tech_Support_No_internet_service": "Tech Support_No internet service",
-        "Tech_Support_Yes": "Tech Support_Yes",
-
-        "Streaming_TV_No": "Streaming TV_No",
-        "Streaming_TV_No_internet_service": "Streaming TV_No internet service",
-        "Streaming_TV_Yes": "Streaming TV_Yes",
-
-        "Streaming_Movies_No": "Streaming Movies_No",
-        "Streaming_Movies_No_internet_service": "Streaming Movies_No internet service",
-        "Streaming_Movies_Yes": "Streaming Movies_Yes",
-
-        "Contract_Month_to_month": "Contract_Month-to-month",
-        "Contract_One_year": "Contract_One year",
-        "Contract_Two_year": "Contract_Two year",
-        "Payment_Method_Bank_transfer_automatic": "Payment Method_Bank transfer (automatic)",
-        "Payment_Method_Credit_card_automatic": "Payment Method_Credit card (automatic)",
-        "Payment_Method_Electronic_check": "Payment Method_Electronic check",
-        "Payment_Method_Mailed_check": "Payment Method_Mailed check",
+    api_model = entry.model.bind_cached(API_FEATURE_NAMES)
+    score = api_model.predict_proba
+    shadows = shadow_models(entry)
+    if shadows:
+        # Shadow versiyonlar aynı matmul'da; karşılaştırma arka planda.
+        score = partial(
+            shadow_scorer.predict_proba,
+            primary_version=entry.version,
+            primary=api_model,
+            shadows=shadows,
+        )
+
+    if prediction_cache is None:
+        probs = score(X)
+    else:
+        # Anahtar yükleme numarasını da içerir: versiyon yeniden yüklenmeden önce
+        # modeli almış bir request, invalidate sonrasında eski skorları yeni
+        # modelin anahtarlarına yazamaz.
+        model_key = f"{entry.version}#{entry.load_id}"
+        probs, miss_idx, miss_keys = prediction_cache.get_many(X, model_key)
+        if len(miss_idx):
+            miss_probs = score(X[miss_idx])
+            probs[miss_idx] = miss_probs
+            prediction_cache.put_many(miss_keys, miss_probs)
+
+    observe_drift(X, entry, probs)
+    return probs
+
+
+def predict_matrix(X: np.ndarray, entry: LoadedModel) -> tuple:
+    probs = score_matrix(X, entry)
+    return probs, (probs >= DEFAULT_THRESHOLD).astype(int)
+
+
+def records_to_matrix(records: List[CustomerRecord]) -> np.ndarray:
+    """
+    Pydantic → satır matrisi (API kolon sırası, derlenmiş model bu sıraya bağlı).
+    __dict__ alan sırasındadır; model_dump'ın kayıt başına kopyası atlanır.
+    """
+    return np.array([tuple(r.__dict__.values()) for r in records], dtype=np.float64)
+
+
+async def request_body(http_request: Request) -> bytes:
+    """
+    Ham body; prediction endpoint'leri JSON'u json.loads + dict ara katmanı
+    olmadan doğrudan Pydantic'e doğrular. Sync endpoint'lerde doğrulama
+    threadpool'da yapılır.
+    """
+    return await http_request.body()
+
+
+def request_body_openapi(model) -> dict:
+    # Body'yi kendisi okuyan endpoint'lerin şeması dokümantasyonda görünsün.
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": inline_json_schema(model)}},
+        }
     }
 
-    return df.rename(columns=column_mapping)
+
+def build_json_response(http_request: Request, body: bytes):
+    return json_response(
+        body,
+        accept_encoding=http_request.headers.get("accept-encoding", ""),
+        compression_min_bytes=(
+            settings.RESPONSE_COMPRESSION_MIN_BYTES
+            if settings.RESPONSE_COMPRESSION_ENABLED
+            else None
+        ),
+    )
+
+
+def build_prediction_response(http_request: Request, probs: np.ndarray, preds: np.ndarray):
+    return build_json_response(http_request, dumps_predictions(probs, preds))
+
+
+def score_records(
+    records: List[CustomerRecord],
+    entry: LoadedModel,
+    timer: Optional[StageTimer] = None,
+) -> tuple:
+    X = records_to_matrix(records)
+    if timer is not None:
+        timer.mark("to_matrix")
+    result = predict_matrix(X, entry)
+    if timer is not None:
+        timer.mark("score")
+    return result
 
 
-@app.post("/predict")
-def predict(request: PredictionRequest):
+@app.post("/predict", openapi_extra=request_body_openapi(PredictionRequest))
+async def predict(
+    http_request: Request,
+    body: bytes = Depends(request_body),
+    model_version: Optional[str] = Depends(requested_model_version),
+    lane: Optional[str] = Depends(admitted(estimate_records)),
+):
     """
     Churn prediction endpoint
     """
+    if lane == LARGE_LANE and large_batch_pool is not None:
+        return await run_in_threadpool(
+            predict_in_process_pool, http_request, "/predict", "records", body, model_version
+        )
+
+    start_time = time.perf_counter()
+    timer = StageTimer.start(http_request, "/predict")
+    if lane == LARGE_LANE:
+        # Büyük body'nin parse'ı event loop'u küçük request'lere kapatmasın.
+        request = await run_in_threadpool(parse_json_body, PredictionRequest, body)
+    else:
+        request = parse_json_body(PredictionRequest, body)
+    timer.mark("parse_validate")
+
     try:
-        start_time = time.perf_counter()
-        # Pydantic → dict → DataFrame
-        records = [r.model_dump() for r in request.records]
-        df = pd.DataFrame(records)
+        with registry.acquire(model_version) as entry:
+            if (
+                batcher is not None
+                and model_version is None
+                and len(request.records) < settings.BATCH_MAX_SIZE
+            ):
+                # Küçük request'ler eşzamanlı diğerleriyle tek skor çağrısında birleşir.
+                X = records_to_matrix(request.records)
+                timer.mark("to_matrix")
+                probs = await batcher.submit(X, entry)
+                # Batch penceresinde bekleme dahil.
+                timer.mark("score")
+                preds = (probs >= DEFAULT_THRESHOLD).astype(int)
+            else:
+                # CPU işi event loop dışında, eskisi gibi threadpool'da yapılır.
+                probs, preds = await run_in_threadpool(
+                    score_records, request.records, entry, timer
+                )
 
-        # API kolonlarını model kolonlarına çevir
-        df = map_api_to_model_columns(df)
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        # Minimal izleme: model versiyonu + gecikme + olasılık özeti (arka planda).
+        log_prediction("/predict", entry.version, latency_ms, probs)
+        timer.mark("log")
 
+        response = build_prediction_response(http_request, probs, preds)
+        timer.mark("serialize")
+        timer.finish(entry.version, len(probs))
+        return response
 
-        probs, preds = predict_churn(
-            input_df=df,
-            model=model,
-            scaler=scaler,
-            feature_names=feature_names,
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        logger.exception("Unexpected error during prediction.")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def columnar_to_matrix(request: ColumnarPredictionRequest) -> tuple:
+    """
+    Columnar request'i (kolonlar, float64 matris) çiftine çevirir.
+    DataFrame ve rename yok; kolon isimleri model isimlerine çözülür,
+    tamsayı kolonları vektörel olarak kontrol edilir.
+    """
+    columns = [API_TO_MODEL_COLUMNS.get(c, c) for c in request.columns]
+    if len(set(columns)) != len(columns):
+        raise ValueError("Duplicate columns in request.")
+
+    try:
+        X = np.array(request.data, dtype=np.float64)
+    except ValueError:
+        raise ValueError("All rows in 'data' must have the same length as 'columns'.")
+
+    if X.ndim != 2 or X.shape[1] != len(columns):
+        raise ValueError("All rows in 'data' must have the same length as 'columns'.")
+
+    check_integer_columns(columns, X)
+    return columns, X
+
+
+def check_integer_columns(columns: List[str], X: np.ndarray) -> None:
+    int_idx = [i for i, c in enumerate(columns) if c in INTEGER_COLUMNS]
+    if int_idx:
+        int_block = X[:, int_idx]
+        bad = int_block != np.floor(int_block)
+        if bad.any():
+            col = columns[int_idx[int(np.argmax(bad.any(axis=0)))]]
+            raise ValueError(f"Column '{col}' must contain integer values.")
+
+
+def score_columns(columns: List[str], X: np.ndarray, entry: LoadedModel) -> tuple:
+    """
+    Request'in kolon sırasındaki matrisi skorlar (columnar ve binary endpoint'ler).
+
+    Matris önce API sırasına çevrilir; cache anahtarı, shadow scoring ve drift
+    /predict ile aynı score_matrix yolundan geçer.
+    """
+    if columns != API_FEATURE_NAMES:
+        api_model = entry.model.bind_cached(API_FEATURE_NAMES)
+        X = X[:, np.argsort(api_model.column_permutation(columns))]
+    return predict_matrix(X, entry)
+
+
+@app.post("/predict/columnar", openapi_extra=request_body_openapi(ColumnarPredictionRequest))
+def predict_columnar(
+    http_request: Request,
+    body: bytes = Depends(request_body),
+    model_version: Optional[str] = Depends(requested_model_version),
+    lane: Optional[str] = Depends(admitted(estimate_rows)),
+):
+    """
+    Büyük batch'ler için columnar churn prediction endpoint'i.
+    """
+    if lane == LARGE_LANE and large_batch_pool is not None:
+        return predict_in_process_pool(
+            http_request, "/predict/columnar", "columnar", body, model_version
         )
 
+    start_time = time.perf_counter()
+    timer = StageTimer.start(http_request, "/predict/columnar")
+    request = parse_json_body(ColumnarPredictionRequest, body)
+    timer.mark("parse_validate")
+
+    try:
+        columns, X = columnar_to_matrix(request)
+        timer.mark("to_matrix")
+
+        with registry.acquire(model_version) as entry:
+            probs, preds = score_columns(columns, X, entry)
+        timer.mark("score")
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        log_prediction("/predict/columnar", entry.version, latency_ms, probs)
+
+        response = build_prediction_response(http_request, probs, preds)
+        timer.mark("serialize")
+        timer.finish(entry.version, len(probs))
+        return response
+
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        logger.exception("Unexpected error during prediction.")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def score_body_in_process(kind: str, body: bytes, params: tuple) -> tuple:
+    """
+    Large batch process pool'unda çalışır: parse + matris + skor ana process'in
+    GIL'ini tutmaz. Model, ham parametreleriyle gelir (birkaç yüz byte);
+    sonuç aynı aritmetikle hesaplanır.
+    """
+    model = CompiledModel(*params)
+    if kind == "columnar":
+        columns, X = columnar_to_matrix(parse_json_body(ColumnarPredictionRequest, body))
+    else:
+        request = parse_json_body(PredictionRequest, body)
+        columns, X = API_FEATURE_NAMES, records_to_matrix(request.records)
+    return model.bind(columns).predict(X)
+
+
+def predict_in_process_pool(
+    http_request: Request,
+    endpoint: str,
+    kind: str,
+    body: bytes,
+    model_version: Optional[str],
+):
+    """
+    Large lane request'ini large_batch_pool'da skorlar; bu thread sadece bekler.
+    Bu yolda prediction cache, shadow scoring ve drift izleme kullanılmaz:
+    feature matrisi worker process'te kalır, geri taşımak pool'un kazancını siler.
+    """
+    start_time = time.perf_counter()
+    timer = StageTimer.start(http_request, endpoint)
+
+    try:
+        with registry.acquire(model_version) as entry:
+            model = entry.model
+            params = (model.coef, model.intercept, model.feature_names, model.mean, model.scale)
+            probs, preds = large_batch_pool.submit(
+                score_body_in_process, kind, body, params
+            ).result()
+        timer.mark("process_pool")
+
         latency_ms = (time.perf_counter() - start_time) * 1000
-        # Minimal izleme: model versiyonu + gecikme + churn olasılıkları.
-        logger.info(
-            "Prediction completed. model_version=%s latency_ms=%.2f churn_probabilities=%s",
-            settings.MODEL_VERSION,
-            latency_ms,
-            probs.tolist(),
+        log_prediction(endpoint, entry.version, latency_ms, probs)
+
+        response = build_prediction_response(http_request, probs, preds)
+        timer.mark("serialize")
+        timer.finish(entry.version, len(probs))
+        return response
+
+    except RequestValidationError:
+        raise
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        logger.exception("Unexpected error during prediction.")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+# Binary endpoint: content-type → (decode, encode). Response, request ile aynı formattadır.
+BINARY_TRANSPORTS = {
+    TENSOR_CONTENT_TYPE: (decode_tensor, encode_tensor),
+    "application/octet-stream": (decode_tensor, encode_tensor),
+    ARROW_STREAM_CONTENT_TYPE: (decode_arrow, encode_arrow),
+}
+BINARY_OUTPUT_COLUMNS = ("probability", "prediction")
+BINARY_REQUEST_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            content_type: {"schema": {"type": "string", "format": "binary"}}
+            for content_type in (TENSOR_CONTENT_TYPE, ARROW_STREAM_CONTENT_TYPE)
+        },
+    }
+}
+
+
+def estimate_binary_rows(body: bytes) -> int:
+    """
+    Tensor payload'ında satır sayısı header'dan okunur; Arrow'da body boyutundan
+    (satır başına feature x 8 byte) tahmin edilir.
+    """
+    if body.startswith(TENSOR_MAGIC):
+        return estimate_tensor_rows(body)
+    return len(body) // (8 * len(API_FEATURE_NAMES))
+
+
+@app.post("/predict/binary", openapi_extra=BINARY_REQUEST_OPENAPI)
+def predict_binary(
+    http_request: Request,
+    body: bytes = Depends(request_body),
+    model_version: Optional[str] = Depends(requested_model_version),
+    lane: Optional[str] = Depends(admitted(estimate_binary_rows)),
+):
+    """
+    İç servisler için binary churn prediction: tensor (JSON header + ham
+    little-endian float buffer) veya Arrow IPC stream. JSON parse ve Pydantic
+    doğrulaması yoktur; float64 tensor payload'ı kopyalanmadan skorlanır.
+    Response aynı formatta probability / prediction kolonlarıdır.
+    """
+    content_type = http_request.headers.get("content-type", "").split(";")[0].strip().lower()
+    transport = BINARY_TRANSPORTS.get(content_type)
+    if transport is None:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported content type {content_type!r}. Expected one of {sorted(BINARY_TRANSPORTS)}",
         )
+    decode, encode = transport
 
-        return {
-            "probabilities": probs.tolist(),
-            "predictions": preds.tolist(),
-        }
+    start_time = time.perf_counter()
+    timer = StageTimer.start(http_request, "/predict/binary")
+
+    try:
+        columns, X = decode(body)
+        columns = [API_TO_MODEL_COLUMNS.get(c, c) for c in columns]
+        if len(set(columns)) != len(columns):
+            raise ValueError("Duplicate columns in request.")
+        if not np.isfinite(X).all():
+            raise ValueError("Feature values must be finite.")
+        check_integer_columns(columns, X)
+        timer.mark("to_matrix")
+
+        with registry.acquire(model_version) as entry:
+            probs, preds = score_columns(columns, X, entry)
+        timer.mark("score")
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        log_prediction("/predict/binary", entry.version, latency_ms, probs)
 
+        response = Response(content=encode(BINARY_OUTPUT_COLUMNS, (probs, preds)), media_type=content_type)
+        timer.mark("serialize")
+        timer.finish(entry.version, len(probs))
+        return response
+
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception:
         logger.exception("Unexpected error during prediction.")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.post("/predict/raw", openapi_extra=request_body_openapi(RawPredictionRequest))
+def predict_raw(
+    http_request: Request,
+    body: bytes = Depends(request_body),
+    model_version: Optional[str] = Depends(requested_model_version),
+    # Kategorik string değerler '{' içerebilir; tahmin üst sınırdır.
+    lane: Optional[str] = Depends(admitted(estimate_records, count_records)),
+):
+    """
+    Ham kategorik değerlerle (örn. Contract: "Two year") churn prediction.
+    """
+    start_time = time.perf_counter()
+    timer = StageTimer.start(http_request, "/predict/raw")
+    request = parse_json_body(RawPredictionRequest, body)
+    timer.mark("parse_validate")
+
+    try:
+        X = raw_encoder.encode([r.model_dump() for r in request.records])
+        timer.mark("encode")
+        with registry.acquire(model_version) as entry:
+            probs, preds = predict_matrix(X, entry)
+        timer.mark("score")
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        log_prediction("/predict/raw", entry.version, latency_ms, probs)
+
+        response = build_prediction_response(http_request, probs, preds)
+        timer.mark("serialize")
+        timer.finish(entry.version, len(probs))
+        return response
+
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        logger.exception("Unexpected error during prediction.")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.post("/explain", openapi_extra=request_body_openapi(PredictionRequest))
+def explain(
+    http_request: Request,
+    body: bytes = Depends(request_body),
+    top_k: int = Query(
+        DEFAULT_EXPLAIN_TOP_K,
+        ge=1,
+        le=len(API_COLUMNS),
+        description="Number of strongest feature contributions to return per record.",
+    ),
+    model_version: Optional[str] = Depends(requested_model_version),
+    lane: Optional[str] = Depends(admitted(estimate_records)),
+):
+    """
+    Kayıt başına churn olasılığı + en etkili top_k feature'ın logit katkısı.
+
+    Katkılar lineer modelden kapalı formda, tüm batch için tek vektörel
+    işlemle hesaplanır: coef * (x - mean) / scale. Satırın tüm katkıları +
+    intercept, logit'e eşittir. top_features[i] ve top_contributions[i]
+    i. kayda aittir; |katkı|'ya göre azalan sıradadır.
+    """
+    start_time = time.perf_counter()
+    timer = StageTimer.start(http_request, "/explain")
+    request = parse_json_body(PredictionRequest, body)
+    timer.mark("parse_validate")
+
+    try:
+        X = records_to_matrix(request.records)
+        timer.mark("to_matrix")
+
+        with registry.acquire(model_version) as entry:
+            api_model = entry.model.bind_cached(API_FEATURE_NAMES)
+            probs, preds = api_model.predict(X)
+            observe_drift(X, entry, probs)
+            timer.mark("score")
+            idx, contributions = api_model.top_contributions(X, top_k)
+        timer.mark("explain")
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        log_prediction("/explain", entry.version, latency_ms, probs)
+
+        response = build_json_response(
+            http_request,
+            dumps(
+                {
+                    "probabilities": probs,
+                    "predictions": preds,
+                    "intercept": api_model.intercept,
+                    "top_features": API_COLUMN_NAMES[idx].tolist(),
+                    "top_contributions": contributions,
+                }
+            ),
+        )
+        timer.mark("serialize")
+        timer.finish(entry.version, len(probs))
+        return response
+
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        logger.exception("Unexpected error during explanation.")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.post(
+    "/predict/stream",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": CustomerRecord.model_json_schema()}},
+        }
+    },
+)
+async def predict_stream(model_version: Optional[str] = Depends(requested_model_version)):
+    """
+    NDJSON streaming churn prediction endpoint.
+    Her satır bir CustomerRecord; her girdi satırı için bir sonuç satırı döner.
+    """
+    try:
+        entry = registry.acquire_entry(model_version)
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    # Versiyon stream bitene kadar kullanımda kalır.
+    return NDJSONScoringResponse(
+        score_fn=partial(predict_matrix, entry=entry),
+        chunk_size=settings.STREAM_CHUNK_SIZE,
+        background=BackgroundTask(registry.release, entry),
+    )
+
+
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    """
+    Liveness: process ayakta ve event loop cevap veriyor. Model veya bağımlılık
+    kontrolü yapılmaz; threadpool'a da girmez.
+    """
+    return {"status": "ok"}
+
+
+@app.get("/readyz", include_in_schema=False)
+async def readyz():
+    """
+    Readiness: aktif model yüklendi ve dummy batch ile ısıtıldı; değilse 503.
+    """
+    version = registry.active_version
+    if not ready or version is None or not registry.is_loaded(version):
+        raise HTTPException(status_code=503, detail="Model is not loaded yet")
+    return {"status": "ready", "model_version": version, "startup_seconds": startup_timings}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus text formatında servis metrikleri.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(content=METRICS_REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/stats/batching")
+def batching_stats():
+    """
+    Micro-batcher'ın ulaştığı batch boyutları.
+    """
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats.snapshot()}
+
+
+@app.get("/stats/shadow")
+def shadow_stats():
+    """
+    Shadow scoring: versiyon bazlı olasılık dağılımları ve aktif versiyonla uyuşmazlık oranları.
+    """
+    if shadow_scorer is None:
+        return {"enabled": False}
+    return {"enabled": True, **shadow_scorer.snapshot()}
+
+
+@app.get("/drift")
+def drift():
+    """
+    Canlı input / skor dağılımlarının eğitim referansıyla karşılaştırması:
+    feature başına ortalama kayması, sürekli feature'lar, one-hot gruplar ve
+    skor için PSI.
+    """
+    monitor = drift_monitor
+    if monitor is None:
+        return {"enabled": False}
+    return {"enabled": True, **monitor.report()}
+
+
+@app.get("/stats/admission")
+def admission_stats():
+    """
+    Admission control: lane doluluğu, kuyruktaki kayıtlar ve reddedilen request'ler.
+    """
+    if admission is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "large_batch_process_workers": settings.ADMISSION_LARGE_BATCH_PROCESS_WORKERS,
+        **admission.snapshot(),
+    }
+
+
+@app.get("/top-risk")
+def top_risk(
+    http_request: Request,
+    k: int = Query(100, ge=1, description="Number of customers to return."),
+    model_version: Optional[str] = Query(
+        None, description="Only customers scored with this version (default: any)."
+    ),
+):
+    """
+    Skor deposundaki churn olasılığı en yüksek k müşteri (olasılık index'inden
+    okunur; yeniden skorlama yok). Depo `python -m src.score_store ingest` ile güncellenir.
+    """
+    store = score_store
+    if store is None:
+        raise HTTPException(status_code=404, detail="Score store is not configured")
+    if k > settings.TOP_RISK_MAX_K:
+        raise HTTPException(status_code=400, detail=f"k cannot exceed {settings.TOP_RISK_MAX_K}")
+
+    customers = store.top_k(k, model_version)
+    return build_json_response(http_request, dumps({"k": k, "customers": customers}))
+
+
+@app.get("/stats/cache")
+def cache_stats():
+    """
+    Prediction cache hit / miss / eviction sayaçları.
+    """
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_cache.stats()}
+
+
+@app.get("/models")
+def list_models():
+    """
+    Bellekteki model versiyonları, aktif versiyon ve devam eden yüklemeler.
+    """
+    return registry.describe()
+
+
+def ensure_model_changes_allowed() -> None:
+    if model_changes_locked:
+        raise HTTPException(
+            status_code=409,
+            detail="Model changes are disabled with multiple workers; "
+            "set CHURNGUARD_MODEL_VERSION and restart instead.",
+        )
+
+
+@app.post("/models/{version}/load", status_code=202)
+async def load_model_version(version: str, activate: bool = False):
+    """
+    Versiyonu arka planda yükler; hazır olunca (activate=true ise) atomik olarak aktif olur.
+    """
+    ensure_model_changes_allowed()
+    try:
+        await registry.load_in_background(version, activate=activate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"version": version, "status": "loading", "activate": activate}
+
+
+@app.post("/models/{version}/activate")
+def activate_model_version(version: str):
+    ensure_model_changes_allowed()
+    try:
+        registry.activate(version)
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"active_version": version}
+
+
+@app.delete("/models/{version}")
+def unload_model_version(version: str):
+    ensure_model_changes_allowed()
+    try:
+        registry.unload(version)
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"unloaded": version}
+
+
+startup_timings["import"] = time.perf_counter() - _import_started
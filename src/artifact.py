@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.compiled import CompiledModel
+
+# ======================================================
+# FORMAT
+# ======================================================
+# models/<version>/model.<sha>.f64 : ham little-endian float64 dizisi
+#                                    [coef(n) | intercept(1) | mean(n) | scale(n)]
+# models/<version>/artifact.json   : format, feature sırası, layout, sha256, binary dosya adı
+#
+# Binary içerik adresli bir isimle yazılır ve header en son değiştirilir; okuyan
+# taraf her an ya eski header + eski binary'yi ya da yenilerini görür.
+# "binary" alanı olmayan (eski) header'lar model.f64'e bakar.
+ARTIFACT_FORMAT = "churnguard-linear-f64"
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_BINARY_NAME = "model.f64"
+ARTIFACT_HEADER_NAME = "artifact.json"
+ARTIFACT_DTYPE = "<f8"
+
+
+def _binary_path(model_dir: Path, header: Dict[str, Any]) -> Path:
+    return model_dir / header.get("binary", ARTIFACT_BINARY_NAME)
+
+
+def has_compact_artifact(model_dir: Path) -> bool:
+    header_path = model_dir / ARTIFACT_HEADER_NAME
+    if not header_path.exists():
+        return False
+    return _binary_path(model_dir, json.loads(header_path.read_text())).exists()
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def write_compact_artifact(model: Any, scaler: Any, feature_names: List[str], model_dir: Path) -> Path:
+    """
+    Eğitilmiş model + scaler'ı pickle'sız, mmap edilebilir binary artifact olarak yazar.
+    """
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    if coef.ndim != 2 or coef.shape[0] != 1:
+        raise ValueError("Only binary linear models can be exported.")
+
+    n = coef.shape[1]
+    if len(feature_names) != n:
+        raise ValueError(f"Feature count mismatch: {len(feature_names)} names for {n} coefficients.")
+
+    mean = getattr(scaler, "mean_", None)
+    scale = getattr(scaler, "scale_", None)
+    values = np.concatenate(
+        [
+            coef[0],
+            np.ravel(model.intercept_)[:1],
+            np.zeros(n) if mean is None else np.asarray(mean, dtype=np.float64),
+            np.ones(n) if scale is None else np.asarray(scale, dtype=np.float64),
+        ]
+    ).astype(ARTIFACT_DTYPE)
+
+    model_dir.mkdir(parents=True, exist_ok=True)
+    header_path = model_dir / ARTIFACT_HEADER_NAME
+    previous = (
+        _binary_path(model_dir, json.loads(header_path.read_text()))
+        if header_path.exists()
+        else None
+    )
+
+    # Okuyan worker'lar yarım dosya görmesin: önce tmp, sonra atomik rename.
+    data = values.tobytes()
+    digest = hashlib.sha256(data).hexdigest()
+    binary_path = model_dir / f"model.{digest[:16]}.f64"
+    tmp_binary = binary_path.with_name(binary_path.name + ".tmp")
+    tmp_binary.write_bytes(data)
+    os.replace(tmp_binary, binary_path)
+
+    header: Dict[str, Any] = {
+        "format": ARTIFACT_FORMAT,
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "dtype": ARTIFACT_DTYPE,
+        "n_features": n,
+        "feature_names": list(feature_names),
+        "layout": {
+            "coef": [0, n],
+            "intercept": [n, n + 1],
+            "mean": [n + 1, 2 * n + 1],
+            "scale": [2 * n + 1, 3 * n + 1],
+        },
+        "sha256": digest,
+        "binary": binary_path.name,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    tmp_header = header_path.with_name(header_path.name + ".tmp")
+    tmp_header.write_text(json.dumps(header, indent=2))
+    # Yayın anı: header yeni binary'yi gösterir.
+    os.replace(tmp_header, header_path)
+
+    # Eski header'ı henüz okumuş olan biri için bir önceki binary bırakılır;
+    # daha eskiler silinir (mmap edilmiş dosyalar unlink'ten etkilenmez).
+    keep = {binary_path, previous}
+    for stale in model_dir.glob("model*.f64"):
+        if stale not in keep:
+            stale.unlink(missing_ok=True)
+    return binary_path
+
+
+def load_compact_artifact(model_dir: Path, verify: bool = True) -> CompiledModel:
+    """
+    Binary artifact'ı memory-map ederek derlenmiş modele çevirir.
+    Aynı host'taki worker'lar dosyanın page cache sayfalarını paylaşır;
+    pickle / sklearn import'u gerekmez.
+    """
+    header_path = model_dir / ARTIFACT_HEADER_NAME
+    if not header_path.exists():
+        raise FileNotFoundError(f"Compact artifact not found in: {model_dir}")
+
+    header = json.loads(header_path.read_text())
+    binary_path = _binary_path(model_dir, header)
+    if not binary_path.exists():
+        raise FileNotFoundError(f"Compact artifact not found in: {model_dir}")
+    if header.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"Unknown artifact format: {header.get('format')}")
+    if header.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format version: {header.get('format_version')}")
+    if verify and _sha256(binary_path) != header["sha256"]:
+        raise ValueError(f"Artifact checksum mismatch: {binary_path}")
+
+    n = int(header["n_features"])
+    values = np.memmap(binary_path, dtype=header["dtype"], mode="r")
+    if values.shape[0] != 3 * n + 1:
+        raise ValueError(f"Artifact size does not match header: {binary_path}")
+
+    def section(name: str) -> np.ndarray:
+        start, end = header["layout"][name]
+        return values[start:end]
+
+    return CompiledModel(
+        coef=section("coef"),
+        intercept=float(section("intercept")[0]),
+        feature_names=header["feature_names"],
+        mean=section("mean"),
+        scale=section("scale"),
+    )
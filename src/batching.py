@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Batch boyutu histogramı için üst sınırlar (kayıt sayısı).
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class BatchStats:
+    """
+    Ulaşılan batch boyutları için thread-safe sayaçlar.
+    """
+
+    def __init__(self, buckets: Tuple[int, ...] = BATCH_SIZE_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.records = 0
+        self.max_batch_size = 0
+        # Son eleman +Inf kovası.
+        self.bucket_counts = [0] * (len(buckets) + 1)
+
+    def observe(self, n_requests: int, n_records: int) -> None:
+        idx = int(np.searchsorted(self.buckets, n_records))
+        with self._lock:
+            self.batches += 1
+            self.requests += n_requests
+            self.records += n_records
+            self.max_batch_size = max(self.max_batch_size, n_records)
+            self.bucket_counts[idx] += 1
+
+    def histogram(self) -> Tuple[Tuple[int, ...], List[int], int]:
+        """
+        (kova sınırları, kova sayaçları [+Inf dahil], toplam kayıt) — /metrics için.
+        """
+        with self._lock:
+            return self.buckets, list(self.bucket_counts), self.records
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "records": self.records,
+                "mean_batch_size": self.records / self.batches if self.batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "batch_size_histogram": {
+                    **{str(b): c for b, c in zip(self.buckets, self.bucket_counts)},
+                    "+Inf": self.bucket_counts[-1],
+                },
+            }
+
+
+class MicroBatcher:
+    """
+    Eşzamanlı küçük request'leri kısa bir pencere boyunca toplayıp
+    tek vektörel skor çağrısında hesaplar, sonuçları bekleyen
+    request'lere geri dağıtır.
+
+    Pencere, max_batch_size kayda ulaşınca ya da ilk kayıttan itibaren
+    max_wait_us mikro saniye geçince kapanır.
+
+    Her kayıt submit'te verilen key ile (örn. request'in aldığı model
+    versiyonu) gelir; pencere key başına gruplanır ve score_fn(batch, key)
+    her grup için ayrı çağrılır. Key'ler kimlikle (is) karşılaştırılır.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[np.ndarray, Any], np.ndarray],
+        max_batch_size: int,
+        max_wait_us: int,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_us < 0:
+            raise ValueError("max_wait_us must be non-negative")
+
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_us / 1_000_000
+        self.stats = BatchStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Kuyruktan alınmış, henüz sonuçlanmamış pencere; stop'ta bunlar da hata alır.
+        self._window: List[Tuple[np.ndarray, Any, asyncio.Future]] = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "Micro-batcher started. max_batch_size=%d max_wait_us=%d",
+            self.max_batch_size,
+            int(self.max_wait * 1_000_000),
+        )
+
+    async def stop(self) -> None:
+        """
+        Task'ı durdurur; pencerede ve kuyrukta bekleyen request'ler hata alır.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        pending = self._window
+        self._window = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._queue = None
+
+        error = RuntimeError("Micro-batcher stopped.")
+        for _, _, fut in pending:
+            if not fut.done():
+                fut.set_exception(error)
+
+    async def submit(self, X: np.ndarray, key: Any = None) -> np.ndarray:
+        """
+        X satırlarını bir sonraki batch'e ekler, bu satırların olasılıklarını döner.
+        Sadece aynı key ile gelen kayıtlar birlikte skorlanır.
+        """
+        if self._queue is None:
+            raise RuntimeError("Micro-batcher is not running.")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((X, key, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[np.ndarray, Any, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        first = await self._queue.get()
+        items = self._window = [first]
+        size = len(first[0])
+        deadline = loop.time() + self.max_wait
+
+        while size < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            items.append(item)
+            size += len(item[0])
+
+        return items
+
+    async def _run(self) -> None:
+        while True:
+            items = await self._collect()
+            groups: Dict[int, Tuple[Any, List[Tuple[np.ndarray, asyncio.Future]]]] = {}
+            for X, key, fut in items:
+                # İptal edilmiş (client bağlantısı kopmuş) request'ler batch'e girmez.
+                if not fut.done():
+                    groups.setdefault(id(key), (key, []))[1].append((X, fut))
+
+            for key, group in groups.values():
+                await self._score_group(key, group)
+            self._window = []
+
+    async def _score_group(
+        self,
+        key: Any,
+        items: List[Tuple[np.ndarray, asyncio.Future]],
+    ) -> None:
+        try:
+            # Şekil uyuşmazlığı gibi hatalar da task'ı öldürmeden future'lara iletilir.
+            batch = items[0][0] if len(items) == 1 else np.vstack([X for X, _ in items])
+            self.stats.observe(len(items), len(batch))
+            # Skor hesabı event loop'u bloklamasın.
+            loop = asyncio.get_running_loop()
+            probs = await loop.run_in_executor(None, self.score_fn, batch, key)
+        except Exception as exc:
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+
+        offset = 0
+        for X, fut in items:
+            end = offset + len(X)
+            if not fut.done():
+                fut.set_result(probs[offset:end])
+            offset = end
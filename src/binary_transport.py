@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# ======================================================
+# TENSOR FORMATI
+# ======================================================
+# İç servisler için JSON'suz, kopyasız taşıma formatı:
+#
+#   0  magic         b"CGT1"
+#   4  header_len    uint32 little-endian (padding dahil)
+#   8  header        UTF-8 JSON, payload 8 byte hizalı başlasın diye boşlukla doldurulur:
+#                    {"columns": [...], "rows": n, "dtype": "<f8", "order": "F"}
+#   8+header_len     payload: rows x len(columns) değer, little-endian
+#
+# order "F": her kolon ardışık (kolon-major; columnar kaynaklar için doğal düzen),
+# order "C": her satır ardışık. "<f8" payload'lar kopyalanmadan skor matrisine
+# view olarak bağlanır; "<f4" bir kere float64'e çevrilir.
+TENSOR_CONTENT_TYPE = "application/x-churnguard-tensor"
+ARROW_STREAM_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+MAGIC = b"CGT1"
+PREFIX = struct.Struct("<4sI")
+ALIGNMENT = 8
+SUPPORTED_DTYPES = ("<f8", "<f4")
+SUPPORTED_ORDERS = ("F", "C")
+# Bozuk / kötü niyetli header'lar için üst sınır (41 kolon ismi ~1 KB).
+MAX_HEADER_BYTES = 64 * 1024
+
+
+def _header_bytes(header: Dict[str, Any]) -> bytes:
+    raw = json.dumps(header, separators=(",", ":")).encode()
+    padding = -(PREFIX.size + len(raw)) % ALIGNMENT
+    return raw + b" " * padding
+
+
+def read_tensor_header(body: bytes) -> Tuple[Dict[str, Any], int]:
+    """
+    (header, payload offset) döner; payload'a dokunmaz.
+    """
+    if len(body) < PREFIX.size:
+        raise ValueError("Tensor payload is too short.")
+    magic, header_len = PREFIX.unpack_from(body)
+    if magic != MAGIC:
+        raise ValueError(f"Invalid tensor magic: {magic!r}")
+    if header_len > MAX_HEADER_BYTES or PREFIX.size + header_len > len(body):
+        raise ValueError("Invalid tensor header length.")
+
+    try:
+        header = json.loads(body[PREFIX.size : PREFIX.size + header_len])
+    except ValueError:
+        raise ValueError("Tensor header is not valid JSON.")
+    if not isinstance(header, dict):
+        raise ValueError("Tensor header must be a JSON object.")
+    return header, PREFIX.size + header_len
+
+
+def decode_tensor(body: bytes) -> Tuple[List[str], np.ndarray]:
+    """
+    Tensor payload'ını (kolonlar, (rows, len(columns)) matris) çiftine çevirir.
+    "<f8" payload'larda matris body üzerinde salt-okunur bir view'dır.
+    """
+    header, offset = read_tensor_header(body)
+    columns = header.get("columns")
+    rows = header.get("rows")
+    dtype = header.get("dtype", "<f8")
+    order = header.get("order", "F")
+
+    if not isinstance(columns, list) or not all(isinstance(c, str) for c in columns):
+        raise ValueError("Tensor header 'columns' must be a list of strings.")
+    if not isinstance(rows, int) or isinstance(rows, bool) or rows < 0:
+        raise ValueError("Tensor header 'rows' must be a non-negative integer.")
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported tensor dtype: {dtype!r}. Expected one of {list(SUPPORTED_DTYPES)}")
+    if order not in SUPPORTED_ORDERS:
+        raise ValueError(f"Unsupported tensor order: {order!r}. Expected one of {list(SUPPORTED_ORDERS)}")
+
+    count = rows * len(columns)
+    expected = offset + count * np.dtype(dtype).itemsize
+    if len(body) != expected:
+        raise ValueError(f"Tensor payload size mismatch: expected {expected} bytes, got {len(body)}.")
+
+    values = np.frombuffer(body, dtype=dtype, count=count, offset=offset)
+    if order == "F":
+        X = values.reshape(len(columns), rows).T
+    else:
+        X = values.reshape(rows, len(columns))
+    # Native float64 view'a çevrilir; "<f8" little-endian makinede kopyasızdır.
+    return columns, X.astype(np.float64, copy=False)
+
+
+def encode_tensor(columns: Sequence[str], arrays: Sequence[np.ndarray]) -> bytes:
+    """
+    Eşit uzunluktaki 1D dizileri "<f8", kolon-major tensor payload'ına yazar.
+    """
+    rows = len(arrays[0]) if arrays else 0
+    header = _header_bytes(
+        {"columns": list(columns), "rows": rows, "dtype": "<f8", "order": "F"}
+    )
+    parts = [PREFIX.pack(MAGIC, len(header)), header]
+    parts += [np.asarray(a, dtype="<f8").tobytes() for a in arrays]
+    return b"".join(parts)
+
+
+def estimate_tensor_rows(body: bytes) -> int:
+    """
+    Admission control için satır sayısı; sadece header okunur. Geçersiz
+    header'da 0 döner, hata skorlamada raporlanır.
+    """
+    try:
+        rows = read_tensor_header(body)[0].get("rows", 0)
+    except ValueError:
+        return 0
+    return rows if isinstance(rows, int) and rows > 0 else 0
+
+
+# ======================================================
+# ARROW IPC (opsiyonel, pyarrow)
+# ======================================================
+def _pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError("pyarrow is required for Arrow IPC payloads.")
+    return pa
+
+
+def decode_arrow(body: bytes) -> Tuple[List[str], np.ndarray]:
+    """
+    Arrow IPC stream'ini (kolonlar, matris) çiftine çevirir. null içermeyen
+    float64 kolonlar buffer'dan kopyasız okunur; tek kopya kolon-major
+    matrise yazılırken yapılır (satır bazlı dönüşüm yok).
+    """
+    pa = _pyarrow()
+    try:
+        table = pa.ipc.open_stream(body).read_all()
+    except (pa.ArrowInvalid, OSError) as e:
+        raise ValueError(f"Invalid Arrow IPC stream: {e}")
+
+    X = np.empty((table.num_columns, table.num_rows), dtype=np.float64)
+    for i, (name, column) in enumerate(zip(table.column_names, table.columns)):
+        if column.null_count:
+            raise ValueError(f"Column '{name}' contains nulls.")
+        if not (pa.types.is_floating(column.type) or pa.types.is_integer(column.type)):
+            raise ValueError(f"Column '{name}' must be numeric, got {column.type}.")
+        offset = 0
+        for chunk in column.chunks:
+            values = chunk.to_numpy(zero_copy_only=False)
+            X[i, offset : offset + len(values)] = values
+            offset += len(values)
+    return list(table.column_names), X.T
+
+
+def encode_arrow(columns: Sequence[str], arrays: Sequence[np.ndarray]) -> bytes:
+    """
+    Dizileri tek record batch'lik Arrow IPC stream'i olarak yazar.
+    """
+    pa = _pyarrow()
+    batch = pa.record_batch([pa.array(a) for a in arrays], names=list(columns))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def row_digests(X: np.ndarray, prefix: bytes = b"") -> List[bytes]:
+    """
+    Her satır için (prefix + float64 satır byte'ları) 16 byte'lık blake2b özeti.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    # -0.0 ile 0.0 aynı özete düşsün.
+    X = X + 0.0
+    base = hashlib.blake2b(prefix, digest_size=16)
+    data = X.tobytes()
+    width = X.shape[1] * X.itemsize
+
+    digests = []
+    for i in range(0, len(data), width):
+        h = base.copy()
+        h.update(data[i:i + width])
+        digests.append(h.digest())
+    return digests
+
+
+class PredictionCache:
+    """
+    Hizalanmış feature vektörü + model versiyonu ile anahtarlanan,
+    boyutu sınırlı (LRU) ve opsiyonel TTL'li olasılık cache'i.
+
+    Batch'lerde sadece cache'te olmayan satırlar modele gönderilir.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key → (olasılık, son geçerlilik zamanı)
+        self._entries: "OrderedDict[bytes, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_keys(X: np.ndarray, model_version: str) -> List[bytes]:
+        """
+        Her satır için (model versiyonu + satır byte'ları) 16 byte'lık blake2b özeti.
+        """
+        return row_digests(X, model_version.encode() + b"\0")
+
+    def get_many(
+        self,
+        X: np.ndarray,
+        model_version: str,
+    ) -> Tuple[np.ndarray, np.ndarray, List[bytes]]:
+        """
+        (olasılıklar, miss index'leri, miss anahtarları) döner.
+        Miss olan satırların olasılığı NaN'dır.
+        """
+        keys = self.make_keys(X, model_version)
+        probs = np.full(len(keys), np.nan)
+        miss_idx = []
+        now = time.monotonic()
+        expirations = 0
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] < now:
+                    del self._entries[key]
+                    expirations += 1
+                    entry = None
+                if entry is None:
+                    miss_idx.append(i)
+                    continue
+                self._entries.move_to_end(key)
+                probs[i] = entry[0]
+
+            self.hits += len(keys) - len(miss_idx)
+            self.misses += len(miss_idx)
+            self.expirations += expirations
+
+        return probs, np.asarray(miss_idx, dtype=np.intp), [keys[i] for i in miss_idx]
+
+    def put_many(self, keys: List[bytes], probs: np.ndarray) -> None:
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        )
+        with self._lock:
+            for key, prob in zip(keys, probs.tolist()):
+                self._entries[key] = (prob, expires_at)
+                self._entries.move_to_end(key)
+
+            overflow = len(self._entries) - self.max_entries
+            for _ in range(max(overflow, 0)):
+                self._entries.popitem(last=False)
+            self.evictions += max(overflow, 0)
+
+    def invalidate(self) -> None:
+        """
+        Model değiştiğinde tüm girdileri siler.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.5
+# Farklı kolon sıraları için tutulacak bağlanmış model sayısı üst sınırı.
+MAX_BOUND_MODELS = 32
+# Compact skorlamada satırlar bu boyutta bloklarla işlenir; uint8 → float32
+# geçici kopyası blok boyutuyla sınırlı kalır (65536 x 37 x 4 byte ≈ 9.7 MB).
+COMPACT_BLOCK_ROWS = 65_536
+# Compact (float32) olasılıkların float64 yoluna göre dokümante edilen en büyük
+# mutlak farkı. Telco verisinde ölçülen ~1.4e-7; geniş aralıklı sentetik girdide ~2.7e-7.
+COMPACT_MAX_PROBABILITY_DEVIATION = 1e-6
+
+
+def sigmoid(z: np.ndarray) -> np.ndarray:
+    """
+    Sayısal olarak kararlı lojistik fonksiyon (scipy.special.expit muadili).
+    """
+    out = np.empty_like(z)
+    pos = z >= 0
+    out[pos] = 1.0 / (1.0 + np.exp(-z[pos]))
+    exp_z = np.exp(z[~pos])
+    out[~pos] = exp_z / (1.0 + exp_z)
+    return out
+
+
+class CompiledModel:
+    """
+    StandardScaler + LogisticRegression çiftini tek bir lineer çekirdeğe katlar.
+
+    (x - mean) / scale · w + b  ==  x · (w / scale) + (b - Σ mean·w/scale)
+
+    Böylece skor; DataFrame, scaler.transform ve predict_proba olmadan
+    tek bir matmul + sigmoid ile hesaplanır.
+    """
+
+    def __init__(
+        self,
+        coef: np.ndarray,
+        intercept: float,
+        feature_names: Sequence[str],
+        mean: np.ndarray | None = None,
+        scale: np.ndarray | None = None,
+    ) -> None:
+        coef = np.asarray(coef, dtype=np.float64).ravel()
+        n_features = coef.shape[0]
+
+        if len(feature_names) != n_features:
+            raise ValueError(
+                f"Feature count mismatch: {len(feature_names)} names for {n_features} coefficients."
+            )
+
+        mean = np.zeros(n_features) if mean is None else np.asarray(mean, dtype=np.float64)
+        scale = np.ones(n_features) if scale is None else np.asarray(scale, dtype=np.float64)
+
+        # Ham parametreler (açıklama / export için) saklanır.
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.mean = mean
+        self.scale = scale
+        self.feature_names: Tuple[str, ...] = tuple(feature_names)
+        self._index: Dict[str, int] = {name: i for i, name in enumerate(self.feature_names)}
+        self._bound: Dict[Tuple[str, ...], "CompiledModel"] = {}
+        self._bound_lock = threading.Lock()
+
+        # Scaler katlanmış ağırlıklar: scoring sırasında tek matmul.
+        self.weights = np.ascontiguousarray(coef / scale)
+        self.bias = float(self.intercept - np.dot(mean, self.weights))
+        # Katkı: coef * (x - mean) / scale == x * weights - mean * weights
+        self.contribution_offset = np.ascontiguousarray(mean * self.weights)
+
+    @classmethod
+    def from_artifact(cls, model: Any, scaler: Any, feature_names: List[str]) -> "CompiledModel":
+        """
+        Eğitilmiş sklearn model + scaler'dan derlenmiş model üretir.
+        """
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        if coef.ndim != 2 or coef.shape[0] != 1:
+            raise ValueError("Only binary linear models can be compiled.")
+
+        return cls(
+            coef=coef[0],
+            intercept=float(np.ravel(model.intercept_)[0]),
+            feature_names=feature_names,
+            mean=getattr(scaler, "mean_", None),
+            scale=getattr(scaler, "scale_", None),
+        )
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_names)
+
+    def column_permutation(self, columns: Sequence[str]) -> np.ndarray:
+        """
+        Verilen kolon sırasındaki her kolonun model içindeki index'ini döner.
+        """
+        missing = set(self.feature_names) - set(columns)
+        extra = set(columns) - set(self.feature_names)
+        if missing or extra or len(columns) != self.n_features:
+            raise ValueError(
+                f"Schema mismatch. Missing: {sorted(missing)} Extra: {sorted(extra)}"
+            )
+        return np.fromiter((self._index[c] for c in columns), dtype=np.intp, count=len(columns))
+
+    def bind(self, columns: Sequence[str]) -> "CompiledModel":
+        """
+        Parametreleri verilen kolon sırasına göre yeniden dizer.
+        Input matrisi kopyalanıp yeniden sıralanmaz; permütasyon bir kere
+        ağırlıklara uygulanır.
+        """
+        perm = self.column_permutation(columns)
+        return CompiledModel(
+            coef=self.coef[perm],
+            intercept=self.intercept,
+            feature_names=list(columns),
+            mean=self.mean[perm],
+            scale=self.scale[perm],
+        )
+
+    def bind_cached(self, columns: Sequence[str]) -> "CompiledModel":
+        """
+        bind() ile aynı; aynı kolon sırası tekrar geldiğinde permütasyon
+        yeniden hesaplanmaz.
+        """
+        key = tuple(columns)
+        bound = self._bound.get(key)
+        if bound is None:
+            bound = self.bind(key)
+            with self._bound_lock:
+                if len(self._bound) >= MAX_BOUND_MODELS:
+                    self._bound.pop(next(iter(self._bound)))
+                self._bound[key] = bound
+        return bound
+
+    def _as_matrix(self, X: Any) -> np.ndarray:
+        # Kolon-major (F-order) girdiler kopyalanmaz; gemv iki düzende de aynı hızdadır.
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected a 2D matrix with {self.n_features} columns, got shape {X.shape}."
+            )
+        return X
+
+    def decision_function(self, X: Any) -> np.ndarray:
+        return self._as_matrix(X) @ self.weights + self.bias
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """
+        Churn (pozitif sınıf) olasılıklarını 1D array olarak döner.
+        """
+        return sigmoid(self.decision_function(X))
+
+    def predict(
+        self,
+        X: Any,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        predict_churn ile aynı sözleşme: (olasılıklar, 0/1 tahminler).
+        """
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError("threshold must be between 0.0 and 1.0")
+
+        probs = self.predict_proba(X)
+        preds = (probs >= threshold).astype(int)
+        return probs, preds
+
+    def contributions(self, X: Any) -> np.ndarray:
+        """
+        (n, n_features) katkı matrisi: coef * (x - mean) / scale.
+        Satır toplamı + intercept == decision_function (logit). Referans nokta
+        eğitim ortalamasıdır; değeri 0 olan one-hot kolonlar da katkı üretir.
+        """
+        X = self._as_matrix(X)
+        return X * self.weights - self.contribution_offset
+
+    def top_contributions(self, X: Any, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Her satır için mutlak değerce en büyük k katkının (kolon index'leri,
+        katkılar) çiftini büyükten küçüğe döner. Tam sıralama yerine
+        argpartition ile seçilir; sadece seçilen k tanesi sıralanır.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+
+        C = self.contributions(X)
+        magnitude = np.abs(C)
+        k = min(k, self.n_features)
+        if k < self.n_features:
+            idx = np.argpartition(magnitude, self.n_features - k, axis=1)[:, -k:]
+        else:
+            idx = np.broadcast_to(np.arange(self.n_features), C.shape)
+
+        order = np.argsort(-np.take_along_axis(magnitude, idx, axis=1), axis=1, kind="stable")
+        idx = np.take_along_axis(idx, order, axis=1)
+        return idx, np.take_along_axis(C, idx, axis=1)
+
+    def compact(self, numeric_columns: Sequence[str]) -> "CompactModel":
+        """
+        Aynı modelin uint8 (binary / one-hot) + float32 (sayısal) girdi alan hali.
+        """
+        return CompactModel(self, numeric_columns)
+
+
+class CompactBatch(NamedTuple):
+    """
+    Compact girdi: kolonlar CompactModel.binary_columns / numeric_columns sırasındadır.
+    """
+
+    binary: np.ndarray  # (n, n_binary) uint8
+    numeric: np.ndarray  # (n, n_numeric) float32
+
+
+class CompactModel:
+    """
+    Satır başına 41 x 8 byte float64 yerine binary / one-hot kolonlar uint8,
+    sayısal kolonlar float32 tutulur (Telco şemasında 37 + 4 x 4 = 53 byte).
+
+    Skor blok blok hesaplanır: binary @ w_bin + numeric @ w_num + bias.
+    Ölçeklenmiş veya float64 (n, n_features) matris hiç oluşmaz. Çarpımlar
+    float32'dir; olasılık farkı float64 yoluna göre en fazla
+    COMPACT_MAX_PROBABILITY_DEVIATION'dır.
+    """
+
+    def __init__(self, model: CompiledModel, numeric_columns: Sequence[str]) -> None:
+        numeric = set(numeric_columns)
+        unknown = numeric - set(model.feature_names)
+        if unknown:
+            raise ValueError(f"Unknown numeric columns: {sorted(unknown)}")
+
+        self.feature_names = model.feature_names
+        self.numeric_columns: Tuple[str, ...] = tuple(c for c in model.feature_names if c in numeric)
+        self.binary_columns: Tuple[str, ...] = tuple(
+            c for c in model.feature_names if c not in numeric
+        )
+        numeric_idx = [model._index[c] for c in self.numeric_columns]
+        binary_idx = [model._index[c] for c in self.binary_columns]
+        self.numeric_weights = model.weights[numeric_idx].astype(np.float32)
+        self.binary_weights = model.weights[binary_idx].astype(np.float32)
+        self.bias = model.bias
+
+    def _check(self, batch: CompactBatch) -> None:
+        binary, numeric = batch
+        if binary.dtype != np.uint8 or numeric.dtype != np.float32:
+            raise ValueError("Compact batches must be (uint8 binary, float32 numeric) matrices.")
+        if (
+            binary.ndim != 2
+            or numeric.ndim != 2
+            or binary.shape != (binary.shape[0], len(self.binary_columns))
+            or numeric.shape != (binary.shape[0], len(self.numeric_columns))
+        ):
+            raise ValueError(
+                f"Expected {len(self.binary_columns)} binary and {len(self.numeric_columns)} "
+                f"numeric columns, got shapes {binary.shape} and {numeric.shape}."
+            )
+
+    def decision_function(self, batch: CompactBatch) -> np.ndarray:
+        self._check(batch)
+        n = batch.binary.shape[0]
+        logits = np.empty(n, dtype=np.float64)
+        for start in range(0, n, COMPACT_BLOCK_ROWS):
+            end = min(start + COMPACT_BLOCK_ROWS, n)
+            block = batch.binary[start:end].astype(np.float32) @ self.binary_weights
+            block += batch.numeric[start:end] @ self.numeric_weights
+            logits[start:end] = block
+        logits += self.bias
+        return logits
+
+    def predict_proba(self, batch: CompactBatch) -> np.ndarray:
+        return sigmoid(self.decision_function(batch))
+
+    def predict(
+        self,
+        batch: CompactBatch,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError("threshold must be between 0.0 and 1.0")
+
+        probs = self.predict_proba(batch)
+        return probs, (probs >= threshold).astype(int)
@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Histogramı tutulan sürekli feature'lar (model kolon isimleri).
+CONTINUOUS_FEATURES = ("Tenure Months", "Monthly Charges", "Total Charges", "CLTV")
+# Sürekli feature'lar referans verinin quantile'larına göre bu kadar kovaya bölünür.
+N_BINS = 10
+# Skor dağılımı sabit genişlikli kovalarla tutulur.
+SCORE_EDGES = tuple(np.round(np.linspace(0.1, 0.9, 9), 1).tolist())
+
+# PSI eşikleri: < 0.1 stabil, 0.1–0.2 izlenmeli, ≥ 0.2 drift.
+PSI_WARNING = 0.1
+PSI_DRIFT = 0.2
+# Boş kovalarda log(0) olmasın diye oranlara eklenen küçük pay.
+PSI_EPSILON = 1e-4
+
+# Bu kadar satırdan küçük batch'ler sabit boyutlu bir tampona kopyalanır;
+# özetler tampon dolunca tek seferde güncellenir (küçük request başına
+# numpy çağrı maliyeti ödenmez).
+SMALL_BATCH_ROWS = 256
+BUFFER_ROWS = 2048
+
+
+# ======================================================
+# YARDIMCILAR
+# ======================================================
+def onehot_groups(feature_names: Sequence[str]) -> Dict[str, List[str]]:
+    """
+    One-hot kolonlarını gruplar: "Contract_One year" → grup "Contract".
+    Model isimlerinde sayısal / binary kolonlarda "_" yoktur.
+    """
+    groups: Dict[str, List[str]] = {}
+    for name in feature_names:
+        if "_" in name:
+            groups.setdefault(name.split("_", 1)[0], []).append(name)
+    return groups
+
+
+def bin_counts(values: np.ndarray, edges: Sequence[float]) -> np.ndarray:
+    """
+    Kova i: edges[i-1] <= x < edges[i]; ilk ve son kova açık uçludur.
+    Kenar sayısı az olduğundan büyük dizilerde sınır başına count_nonzero,
+    searchsorted + bincount'tan birkaç kat hızlıdır.
+    """
+    if len(values) < BUFFER_ROWS:
+        return np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+    at_least = np.fromiter(
+        (np.count_nonzero(values >= edge) for edge in edges), dtype=np.int64, count=len(edges)
+    )
+    counts = np.empty(len(edges) + 1, dtype=np.int64)
+    counts[0] = len(values) - (at_least[0] if len(edges) else 0)
+    counts[1:-1] = at_least[:-1] - at_least[1:]
+    if len(edges):
+        counts[-1] = at_least[-1]
+    return counts
+
+
+def psi(reference: Sequence[float], live: Sequence[float]) -> float:
+    """
+    Population stability index: sum((live - ref) * ln(live / ref)).
+    Girdiler oran (toplamı 1) olmalıdır.
+    """
+    ref = np.asarray(reference, dtype=np.float64) + PSI_EPSILON
+    cur = np.asarray(live, dtype=np.float64) + PSI_EPSILON
+    ref /= ref.sum()
+    cur /= cur.sum()
+    return float(np.sum((cur - ref) * np.log(cur / ref)))
+
+
+def psi_status(value: float) -> str:
+    if value >= PSI_DRIFT:
+        return "drift"
+    if value >= PSI_WARNING:
+        return "warning"
+    return "ok"
+
+
+def _proportions(counts: np.ndarray) -> np.ndarray:
+    total = counts.sum()
+    return counts / total if total else np.zeros(len(counts))
+
+
+# ======================================================
+# REFERANS (EĞİTİM ANI)
+# ======================================================
+def reference_statistics(
+    X: np.ndarray,
+    feature_names: Sequence[str],
+    probs: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """
+    Eğitim verisinin drift referansı; metadata.json'a "reference_stats" olarak yazılır.
+
+    - features: feature başına mean / std (one-hot kolonlarda mean = frekans)
+    - bins: sürekli feature'lar için quantile kova sınırları + oranlar
+    - score: eğitim verisindeki olasılık dağılımı (probs verilirse)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+
+    bins = {}
+    for name in CONTINUOUS_FEATURES:
+        if name not in feature_names:
+            continue
+        column = X[:, list(feature_names).index(name)]
+        edges = np.unique(np.quantile(column, np.linspace(0, 1, N_BINS + 1)[1:-1]))
+        bins[name] = {
+            "edges": edges.tolist(),
+            "proportions": _proportions(bin_counts(column, edges)).tolist(),
+        }
+
+    reference: Dict[str, Any] = {
+        "records": int(X.shape[0]),
+        "features": {
+            name: {"mean": float(m), "std": float(s)}
+            for name, m, s in zip(feature_names, mean, std)
+        },
+        "bins": bins,
+    }
+    if probs is not None:
+        reference["score"] = {
+            "edges": list(SCORE_EDGES),
+            "proportions": _proportions(bin_counts(np.asarray(probs), SCORE_EDGES)).tolist(),
+        }
+    return reference
+
+
+# ======================================================
+# CANLI TRAFİK (SCORING PATH)
+# ======================================================
+class _Layout:
+    """
+    Gelen matrisin kolon sırası → referans sırası eşlemesi (kolon sırası başına bir kere).
+    """
+
+    def __init__(self, columns: Sequence[str], feature_names: Sequence[str], binned: Sequence[str]) -> None:
+        index = {c: i for i, c in enumerate(columns)}
+        missing = [f for f in feature_names if f not in index]
+        if missing:
+            raise ValueError(f"Drift monitor columns missing: {missing}")
+        self.order = np.fromiter((index[f] for f in feature_names), dtype=np.intp)
+        self.binned = [index[f] for f in binned]
+
+
+class DriftMonitor:
+    """
+    Canlı input'ların O(1) bellekli özetleri: feature başına sayaç, ortalama ve
+    M2 (varyans için, batch'ler Chan formülüyle birleştirilir), sürekli
+    feature'lar ve skor için referansla aynı kovalarda histogram. Batch başına
+    birkaç vektörel geçiş; ham kayıt saklanmaz.
+    """
+
+    def __init__(self, version: str, feature_names: Sequence[str], reference: Dict[str, Any]) -> None:
+        self.version = version
+        self.feature_names: Tuple[str, ...] = tuple(feature_names)
+        self.reference = reference
+        self.groups = onehot_groups(self.feature_names)
+
+        self.binned: Tuple[str, ...] = tuple(reference.get("bins", {}))
+        self._edges = [np.asarray(reference["bins"][name]["edges"]) for name in self.binned]
+        self._layouts: Dict[Tuple[str, ...], _Layout] = {}
+        self._lock = threading.Lock()
+
+        n_features = len(self.feature_names)
+        self.records = 0
+        self._mean = np.zeros(n_features)
+        self._m2 = np.zeros(n_features)
+        self._bin_counts = [np.zeros(len(e) + 1, dtype=np.int64) for e in self._edges]
+        self._score_counts = np.zeros(len(SCORE_EDGES) + 1, dtype=np.int64)
+
+        # Küçük batch tamponu (referans kolon sırasında).
+        self._canonical = _Layout(self.feature_names, self.feature_names, self.binned)
+        self._buffer = np.empty((BUFFER_ROWS, n_features))
+        self._buffer_probs = np.empty(BUFFER_ROWS)
+        self._buffered = 0
+
+    @classmethod
+    def from_metadata(cls, version: str, metadata: Dict[str, Any]) -> Optional["DriftMonitor"]:
+        # Eski sürümlerde referans yoksa izleme kapalı kalır.
+        reference = metadata.get("reference_stats")
+        if reference is None:
+            return None
+        return cls(version, metadata["features"], reference)
+
+    def _layout(self, columns: Sequence[str]) -> _Layout:
+        key = tuple(columns)
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = _Layout(key, self.feature_names, self.binned)
+            with self._lock:
+                self._layouts[key] = layout
+        return layout
+
+    def observe(self, X: np.ndarray, columns: Sequence[str], probs: np.ndarray) -> None:
+        """
+        (n, n_features) batch'i ve olasılıklarını özetlere ekler. Büyük
+        batch'lerin istatistikleri kilit dışında hesaplanır; kilit altında
+        sadece küçük vektörler birleştirilir.
+        """
+        n = X.shape[0]
+        if n == 0:
+            return
+        layout = self._layout(columns)
+
+        if n >= SMALL_BATCH_ROWS:
+            stats = self._batch_stats(X, layout, probs)
+            with self._lock:
+                self._merge(*stats)
+            return
+
+        rows = X[:, layout.order]
+        with self._lock:
+            if self._buffered + n > BUFFER_ROWS:
+                self._flush_locked()
+            end = self._buffered + n
+            self._buffer[self._buffered:end] = rows
+            self._buffer_probs[self._buffered:end] = probs
+            self._buffered = end
+
+    def _batch_stats(self, X: np.ndarray, layout: _Layout, probs: np.ndarray) -> tuple:
+        n = X.shape[0]
+        # Kolon toplamı BLAS gemv ile (X.sum(axis=0)'dan hızlı). Kareler ortalamadan
+        # sapmalar üzerinden toplanır; Σx² − n·mean² büyük ortalamalı kolonlarda
+        # iptal hatasıyla hassasiyet kaybeder.
+        batch_mean = (np.ones(n) @ X) / n
+        deviations = X - batch_mean
+        centered_sq = np.einsum("ij,ij->j", deviations, deviations)
+        binned = np.ascontiguousarray(X[:, layout.binned].T)
+        return (
+            n,
+            batch_mean[layout.order],
+            centered_sq[layout.order],
+            [bin_counts(values, edges) for values, edges in zip(binned, self._edges)],
+            bin_counts(probs, SCORE_EDGES),
+        )
+
+    def _merge(self, n: int, batch_mean, batch_m2, bins, scores) -> None:
+        # Chan et al. paralel varyans birleştirmesi.
+        total = self.records + n
+        delta = batch_mean - self._mean
+        self._mean += delta * (n / total)
+        self._m2 += batch_m2 + delta * delta * (self.records * n / total)
+        self.records = total
+        for counts, batch in zip(self._bin_counts, bins):
+            counts += batch
+        self._score_counts += scores
+
+    def _flush_locked(self) -> None:
+        if self._buffered:
+            end = self._buffered
+            self._merge(
+                *self._batch_stats(self._buffer[:end], self._canonical, self._buffer_probs[:end])
+            )
+            self._buffered = 0
+
+    def psi_values(self) -> Dict[str, float]:
+        """
+        Sürekli feature, one-hot grup ve skor ("score") başına PSI.
+        """
+        with self._lock:
+            self._flush_locked()
+            if self.records == 0:
+                return {}
+            mean = self._mean.copy()
+            bin_counts_ = [c.copy() for c in self._bin_counts]
+            score_counts = self._score_counts.copy()
+
+        values = {
+            name: psi(self.reference["bins"][name]["proportions"], _proportions(counts))
+            for name, counts in zip(self.binned, bin_counts_)
+        }
+        index = {name: i for i, name in enumerate(self.feature_names)}
+        ref_features = self.reference["features"]
+        for group, columns in self.groups.items():
+            values[group] = psi(
+                [ref_features[c]["mean"] for c in columns], [mean[index[c]] for c in columns]
+            )
+        if "score" in self.reference and score_counts.sum():
+            values["score"] = psi(self.reference["score"]["proportions"], _proportions(score_counts))
+        return values
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            self._flush_locked()
+            records = self.records
+            mean = self._mean.copy()
+            std = np.sqrt(self._m2 / records) if records else np.zeros_like(self._m2)
+            bin_counts_ = [c.copy() for c in self._bin_counts]
+            score_counts = self._score_counts.copy()
+
+        psi_values = self.psi_values()
+        ref_features = self.reference["features"]
+        index = {name: i for i, name in enumerate(self.feature_names)}
+
+        features = {}
+        for name, i in index.items():
+            ref = ref_features[name]
+            features[name] = {
+                "reference_mean": ref["mean"],
+                "live_mean": float(mean[i]),
+                "reference_std": ref["std"],
+                "live_std": float(std[i]),
+                # Referans std'si cinsinden ortalama kayması.
+                "mean_shift": float((mean[i] - ref["mean"]) / ref["std"]) if ref["std"] else 0.0,
+            }
+
+        continuous = {}
+        for name, counts in zip(self.binned, bin_counts_):
+            value = psi_values.get(name)
+            continuous[name] = {
+                "psi": value,
+                "status": psi_status(value) if value is not None else None,
+                "edges": self.reference["bins"][name]["edges"],
+                "reference": self.reference["bins"][name]["proportions"],
+                "live": _proportions(counts).tolist(),
+            }
+
+        groups = {}
+        for group, columns in self.groups.items():
+            value = psi_values.get(group)
+            prefix = len(group) + 1
+            groups[group] = {
+                "psi": value,
+                "status": psi_status(value) if value is not None else None,
+                "reference": {c[prefix:]: ref_features[c]["mean"] for c in columns},
+                "live": {c[prefix:]: float(mean[index[c]]) for c in columns},
+            }
+
+        result: Dict[str, Any] = {
+            "model_version": self.version,
+            "records": records,
+            "reference_records": self.reference.get("records"),
+            "drifted": sorted(k for k, v in psi_values.items() if v >= PSI_DRIFT),
+            "features": features,
+            "continuous": continuous,
+            "groups": groups,
+        }
+        if "score" in self.reference:
+            value = psi_values.get("score")
+            result["score"] = {
+                "psi": value,
+                "status": psi_status(value) if value is not None else None,
+                "edges": self.reference["score"]["edges"],
+                "reference": self.reference["score"]["proportions"],
+                "live": _proportions(score_counts).tolist(),
+            }
+        return result
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import gzip
+from typing import Any, Dict, Optional, Type, TypeVar
+
+import numpy as np
+import orjson
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from starlette.responses import Response
+
+# zstandard opsiyoneldir; yoksa yalnızca gzip sunulur.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Sıkıştırma seviyeleri hız öncelikli seçildi.
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+# ======================================================
+# REQUEST
+# ======================================================
+def parse_json_body(model: Type[ModelT], body: bytes) -> ModelT:
+    """
+    Ham body byte'larını tek adımda (json.loads + dict ara katmanı olmadan)
+    Pydantic modeline doğrular. Hatalar FastAPI'nin 422 formatıyla döner.
+    """
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+        for error in errors:
+            # FastAPI body hatalarında loc "body" ile başlar.
+            error["loc"] = ("body", *error["loc"])
+            if error["type"] == "json_invalid":
+                # Büyük body'ler hata mesajında geri gönderilmesin.
+                error["input"] = {}
+        raise RequestValidationError(errors)
+
+
+def inline_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    $defs referanslarını açarak tek parça JSON şeması üretir; body'yi kendisi
+    okuyan endpoint'lerin OpenAPI requestBody tanımı için.
+    """
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def resolve(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#/$defs/"):
+                return resolve(defs[ref.rsplit("/", 1)[-1]])
+            return {k: resolve(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [resolve(v) for v in node]
+        return node
+
+    return resolve(schema)
+
+
+# ======================================================
+# RESPONSE
+# ======================================================
+def dumps(payload: Dict[str, Any]) -> bytes:
+    """
+    Üst seviye değerleri NumPy array olabilen dict'i JSON byte'larına çevirir.
+    NumPy array'leri orjson ile Python listesi kurulmadan yazılır.
+    """
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def dumps_predictions(probs: np.ndarray, preds: np.ndarray) -> bytes:
+    """
+    {"probabilities": [...], "predictions": [...]} gövdesini üretir.
+    """
+    return dumps({"probabilities": probs, "predictions": preds})
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Accept-Encoding'e göre zstd (kuruluysa) veya gzip seçer; q=0 olanlar hariç.
+    """
+    accepted = set()
+    for token in accept_encoding.lower().split(","):
+        name, *params = (part.strip() for part in token.split(";"))
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(name)
+
+    if zstandard is not None and "zstd" in accepted:
+        return "zstd"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def json_response(
+    body: bytes,
+    accept_encoding: str = "",
+    compression_min_bytes: Optional[int] = None,
+) -> Response:
+    """
+    Hazır JSON gövdesini Response olarak döner. compression_min_bytes
+    verilirse bu boyutun üzerindeki gövdeler sıkıştırılır.
+    """
+    headers = {}
+
+    if compression_min_bytes is not None:
+        headers["vary"] = "accept-encoding"
+        encoding = choose_encoding(accept_encoding) if len(body) >= compression_min_bytes else None
+        if encoding is not None:
+            body = compress(body, encoding)
+            headers["content-encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
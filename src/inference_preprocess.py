@@ -1,4 +1,14 @@
-import pandas as pd
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+# pandas sadece DataFrame yolları (encode_frame, preprocess_input) için gerekir;
+# API'nin kullandığı encode() için yüklenmez.
+if TYPE_CHECKING:
+    import pandas as pd
 
 BINARY_MAP = {
     "Yes": 1,
@@ -29,20 +39,137 @@ ONEHOT_COLUMNS = [
     "Payment_Method"
 ]
 
-def preprocess_input(data: dict, model_columns: list) -> pd.DataFrame:
-    df = pd.DataFrame([data])
+def to_model_column(raw_column: str) -> str:
+    # Ham alan isimleri underscore'lu, model kolonları boşluklu.
+    return raw_column.replace("_", " ")
+
+
+class CategoricalEncoder:
+    """
+    Ham (kategorik) kayıtları tek geçişte model sırasındaki sayısal matrise çevirir.
+
+    BINARY_MAP / BINARY_COLUMNS / ONEHOT_COLUMNS ve modelin feature listesinden
+    kategori → kolon index tabloları bir kere kurulur; batch başına
+    get_dummies veya kolon kolon padding yapılmaz.
+    """
+
+    def __init__(self, model_columns: Sequence[str]) -> None:
+        self.model_columns = list(model_columns)
+        index = {c: i for i, c in enumerate(self.model_columns)}
+
+        missing = [c for c in BINARY_COLUMNS if to_model_column(c) not in index]
+        if missing:
+            raise ValueError(f"Binary columns not found in model features: {missing}")
+        self.binary_index: Dict[str, int] = {
+            col: index[to_model_column(col)] for col in BINARY_COLUMNS
+        }
+
+        # Örn. "Contract" → {"Month-to-month": i, "One year": j, "Two year": k}
+        self.onehot_tables: Dict[str, Dict[str, int]] = {}
+        covered = set(self.binary_index.values())
+        for col in ONEHOT_COLUMNS:
+            prefix = to_model_column(col) + "_"
+            table = {
+                name[len(prefix):]: i
+                for name, i in index.items()
+                if name.startswith(prefix)
+            }
+            if not table:
+                raise ValueError(f"One-hot column '{col}' not found in model features.")
+            self.onehot_tables[col] = table
+            covered.update(table.values())
+
+        # Geri kalan kolonlar sayısal (Tenure Months, Monthly Charges, ...).
+        self.numeric_index: Dict[str, int] = {
+            name.replace(" ", "_"): i
+            for name, i in index.items()
+            if i not in covered
+        }
+
+    @property
+    def raw_columns(self) -> List[str]:
+        return [*self.binary_index, *self.numeric_index, *self.onehot_tables]
 
-    # binary encode
-    for col in BINARY_COLUMNS:
-        df[col] = df[col].map(BINARY_MAP)
+    def encode(self, records: Sequence[Mapping[str, object]]) -> np.ndarray:
+        """
+        Ham kayıt listesini (n, n_features) float64 matrise çevirir.
+        Bilinmeyen kategori değeri ValueError fırlatır.
+        """
+        n = len(records)
+        X = np.zeros((n, len(self.model_columns)), dtype=np.float64)
 
-    # one-hot
-    df = pd.get_dummies(df, columns=ONEHOT_COLUMNS, drop_first=False)
+        for col, idx in self.numeric_index.items():
+            X[:, idx] = [r[col] for r in records]
 
-    # kolon hizalama (ALTIN KURAL)
-    for col in model_columns:
-        if col not in df.columns:
-            df[col] = 0
+        for col, idx in self.binary_index.items():
+            try:
+                X[:, idx] = [BINARY_MAP[r[col]] for r in records]
+            except KeyError as e:
+                raise ValueError(
+                    f"Unknown value {e.args[0]!r} for {col}. Expected one of {sorted(BINARY_MAP)}"
+                ) from e
+
+        rows = np.arange(n)
+        for col, table in self.onehot_tables.items():
+            try:
+                cols = [table[r[col]] for r in records]
+            except KeyError as e:
+                raise ValueError(
+                    f"Unknown value {e.args[0]!r} for {col}. Expected one of {sorted(table)}"
+                ) from e
+            X[rows, cols] = 1.0
+
+        return X
+
+    def encode_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        encode'un DataFrame için vektörize hali (eğitim verisi gibi büyük tablolar).
+        Kolon isimleri boşluklu (ham veri) veya underscore'lu olabilir.
+        Kategoriler aynı tablolarla (dict lookup) kolon index'lerine çevrilir.
+        """
+        df = df.rename(columns=to_model_column)
+        n = len(df)
+        X = np.zeros((n, len(self.model_columns)), dtype=np.float64)
+
+        for col, idx in self.numeric_index.items():
+            X[:, idx] = df[to_model_column(col)].to_numpy(dtype=np.float64)
+
+        for col, idx in self.binary_index.items():
+            values = df[to_model_column(col)]
+            mapped = values.map(BINARY_MAP)
+            unknown = mapped.isna()
+            if unknown.any():
+                raise ValueError(
+                    f"Unknown value {values[unknown].iloc[0]!r} for {col}. "
+                    f"Expected one of {sorted(BINARY_MAP)}"
+                )
+            X[:, idx] = mapped.to_numpy(dtype=np.float64)
+
+        rows = np.arange(n)
+        for col, table in self.onehot_tables.items():
+            values = df[to_model_column(col)]
+            # Bilinmeyen değer açıkça kontrol edilir (Categorical'ın -1 koduna güvenilmez).
+            mapped = values.map(table)
+            unknown = mapped.isna()
+            if unknown.any():
+                raise ValueError(
+                    f"Unknown value {values[unknown].iloc[0]!r} for {col}. "
+                    f"Expected one of {sorted(table)}"
+                )
+            X[rows, mapped.to_numpy(dtype=np.intp)] = 1.0
+
+        return X
+
+
+@lru_cache(maxsize=8)
+def get_encoder(model_columns: Tuple[str, ...]) -> CategoricalEncoder:
+    return CategoricalEncoder(model_columns)
+
+
+def preprocess_input(data: dict, model_columns: list) -> pd.DataFrame:
+    # Tek kayıt için sarmalayıcı. Eski get_dummies sürümü bilinmeyen kategoriyi
+    # sıfırla doldururdu; artık encoder gibi ValueError fırlatır.
+    import pandas as pd
 
-    df = df[model_columns]
-    return df
+    encoder = get_encoder(tuple(model_columns))
+    return pd.DataFrame(encoder.encode([data]), columns=list(model_columns))
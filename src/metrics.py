@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.requests import HTTPConnection
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# ======================================================
+# PROMETHEUS TEXT FORMAT
+# ======================================================
+# prometheus_client bağımlılığı yerine küçük, thread-safe bir uygulama:
+# gözlem başına bir lock + bisect; scrape anında text formatına çevrilir.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Saniye cinsinden; 0.5 ms'den 5 s'ye kadar.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Request başına kayıt sayısı: tekil skordan büyük toplu request'lere kadar.
+REQUEST_RECORD_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_histogram(
+    name: str,
+    label_names: Sequence[str],
+    label_values: Sequence[str],
+    buckets: Sequence[float],
+    bucket_counts: Sequence[int],
+    total: float,
+) -> List[str]:
+    """
+    Kümülatif olmayan kova sayaçlarını (son eleman +Inf) histogram satırlarına çevirir.
+    """
+    lines = []
+    cumulative = 0
+    for bound, count in zip(list(buckets) + [float("inf")], bucket_counts):
+        cumulative += count
+        labels = format_labels(
+            list(label_names) + ["le"], list(label_values) + [_format_value(float(bound))]
+        )
+        lines.append(f"{name}_bucket{labels} {cumulative}")
+    labels = format_labels(label_names, label_values)
+    lines.append(f"{name}_sum{labels} {_format_value(total)}")
+    lines.append(f"{name}_count{labels} {cumulative}")
+    return lines
+
+
+def render_gauge(
+    name: str,
+    documentation: str,
+    label_names: Sequence[str],
+    items: Iterable[Tuple[Sequence[str], float]],
+) -> List[str]:
+    """
+    Scrape anında hesaplanan gauge değerlerini (label değerleri, değer) çiftlerinden üretir.
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+    for values, value in items:
+        lines.append(f"{name}{format_labels(label_names, values)} {_format_value(value)}")
+    return lines
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{format_labels(self.label_names, k)} {_format_value(v)}" for k, v in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "total", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...], lock: threading.Lock) -> None:
+        self.buckets = buckets
+        # Son eleman +Inf kovası.
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self._lock = lock
+
+    def observe(self, value: float) -> None:
+        # le="b" kovası value <= b gözlemlerini sayar.
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.total += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(buckets)
+        self._children: Dict[LabelValues, _HistogramChild] = {}
+
+    def labels(self, *values: str) -> _HistogramChild:
+        """
+        Label değerlerine ait alt histogram; sıcak yolda tekrar tekrar
+        çağrılacaksa sonucu saklamak dict/kwargs maliyetini atlar.
+        """
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, _HistogramChild(self.buckets, self._lock))
+        return child
+
+    def observe(self, value: float, **labels: str) -> None:
+        self.labels(*self._key(labels)).observe(value)
+
+    def count(self, **labels: str) -> int:
+        child = self._children.get(self._key(labels))
+        with self._lock:
+            return sum(child.counts) if child is not None else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(c.counts), c.total) for k, c in self._children.items())
+        lines = self.header()
+        for key, counts, total in items:
+            lines.extend(render_histogram(self.name, self.label_names, key, self.buckets, counts, total))
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Metrikleri ve scrape anında değer üreten collector'ları toplar.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+# ======================================================
+# SERVİS METRİKLERİ
+# ======================================================
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.register(
+    Counter(
+        "churnguard_requests_total",
+        "HTTP requests by endpoint, model version and status code.",
+        ("endpoint", "model_version", "status"),
+    )
+)
+RECORDS = REGISTRY.register(
+    Counter(
+        "churnguard_records_total",
+        "Scored customer records by endpoint, model version and status code.",
+        ("endpoint", "model_version", "status"),
+    )
+)
+REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "churnguard_request_duration_seconds",
+        "End-to-end request latency.",
+        ("endpoint",),
+    )
+)
+STAGE_DURATION = REGISTRY.register(
+    Histogram(
+        "churnguard_stage_duration_seconds",
+        "Latency of individual request stages.",
+        ("endpoint", "stage"),
+    )
+)
+REQUEST_RECORDS = REGISTRY.register(
+    Histogram(
+        "churnguard_request_records",
+        "Customer records per prediction request.",
+        ("endpoint",),
+        buckets=REQUEST_RECORD_BUCKETS,
+    )
+)
+IN_FLIGHT = REGISTRY.register(
+    Gauge(
+        "churnguard_in_flight_requests",
+        "Requests currently being processed.",
+        ("endpoint",),
+    )
+)
+
+# Handler'ların request state'ine yazdığı, middleware'in okuduğu anahtarlar.
+STATE_REQUEST_START = "metrics_request_start"
+STATE_HANDLER_END = "metrics_handler_end"
+STATE_MODEL_VERSION = "metrics_model_version"
+STATE_N_RECORDS = "metrics_n_records"
+
+
+class StageTimer:
+    """
+    Bir request içindeki aşamaları sırayla ölçer:
+
+        timer = StageTimer.start(http_request, "/predict")
+        ...
+        timer.mark("to_matrix")
+
+    İlk mark, middleware'in request'i aldığı andan itibaren ölçer
+    (body okuma + JSON parse + Pydantic validasyonu).
+    """
+
+    def __init__(self, endpoint: str, state: Dict[str, object], started_at: float) -> None:
+        self.endpoint = endpoint
+        self.state = state
+        self._last = started_at
+
+    @classmethod
+    def start(cls, request: HTTPConnection, endpoint: str) -> "StageTimer":
+        state = request.scope.setdefault("state", {})
+        started_at = state.get(STATE_REQUEST_START)
+        return cls(endpoint, state, started_at if started_at is not None else time.perf_counter())
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        STAGE_DURATION.labels(self.endpoint, stage).observe(now - self._last)
+        self._last = now
+
+    def finish(self, model_version: str, n_records: int) -> None:
+        """
+        Handler sonu: request başına kayıt sayısı burada, response render süresi
+        ve kayıt sayacı middleware'de tamamlanır.
+        """
+        REQUEST_RECORDS.labels(self.endpoint).observe(n_records)
+        self.state[STATE_HANDLER_END] = time.perf_counter()
+        self.state[STATE_MODEL_VERSION] = model_version
+        self.state[STATE_N_RECORDS] = n_records
+
+
+class MetricsMiddleware:
+    """
+    Saf ASGI middleware: endpoint bazında süre, in-flight ve status sayaçları.
+
+    Endpoint etiketi route şablonudur (örn. /models/{version}/load); eşleşmeyen
+    path'ler "unmatched" olarak sayılır, böylece etiket kardinalitesi sınırlı kalır.
+    """
+
+    # (method, path) → route şablonu; path parametreli route'lar yüzünden sınırlı.
+    MAX_CACHED_PATHS = 1024
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._path_cache: Dict[Tuple[str, str], str] = {}
+
+    def _endpoint_path(self, scope: Scope) -> str:
+        # In-flight etiketi routing'den önce gerekir; route'lar bir kere eşleştirilip saklanır.
+        key = (scope["method"], scope["path"])
+        endpoint = self._path_cache.get(key)
+        if endpoint is not None:
+            return endpoint
+
+        endpoint = "unmatched"
+        for route in getattr(scope.get("app"), "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                endpoint = getattr(route, "path", "unmatched")
+                break
+        if len(self._path_cache) < self.MAX_CACHED_PATHS:
+            self._path_cache[key] = endpoint
+        return endpoint
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = self._endpoint_path(scope)
+        if endpoint == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        state = scope.setdefault("state", {})
+        state[STATE_REQUEST_START] = start
+        status = 500
+        response_started_at: Optional[float] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_started_at
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_started_at = time.perf_counter()
+            await send(message)
+
+        IN_FLIGHT.inc(endpoint=endpoint)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec(endpoint=endpoint)
+            REQUEST_DURATION.labels(endpoint).observe(time.perf_counter() - start)
+
+            handler_end = state.get(STATE_HANDLER_END)
+            if handler_end is not None and response_started_at is not None:
+                STAGE_DURATION.labels(endpoint, "render").observe(response_started_at - handler_end)
+
+            model_version = str(state.get(STATE_MODEL_VERSION, ""))
+            REQUESTS.inc(endpoint=endpoint, model_version=model_version, status=str(status))
+            n_records = state.get(STATE_N_RECORDS)
+            if n_records:
+                RECORDS.inc(
+                    n_records, endpoint=endpoint, model_version=model_version, status=str(status)
+                )
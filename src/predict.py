@@ -2,12 +2,19 @@ from __future__ import annotations
 
 import logging
 import pickle
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 
-import pandas as pd
-from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import StandardScaler
+from src.compiled import CompiledModel
+
+# pandas / sklearn sadece tip ipuçları ve eski (DataFrame) yol için gerekir;
+# import maliyeti (~2 sn) API açılışına ve src.serve parent'ına yansımasın diye
+# kullanıldıkları fonksiyonda yüklenir.
+if TYPE_CHECKING:
+    import pandas as pd
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
 
 # PATH & DEFAULTS
 
@@ -46,6 +53,23 @@ def load_model(
     return model, scaler, list(feature_names)
 
 
+@lru_cache(maxsize=8)
+def _load_model_cached(
+    model_path: Path,
+    mtime_ns: int,
+) -> Tuple[LogisticRegression, StandardScaler, List[str]]:
+    # mtime anahtarın parçası: dosya değişirse yeniden yüklenir.
+    return load_model(model_path)
+
+
+def load_compiled_model(model_path: Path = DEFAULT_MODEL_PATH) -> CompiledModel:
+    """
+    Artifact'ı yükleyip scaler'ı katlanmış, tek matmul'luk modele derler.
+    """
+    model, scaler, feature_names = load_model(model_path)
+    return CompiledModel.from_artifact(model, scaler, feature_names)
+
+
 
 # VALIDATIONS
 
@@ -89,6 +113,8 @@ def predict_churn(
     Asıl inference fonksiyonu.
     """
 
+    import pandas as pd
+
     validate_threshold(threshold)
 
     logger.info("Running inference.")
@@ -122,7 +148,11 @@ def predict_from_path(
     prediction almak için wrapper.
     """
 
-    model, scaler, feature_names = load_model(model_path)
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model artifact not found: {model_path}")
+
+    # Her çağrıda pickle'ı yeniden açmamak için önbellekli yükleme.
+    model, scaler, feature_names = _load_model_cached(model_path, model_path.stat().st_mtime_ns)
 
     return predict_churn(
         input_df=input_df,
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+
+from src.compiled import DEFAULT_THRESHOLD
+
+# Tahmin logları ayrı bir logger'a yazılır; log pipeline'ında ayrıca yönlendirilebilir.
+PREDICTION_LOGGER_NAME = "churnguard.predictions"
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionEvent(NamedTuple):
+    timestamp: float
+    endpoint: str
+    model_version: str
+    latency_ms: float
+    probabilities: np.ndarray
+
+
+class PredictionLogger:
+    """
+    Tahmin loglarını request yolundan çıkarır.
+
+    Request tarafı sadece (örneklenmişse) olayı sınırlı bir kuyruğa koyar;
+    özet istatistik + JSON formatlama + yazma arka plan thread'inde yapılır.
+    Kuyruk doluysa olay düşürülür, request beklemez.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 10_000,
+        request_sample_rate: float = 1.0,
+        record_sample_rate: float = 0.0,
+        output: Optional[logging.Logger] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        for name, rate in (
+            ("request_sample_rate", request_sample_rate),
+            ("record_sample_rate", record_sample_rate),
+        ):
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+
+        self.request_sample_rate = request_sample_rate
+        self.record_sample_rate = record_sample_rate
+        self.output = output or logging.getLogger(PREDICTION_LOGGER_NAME)
+        self._queue: "queue.Queue[Optional[PredictionEvent]]" = queue.Queue(maxsize=queue_size)
+        self._random = random.Random(seed)
+        self._rng = np.random.default_rng(seed)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self.written = 0
+
+    # ---------------- yaşam döngüsü ----------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="prediction-logger", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Kuyrukta kalan olayları yazıp thread'i durdurur. Kuyruk timeout içinde
+        boşalmazsa beklenmez; thread kalanları yazıp kendisi çıkar.
+        """
+        if self._thread is None:
+            return
+        self._stopping.set()
+        try:
+            # Kuyruk doluysa thread boşalttıkça sentinel'e yer açılır.
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning(
+                "Prediction logger did not drain in time. queued=%d", self._queue.qsize()
+            )
+        else:
+            self._thread.join(timeout)
+        self._thread = None
+
+    # ---------------- request tarafı ----------------
+
+    def submit(
+        self,
+        endpoint: str,
+        model_version: str,
+        latency_ms: float,
+        probabilities: np.ndarray,
+    ) -> bool:
+        """
+        Olayı kuyruğa koyar. Örneklenmediyse veya kuyruk doluysa False döner.
+        probabilities array'i sonradan değiştirilmemelidir.
+        """
+        if self.request_sample_rate < 1.0 and self._random.random() >= self.request_sample_rate:
+            with self._lock:
+                self.sampled_out += 1
+            return False
+
+        event = PredictionEvent(time.time(), endpoint, model_version, latency_ms, probabilities)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    # ---------------- arka plan ----------------
+
+    def format_event(self, event: PredictionEvent) -> str:
+        probs = np.asarray(event.probabilities, dtype=np.float64)
+        payload: Dict[str, Any] = {
+            "event": "prediction",
+            "timestamp": round(event.timestamp, 6),
+            "endpoint": event.endpoint,
+            "model_version": event.model_version,
+            "latency_ms": round(event.latency_ms, 3),
+            "n_records": int(probs.size),
+        }
+
+        if probs.size:
+            quantiles = np.quantile(probs, SUMMARY_QUANTILES)
+            payload["probability"] = {
+                "mean": float(probs.mean()),
+                "min": float(probs.min()),
+                "max": float(probs.max()),
+                **{f"p{int(q * 100)}": float(v) for q, v in zip(SUMMARY_QUANTILES, quantiles)},
+            }
+            payload["positive_rate"] = float((probs >= DEFAULT_THRESHOLD).mean())
+
+        if self.record_sample_rate > 0.0 and probs.size:
+            # Kayıt bazında örnek: (index, olasılık) çiftleri.
+            idx = np.flatnonzero(self._rng.random(probs.size) < self.record_sample_rate)
+            payload["sampled_records"] = [
+                {"index": int(i), "probability": float(probs[i])} for i in idx
+            ]
+
+        return json.dumps(payload)
+
+    def _run(self) -> None:
+        while True:
+            # Sentinel konamadıysa (kuyruk doluydu) kuyruk boşalınca stop bayrağıyla çıkılır.
+            if self._stopping.is_set() and self._queue.empty():
+                return
+            event = self._queue.get()
+            if event is None:
+                return
+            try:
+                self.output.info(self.format_event(event))
+                with self._lock:
+                    self.written += 1
+            except Exception:
+                # Loglama hatası servisi etkilememeli.
+                logger.exception("Failed to write prediction log event.")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "sampled_out": self.sampled_out,
+                "dropped": self.dropped,
+                "written": self.written,
+                "queued": self._queue.qsize(),
+            }
@@ -1,10 +1,37 @@
-import pandas as pd
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
 import numpy as np
-from typing import Tuple
+import pandas as pd
+
+from app.config import settings
+from app.model_loader import load_metadata
+from src.inference_preprocess import CategoricalEncoder
+from src.predict import configure_logging
+
+logger = logging.getLogger(__name__)
 
+# ======================================================
+# PATH'LER
+# ======================================================
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_RAW_PATH = BASE_DIR / "data" / "raw" / "Telco_customer_churn.xlsx"
+DEFAULT_CACHE_DIR = BASE_DIR / "data" / "cache"
+DEFAULT_OUTPUT_DIR = BASE_DIR / "data" / "processed"
+MANIFEST_NAME = "manifest.json"
+
+# Temizleme / encode mantığı değişirse artırılır; encode aşaması yeniden çalışır.
+PIPELINE_VERSION = 1
 
 DROP_COLUMNS = [
     "CustomerID",
+    "Count",
     "Zip Code",
     "Country",
     "State",
@@ -13,100 +40,234 @@ DROP_COLUMNS = [
     "Latitude",
     "Longitude",
     "Churn Reason",
-    "Churn Label"
+    "Churn Label",
+    "Churn Score",
 ]
 TARGET_COLUMN = "Churn Value"
 
-def prepare_data(data_path: str) -> Tuple[pd.DataFrame, pd.Series]:
-    df = pd.read_excel(data_path)
 
-    # target
-    y = df[TARGET_COLUMN]
+class PipelineResult(NamedTuple):
+    X_path: Path
+    y_path: Path
+    ran_stages: List[str]
+
+
+# ======================================================
+# YARDIMCILAR
+# ======================================================
+def file_sha256(path: Path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def features_sha256(features: List[str]) -> str:
+    return hashlib.sha256(json.dumps(features).encode()).hexdigest()
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# ======================================================
+# AŞAMA 1: HAM KAYNAK → PARQUET CACHE
+# ======================================================
+def read_raw_source(raw_path: Path) -> pd.DataFrame:
+    if raw_path.suffix.lower() in (".xlsx", ".xls"):
+        return pd.read_excel(raw_path)
+    return pd.read_csv(raw_path)
+
+
+def load_raw(
+    raw_path: Path,
+    cache_dir: Path,
+    source_hash: str,
+    force: bool = False,
+) -> Tuple[pd.DataFrame, bool]:
+    """
+    Ham kaynağı dosya hash'ine göre anahtarlanmış Parquet cache'ten okur.
+    Cache yoksa kaynak (Excel) bir kere parse edilip cache'e yazılır.
+    (DataFrame, aşama çalıştı mı) döner.
+    """
+    cache_path = cache_dir / f"{raw_path.stem}-{source_hash[:16]}.parquet"
+    parquet = _parquet_available()
+
+    if parquet and cache_path.exists() and not force:
+        logger.info("Raw cache hit: %s", cache_path)
+        return pd.read_parquet(cache_path), False
+
+    logger.info("Reading raw source: %s", raw_path)
+    df = read_raw_source(raw_path)
+
+    if not parquet:
+        logger.warning("pyarrow is not installed; raw cache disabled.")
+        return df, True
+
+    # Excel'deki karışık tipli kolonlar (örn. Total Charges'taki " ") Parquet'e
+    # yazılamaz; string olarak saklanır, temizleme aşamasında sayıya çevrilir.
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].astype(str)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".parquet.tmp")
+    df.to_parquet(tmp_path, index=False)
+    tmp_path.replace(cache_path)
+    logger.info("Raw cache written: %s", cache_path)
+    return df, True
 
-    # drop unwanted columns + target
+
+# ======================================================
+# AŞAMA 2: TEMİZLEME + ENCODE
+# ======================================================
+def prepare_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Hedefi ayırır, kullanılmayan kolonları atar, Total Charges'ı temizler.
+    """
+    y = df[TARGET_COLUMN]
     X = df.drop(columns=DROP_COLUMNS + [TARGET_COLUMN])
 
-    # Total Charges cleanup
-    X["Total Charges"] = (
-        X["Total Charges"]
-        .replace(" ", 0)
-        .astype(float)
-    )
+    # Yeni müşterilerde Total Charges boş (" ") gelir → 0
+    X["Total Charges"] = pd.to_numeric(X["Total Charges"].replace(" ", "0"))
 
     return X, y
 
-X, y = prepare_data("data/raw/Telco_customer_churn.xlsx")
-print("****************DESCRIPTION OF DATA********************")
-print(X.shape)
-print(y.value_counts())
-print(X.dtypes)
-
-BINARY_MAP = {
-    "Yes": 1,
-    "No": 0,
-    "Male": 1,
-    "Female": 0
-}
-BINARY_COLUMNS = ["Gender", "Senior Citizen", "Partner", "Dependents", "Phone Service", "Paperless Billing"]
-
-def binary_encode(df):
-    
-    for col in BINARY_COLUMNS:
-     df[col] = df[col].map(BINARY_MAP)
-
-    return df
-X = binary_encode(X)
-print("****************AFTER BINARY ENCODE********************")
-print(X[BINARY_COLUMNS].isna().sum())
-print(X[BINARY_COLUMNS].head())
-
-cat_cols = X.select_dtypes(include="object").columns
-print("****************CATECORICAL COLUMNS********************")
-print(cat_cols)
-
-print("****************CONTROL********************")
-print("Shape:", X.shape)
-print("\nColumns:\n", X.columns.tolist())
-print("\nDtypes:\n", X.dtypes)
-print("\nSample rows:\n", X.head())
-
-ONEHOT_COLUMNS = [
-    "Multiple Lines",
-    "Internet Service",
-    "Online Security",
-    "Online Backup",
-    "Device Protection",
-    "Tech Support",
-    "Streaming TV",
-    "Streaming Movies",
-    "Contract",
-    "Payment Method"
-]
-def onehot_encode(df):
-   df = pd.get_dummies(df, columns=ONEHOT_COLUMNS, drop_first=False)
-   return df
 
-X = onehot_encode(X)
-X = X.astype(int)
-print("****************AFTER ONE HOT ENCODE********************")
-print(X.shape)
+def encode_features(X: pd.DataFrame, features: List[str]) -> pd.DataFrame:
+    """
+    Kategori tabloları metadata.json feature listesinden kurulur; çıktı
+    kolonları bu listeyle birebir aynıdır (sıra dahil).
+    """
+    encoder = CategoricalEncoder(features)
+    values = encoder.encode_frame(X)
+    # Mevcut model int'e çevrilmiş (kesilmiş) veriyle eğitildi; aynı kalır.
+    return pd.DataFrame(values.astype(np.int64), columns=features)
+
+
+# ======================================================
+# PIPELINE
+# ======================================================
+def _read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text())
+    except ValueError:
+        return None
+
+
+def _outputs_match(manifest: Dict[str, Any], output_dir: Path) -> bool:
+    for name, digest in manifest.get("outputs", {}).items():
+        path = output_dir / name
+        if not path.exists() or file_sha256(path) != digest:
+            return False
+    return bool(manifest.get("outputs"))
+
+
+def run_pipeline(
+    raw_path: Path = DEFAULT_RAW_PATH,
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    features: Optional[List[str]] = None,
+    force: bool = False,
+) -> PipelineResult:
+    """
+    Ham veri → X.csv / y.csv.
+
+    Girdileri (ham dosya hash'i, feature listesi, PIPELINE_VERSION) değişmemiş
+    ve çıktıları yerinde olan aşamalar atlanır. features verilmezse aktif
+    model sürümünün metadata.json'ından okunur.
+    """
+    if not raw_path.exists():
+        raise FileNotFoundError(f"Raw data not found: {raw_path}")
 
+    if features is None:
+        features = load_metadata(settings.MODEL_VERSION)["features"]
 
-X = X.drop(columns=["Count", "Churn Score"])
-print("****************CONTROL********************")
-print(X.head())
-print(X.shape)
-print(X.columns)
+    X_path = output_dir / "X.csv"
+    y_path = output_dir / "y.csv"
+    manifest_path = output_dir / MANIFEST_NAME
 
-import os
+    source_hash = file_sha256(raw_path)
+    inputs = {
+        "source_sha256": source_hash,
+        "features_sha256": features_sha256(features),
+        "pipeline_version": PIPELINE_VERSION,
+    }
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_DIR = os.path.join(BASE_DIR, "data", "processed")
+    manifest = _read_manifest(manifest_path)
+    if (
+        not force
+        and manifest is not None
+        and manifest.get("inputs") == inputs
+        and _outputs_match(manifest, output_dir)
+    ):
+        logger.info("Processed data is up to date: %s", output_dir)
+        return PipelineResult(X_path, y_path, [])
 
-os.makedirs(DATA_DIR, exist_ok=True)
-X.to_csv(os.path.join(DATA_DIR, "X.csv"), index=False)
-y.to_csv(os.path.join(DATA_DIR, "y.csv"), index=False)
+    ran_stages = []
+    df, converted = load_raw(raw_path, cache_dir, source_hash, force=force)
+    if converted:
+        ran_stages.append("convert")
+
+    X, y = prepare_data(df)
+    X = encode_features(X, features)
+    logger.info("Encoded features. rows=%d columns=%d", X.shape[0], X.shape[1])
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    X.to_csv(X_path, index=False)
+    y.to_csv(y_path, index=False)
+
+    manifest_path.write_text(
+        json.dumps(
+            {
+                "inputs": inputs,
+                "outputs": {p.name: file_sha256(p) for p in (X_path, y_path)},
+            },
+            indent=2,
+        )
+    )
+    ran_stages.append("encode")
+    logger.info("Processed data written to %s", output_dir)
+
+    return PipelineResult(X_path, y_path, ran_stages)
+
+
+# ======================================================
+# CLI ENTRYPOINT
+# ======================================================
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.preprocessing",
+        description="Build data/processed/X.csv and y.csv from the raw Telco data.",
+    )
+    parser.add_argument("--raw-path", type=Path, default=DEFAULT_RAW_PATH)
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    parser.add_argument(
+        "--model-version",
+        default=None,
+        help="Take the feature list from models/<version>/metadata.json (default: MODEL_VERSION).",
+    )
+    parser.add_argument("--force", action="store_true", help="Re-run every stage.")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    features = load_metadata(args.model_version)["features"] if args.model_version else None
+    run_pipeline(
+        raw_path=args.raw_path,
+        output_dir=args.output_dir,
+        cache_dir=args.cache_dir,
+        features=features,
+        force=args.force,
+    )
 
-import joblib
 
-joblib.dump(X.columns.tolist(), "model_columns.pkl")
+if __name__ == "__main__":
+    main()
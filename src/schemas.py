@@ -64,3 +64,102 @@ class PredictionRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     records: List[CustomerRecord] = Field(min_length=1)
+
+
+class ColumnarPredictionRequest(BaseModel):
+    # Kolon isimleri bir kere, veri satır satır (kolon sırasıyla) gelir.
+    model_config = ConfigDict(extra="forbid")
+
+    columns: List[str] = Field(min_length=1)
+    data: List[List[float]] = Field(min_length=1)
+
+
+class RawCustomerRecord(BaseModel):
+    # Ham (encode edilmemiş) kayıt: kategoriler metin olarak gelir.
+    model_config = ConfigDict(extra="forbid")
+
+    Gender: str
+    Senior_Citizen: str
+    Partner: str
+    Dependents: str
+    Tenure_Months: int
+    Phone_Service: str
+    Paperless_Billing: str
+    Monthly_Charges: float
+    Total_Charges: float
+    CLTV: float
+
+    Multiple_Lines: str
+    Internet_Service: str
+    Online_Security: str
+    Online_Backup: str
+    Device_Protection: str
+    Tech_Support: str
+    Streaming_TV: str
+    Streaming_Movies: str
+    Contract: str
+    Payment_Method: str
+
+
+class RawPredictionRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    records: List[RawCustomerRecord] = Field(min_length=1)
+
+
+# API input'u (underscore) → model input'u (boşluk + özel karakterler).
+API_TO_MODEL_COLUMNS = {
+    "Senior_Citizen": "Senior Citizen",
+    "Phone_Service": "Phone Service",
+    "Paperless_Billing": "Paperless Billing",
+    "Monthly_Charges": "Monthly Charges",
+    "Total_Charges": "Total Charges",
+    "Tenure_Months": "Tenure Months",
+
+    "Multiple_Lines_No": "Multiple Lines_No",
+    "Multiple_Lines_No_phone_service": "Multiple Lines_No phone service",
+    "Multiple_Lines_Yes": "Multiple Lines_Yes",
+
+    "Internet_Service_DSL": "Internet Service_DSL",
+    "Internet_Service_Fiber_optic": "Internet Service_Fiber optic",
+    "Internet_Service_No": "Internet Service_No",
+
+    "Online_Security_No": "Online Security_No",
+    "Online_Security_No_internet_service": "Online Security_No internet service",
+    "Online_Security_Yes": "Online Security_Yes",
+
+    "Online_Backup_No": "Online Backup_No",
+    "Online_Backup_No_internet_service": "Online Backup_No internet service",
+    "Online_Backup_Yes": "Online Backup_Yes",
+
+    "Device_Protection_No": "Device Protection_No",
+    "Device_Protection_No_internet_service": "Device Protection_No internet service",
+    "Device_Protection_Yes": "Device Protection_Yes",
+
+    "Tech_Support_No": "Tech Support_No",
+    "Tech_Support_No_internet_service": "Tech Support_No internet service",
+    "Tech_Support_Yes": "Tech Support_Yes",
+
+    "Streaming_TV_No": "Streaming TV_No",
+    "Streaming_TV_No_internet_service": "Streaming TV_No internet service",
+    "Streaming_TV_Yes": "Streaming TV_Yes",
+
+    "Streaming_Movies_No": "Streaming Movies_No",
+    "Streaming_Movies_No_internet_service": "Streaming Movies_No internet service",
+    "Streaming_Movies_Yes": "Streaming Movies_Yes",
+
+    "Contract_Month_to_month": "Contract_Month-to-month",
+    "Contract_One_year": "Contract_One year",
+    "Contract_Two_year": "Contract_Two year",
+    "Payment_Method_Bank_transfer_automatic": "Payment Method_Bank transfer (automatic)",
+    "Payment_Method_Credit_card_automatic": "Payment Method_Credit card (automatic)",
+    "Payment_Method_Electronic_check": "Payment Method_Electronic check",
+    "Payment_Method_Mailed_check": "Payment Method_Mailed check",
+}
+
+# Request şemasındaki alan sırası; derlenmiş model bu sıraya bağlanır.
+API_COLUMNS = list(CustomerRecord.model_fields)
+# Kolon eşlemesi import sırasında bir kere çözülür, request başına değil.
+API_FEATURE_NAMES = [API_TO_MODEL_COLUMNS.get(c, c) for c in API_COLUMNS]
+# Sürekli (0/1 olmayan) feature'lar; geri kalanlar binary / one-hot.
+NUMERIC_FEATURE_NAMES = ["Tenure Months", "Monthly Charges", "Total Charges", "CLTV"]
@@ -0,0 +1,486 @@
+from __future__ import annotations
+
+import argparse
+import io
+import itertools
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.compiled import DEFAULT_THRESHOLD, CompactBatch, CompactModel, CompiledModel
+from src.predict import (
+    DEFAULT_MODEL_PATH,
+    configure_logging,
+    load_compiled_model,
+    validate_threshold,
+)
+from src.schemas import API_FEATURE_NAMES, API_TO_MODEL_COLUMNS, NUMERIC_FEATURE_NAMES
+
+# ======================================================
+# DEFAULT'LAR
+# ======================================================
+DEFAULT_CHUNKSIZE = 100_000
+OUTPUT_COLUMNS = ["probability", "prediction"]
+
+# --compact: binary / one-hot kolonlar uint8, sayısal kolonlar float32 okunur.
+COMPACT_NUMERIC_COLUMNS = [c for c in API_FEATURE_NAMES if c in NUMERIC_FEATURE_NAMES]
+COMPACT_BINARY_COLUMNS = [c for c in API_FEATURE_NAMES if c not in NUMERIC_FEATURE_NAMES]
+_MODEL_TO_API_COLUMNS = {v: k for k, v in API_TO_MODEL_COLUMNS.items()}
+# CSV kolonları API veya model isimleriyle gelebilir; ikisi de eşlenir.
+COMPACT_CSV_DTYPES: Dict[str, type] = {
+    name: dtype
+    for columns, dtype in ((COMPACT_BINARY_COLUMNS, np.uint8), (COMPACT_NUMERIC_COLUMNS, np.float32))
+    for column in columns
+    for name in (column, _MODEL_TO_API_COLUMNS.get(column, column))
+}
+
+logger = logging.getLogger(__name__)
+
+# Her worker process'te initializer ile bir kere yüklenir.
+_worker_model: Optional[Union[CompiledModel, CompactModel]] = None
+
+
+# ======================================================
+# INPUT OKUMA
+# ======================================================
+class InputRange(NamedTuple):
+    index: int  # chunk sırası (resume bununla yapılır)
+    # CSV: byte aralığı [start, stop); Parquet / Feather: satır aralığı.
+    start: int
+    stop: int
+
+
+# Process başına açık tutulan Feather tabloları / Parquet dosyaları
+# ((path, mtime, boyut) → nesne); dosya değişirse yeniden açılır.
+_open_sources: Dict[Tuple[str, int, int], Any] = {}
+
+
+def _pyarrow_readers():
+    try:
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("pyarrow is required to read Parquet / Feather files.")
+    return feather, pq
+
+
+def _input_format(input_path: Path) -> str:
+    suffix = input_path.suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    if suffix in (".feather", ".arrow"):
+        return "feather"
+    raise ValueError(f"Unsupported input format: {input_path.suffix}")
+
+
+def _open_source(input_path: Path, fmt: str) -> Any:
+    stat = input_path.stat()
+    key = (str(input_path), stat.st_mtime_ns, stat.st_size)
+    source = _open_sources.get(key)
+    if source is None:
+        feather, pq = _pyarrow_readers()
+        # Feather memory-map edilir; sadece dilimlenen kısım kopyalanır.
+        source = (
+            pq.ParquetFile(input_path)
+            if fmt == "parquet"
+            else feather.read_table(input_path, memory_map=True)
+        )
+        _open_sources[key] = source
+    return source
+
+
+def iter_input_ranges(
+    input_path: Path,
+    chunksize: int,
+    start_chunk: int = 0,
+) -> Iterator[InputRange]:
+    """
+    Girdiyi chunk aralıklarına böler; satırlar parse edilmez, okuma ve
+    dönüşüm worker'larda read_input_range ile yapılır.
+
+    - CSV: sadece satır sonları sayılır (tırnak içinde satır sonu içeren
+      alanlar desteklenmez).
+    - Parquet: aralıklar row group sınırlarına hizalanır; küçük row group'lar
+      chunksize'a kadar birleştirilir.
+    - Feather: satır aralıkları (pyarrow gerekir).
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    fmt = _input_format(input_path)
+
+    if fmt == "csv":
+        ranges = _csv_ranges(input_path, chunksize)
+    elif fmt == "parquet":
+        ranges = _parquet_ranges(_open_source(input_path, fmt).metadata, chunksize)
+    else:
+        total = _open_source(input_path, fmt).num_rows
+        ranges = ((start, min(start + chunksize, total)) for start in range(0, total, chunksize))
+
+    for index, (start, stop) in enumerate(ranges):
+        if index >= start_chunk:
+            yield InputRange(index, start, stop)
+
+
+def _csv_ranges(input_path: Path, chunksize: int) -> Iterator[Tuple[int, int]]:
+    with open(input_path, "rb") as f:
+        f.readline()  # header
+        start = f.tell()
+        while sum(1 for _ in itertools.islice(f, chunksize)):
+            stop = f.tell()
+            yield start, stop
+            start = stop
+
+
+def _parquet_ranges(metadata: Any, chunksize: int) -> Iterator[Tuple[int, int]]:
+    # Ardışık row group'lar chunksize'ı aşmayacak şekilde birleştirilir.
+    start = stop = 0
+    for i in range(metadata.num_row_groups):
+        n = metadata.row_group(i).num_rows
+        if stop > start and stop - start + n > chunksize:
+            yield start, stop
+            start = stop
+        stop += n
+    if stop > start:
+        yield start, stop
+
+
+def read_input_range(
+    input_path: Path,
+    input_range: InputRange,
+    compact: bool = False,
+    string_columns: Sequence[str] = (),
+) -> pd.DataFrame:
+    """
+    Tek bir chunk aralığını okur. compact=True ise CSV kolonları doğrudan
+    uint8 / float32 parse edilir (int64 / float64 ara kopya yok).
+    string_columns (örn. müşteri ID'si) CSV'de sayıya çevrilmeden okunur.
+    """
+    fmt = _input_format(input_path)
+
+    if fmt == "csv":
+        dtype: Dict[str, Any] = dict(COMPACT_CSV_DTYPES) if compact else {}
+        dtype.update({column: str for column in string_columns})
+        with open(input_path, "rb") as f:
+            header = f.readline()
+            f.seek(input_range.start)
+            data = f.read(input_range.stop - input_range.start)
+        return pd.read_csv(io.BytesIO(header + data), dtype=dtype or None)
+
+    source = _open_source(input_path, fmt)
+    if fmt == "feather":
+        return source.slice(input_range.start, input_range.stop - input_range.start).to_pandas()
+
+    # Aralık row group sınırlarında başlayıp biter.
+    metadata = source.metadata
+    groups, offset = [], 0
+    for i in range(metadata.num_row_groups):
+        if input_range.start <= offset < input_range.stop:
+            groups.append(i)
+        offset += metadata.row_group(i).num_rows
+    return source.read_row_groups(groups).to_pandas()
+
+
+def iter_input_chunks(
+    input_path: Path,
+    chunksize: int,
+    compact: bool = False,
+    string_columns: Sequence[str] = (),
+) -> Iterator[pd.DataFrame]:
+    """
+    Girdiyi chunk'lar halinde, tek process'te sırayla okur. CSV her zaman;
+    Parquet / Feather pyarrow kuruluysa desteklenir.
+    """
+    for input_range in iter_input_ranges(input_path, chunksize):
+        yield read_input_range(input_path, input_range, compact, string_columns)
+
+
+def chunk_to_matrix(chunk: pd.DataFrame) -> np.ndarray:
+    """
+    Chunk'ı /predict ile aynı kolon sırasında (API sırası) float64 matrise çevirir.
+    Kolonlar API veya model isimleriyle gelebilir; fazla kolonlar yok sayılır.
+    """
+    chunk = chunk.rename(columns=API_TO_MODEL_COLUMNS)
+    missing = [c for c in API_FEATURE_NAMES if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Schema mismatch. Missing: {sorted(missing)}")
+    X = np.ascontiguousarray(chunk[API_FEATURE_NAMES].to_numpy(dtype=np.float64))
+    _check_finite(X, API_FEATURE_NAMES)
+    return X
+
+
+def _check_finite(X: np.ndarray, columns: Sequence[str]) -> None:
+    # /predict gibi: boş (NaN) veya sonsuz hücreli satırlar skorlanmaz.
+    finite = np.isfinite(X)
+    if not finite.all():
+        bad = [columns[i] for i in np.flatnonzero(~finite.all(axis=0))]
+        raise ValueError(f"Feature values must be finite. Missing or infinite values in: {bad}")
+
+
+def chunk_to_compact(chunk: pd.DataFrame) -> CompactBatch:
+    """
+    Chunk'ı (uint8 binary / one-hot, float32 sayısal) çiftine çevirir; float64
+    feature matrisi oluşmaz. uint8 okunmamış kaynaklarda (Parquet / Feather)
+    binary kolonların 0-255 arası tamsayı olduğu kontrol edilir.
+    """
+    chunk = chunk.rename(columns=API_TO_MODEL_COLUMNS)
+    missing = [c for c in API_FEATURE_NAMES if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Schema mismatch. Missing: {sorted(missing)}")
+
+    binary_frame = chunk[COMPACT_BINARY_COLUMNS]
+    if any(dtype != np.uint8 for dtype in binary_frame.dtypes):
+        values = binary_frame.to_numpy()
+        if not np.array_equal(values, np.clip(np.round(values), 0, 255)):
+            raise ValueError("Binary / one-hot columns must be integers in 0-255 for --compact.")
+    binary = np.ascontiguousarray(binary_frame.to_numpy(dtype=np.uint8))
+    numeric = np.ascontiguousarray(chunk[COMPACT_NUMERIC_COLUMNS].to_numpy(dtype=np.float32))
+    _check_finite(numeric, COMPACT_NUMERIC_COLUMNS)
+    return CompactBatch(binary, numeric)
+
+
+# ======================================================
+# WORKER
+# ======================================================
+def _init_worker(model_path: str, compact: bool = False) -> None:
+    global _worker_model
+    model = load_compiled_model(Path(model_path)).bind(API_FEATURE_NAMES)
+    _worker_model = model.compact(COMPACT_NUMERIC_COLUMNS) if compact else model
+
+
+def _score_range(
+    input_path: Path,
+    input_range: InputRange,
+    threshold: float,
+    compact: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Okuma + parse + dönüşüm worker'da; parent'a sadece sonuçlar döner.
+    chunk = read_input_range(input_path, input_range, compact=compact)
+    X = chunk_to_compact(chunk) if compact else chunk_to_matrix(chunk)
+    return _worker_model.predict(X, threshold=threshold)
+
+
+# ======================================================
+# RESUME
+# ======================================================
+def progress_path_for(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".progress")
+
+
+def read_progress(
+    output_path: Path,
+    input_path: Path,
+    chunksize: int,
+    compact: bool = False,
+) -> Dict[str, int]:
+    """
+    Yarım kalmış koşunun ilerleme dosyasını okur ve çıktıyı son tamamlanan
+    chunk'ın sonuna kırpar.
+    """
+    progress_path = progress_path_for(output_path)
+    if not progress_path.exists() or not output_path.exists():
+        return {"chunks_done": 0, "rows_done": 0, "output_bytes": 0}
+
+    progress = json.loads(progress_path.read_text())
+    # --compact olasılıkları float64 yolundan farklıdır; iki mod aynı çıktıda karışmaz.
+    if (
+        progress.get("input") != str(input_path)
+        or progress.get("chunksize") != chunksize
+        or progress.get("compact", False) != compact
+    ):
+        raise ValueError(
+            "Progress file belongs to a different input, chunksize or --compact setting; "
+            "remove it or rerun without --resume."
+        )
+
+    # Progress yazılmadan önce çıktıya eklenmiş yarım chunk varsa atılır.
+    with open(output_path, "r+b") as f:
+        f.truncate(progress["output_bytes"])
+
+    return progress
+
+
+def write_progress(
+    output_path: Path,
+    input_path: Path,
+    chunksize: int,
+    chunks_done: int,
+    rows_done: int,
+    output_bytes: int,
+    compact: bool = False,
+) -> None:
+    progress_path = progress_path_for(output_path)
+    tmp_path = progress_path.with_name(progress_path.name + ".tmp")
+    tmp_path.write_text(
+        json.dumps(
+            {
+                "input": str(input_path),
+                "chunksize": chunksize,
+                "compact": compact,
+                "chunks_done": chunks_done,
+                "rows_done": rows_done,
+                "output_bytes": output_bytes,
+            }
+        )
+    )
+    os.replace(tmp_path, progress_path)
+
+
+# ======================================================
+# SCORING PIPELINE
+# ======================================================
+def score_file(
+    input_path: Path,
+    output_path: Path,
+    model_path: Path = DEFAULT_MODEL_PATH,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    workers: Optional[int] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    resume: bool = False,
+    compact: bool = False,
+) -> int:
+    """
+    Dosyayı chunk'lar halinde process pool'da skorlar ve sonuçları sırayla,
+    artımlı olarak CSV'ye yazar. Yazılan toplam satır sayısını döner.
+
+    Parent sadece chunk aralıklarını çıkarır; her worker kendi aralığını
+    okuyup parse eder ve matrise çevirir (matrisler process'ler arasında taşınmaz).
+
+    compact=True: chunk'lar uint8 / float32 okunup skorlanır; bellek ~6 kat
+    azalır, olasılıklar float64 yoluna göre en fazla
+    COMPACT_MAX_PROBABILITY_DEVIATION kadar farklıdır.
+    """
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input not found: {input_path}")
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model artifact not found: {model_path}")
+    validate_threshold(threshold)
+
+    workers = workers or os.cpu_count() or 1
+    progress = (
+        read_progress(output_path, input_path, chunksize, compact)
+        if resume
+        else {"chunks_done": 0, "rows_done": 0, "output_bytes": 0}
+    )
+    skip_chunks = progress["chunks_done"]
+    rows_done = progress["rows_done"]
+    if skip_chunks:
+        logger.info("Resuming after chunk %d (%d rows already scored).", skip_chunks, rows_done)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    mode = "ab" if skip_chunks else "wb"
+
+    start_time = time.perf_counter()
+    new_rows = 0
+    # Bellek sınırlı kalsın diye aynı anda en fazla 2 * workers chunk işlemde.
+    max_in_flight = 2 * workers
+    pending: List[Tuple[int, Future]] = []
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(str(model_path), compact),
+    ) as pool, open(output_path, mode) as out:
+        if not skip_chunks:
+            out.write((",".join(OUTPUT_COLUMNS) + "\n").encode())
+
+        def flush_oldest() -> None:
+            nonlocal rows_done, new_rows
+            chunk_index, future = pending.pop(0)
+            probs, preds = future.result()
+            frame = pd.DataFrame({"probability": probs, "prediction": preds})
+            out.write(frame.to_csv(index=False, header=False).encode())
+            out.flush()
+
+            rows_done += len(frame)
+            new_rows += len(frame)
+            write_progress(
+                output_path,
+                input_path,
+                chunksize,
+                chunk_index + 1,
+                rows_done,
+                out.tell(),
+                compact=compact,
+            )
+
+            elapsed = time.perf_counter() - start_time
+            logger.info(
+                "Chunk %d done. rows=%d rows_per_sec=%.0f",
+                chunk_index,
+                rows_done,
+                new_rows / elapsed if elapsed else 0.0,
+            )
+
+        for input_range in iter_input_ranges(input_path, chunksize, start_chunk=skip_chunks):
+            future = pool.submit(_score_range, input_path, input_range, threshold, compact)
+            pending.append((input_range.index, future))
+            if len(pending) >= max_in_flight:
+                flush_oldest()
+
+        while pending:
+            flush_oldest()
+
+    elapsed = time.perf_counter() - start_time
+    logger.info(
+        "Scoring completed. rows=%d elapsed_s=%.2f rows_per_sec=%.0f output=%s",
+        rows_done,
+        elapsed,
+        new_rows / elapsed if elapsed else 0.0,
+        output_path,
+    )
+    return rows_done
+
+
+# ======================================================
+# CLI ENTRYPOINT
+# ======================================================
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.score",
+        description="Score a CSV/Parquet/Feather file offline with the churn model.",
+    )
+    parser.add_argument("input", type=Path, help="Input file (.csv, .parquet, .feather).")
+    parser.add_argument("output", type=Path, help="Output CSV with probability,prediction.")
+    parser.add_argument("--model-path", type=Path, default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the last completed chunk recorded in <output>.progress.",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Read binary/one-hot columns as uint8 and numerics as float32 (less memory).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    configure_logging()
+    args = parse_args(argv)
+    score_file(
+        input_path=args.input,
+        output_path=args.output,
+        model_path=args.model_path,
+        chunksize=args.chunksize,
+        workers=args.workers,
+        threshold=args.threshold,
+        resume=args.resume,
+        compact=args.compact,
+    )
+
+
+if __name__ == "__main__":
+    main()
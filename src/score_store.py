@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.model_registry import load_compiled_version
+from src.cache import row_digests
+from src.compiled import CompiledModel
+from src.predict import configure_logging
+from src.schemas import API_FEATURE_NAMES
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    customer_id   TEXT PRIMARY KEY,
+    probability   REAL NOT NULL,
+    feature_hash  BLOB NOT NULL,
+    model_version TEXT NOT NULL,
+    scored_at     REAL NOT NULL
+) WITHOUT ROWID;
+-- /top-risk: en riskli k müşteri index'ten sırayla okunur, tablo sıralanmaz.
+CREATE INDEX IF NOT EXISTS scores_by_probability ON scores (probability DESC);
+"""
+
+UPSERT = """
+INSERT INTO scores (customer_id, probability, feature_hash, model_version, scored_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (customer_id) DO UPDATE SET
+    probability = excluded.probability,
+    feature_hash = excluded.feature_hash,
+    model_version = excluded.model_version,
+    scored_at = excluded.scored_at
+"""
+
+# Yeniden skorlanması gereken satırlar SQLite içinde seçilir; değişmemiş müşteriler
+# Python'a hiç dönmez. :ids JSON dizisi, :hashes aynı sırada 16 byte'lık özetlerin
+# birleşimi (BLOB'da substr byte bazlı, O(1)).
+# Sonuç: (pozisyon, yeni mi, feature özeti değişmiş mi).
+PENDING_QUERY = """
+SELECT i.key, s.customer_id IS NULL, s.feature_hash != substr(:hashes, i.key * 16 + 1, 16)
+FROM json_each(:ids) AS i
+LEFT JOIN scores AS s ON s.customer_id = i.value
+WHERE s.customer_id IS NULL
+   OR s.feature_hash != substr(:hashes, i.key * 16 + 1, 16)
+   OR s.model_version != :model_version
+"""
+
+
+class IngestStats(NamedTuple):
+    rows: int
+    new: int
+    changed: int  # feature hash'i değişmiş
+    stale: int  # feature'lar aynı, skor başka model versiyonundan
+    unchanged: int
+
+    @property
+    def scored(self) -> int:
+        return self.new + self.changed + self.stale
+
+    def __add__(self, other: "IngestStats") -> "IngestStats":  # type: ignore[override]
+        return IngestStats(*(a + b for a, b in zip(self, other)))
+
+
+EMPTY_STATS = IngestStats(0, 0, 0, 0, 0)
+
+
+class ScoreStore:
+    """
+    Müşteri ID'si ile anahtarlanan kalıcı (SQLite) skor deposu: son olasılık,
+    feature özeti ve skoru üreten model versiyonu.
+
+    - ingest: sadece yeni, feature'ları değişmiş veya skoru eski model
+      versiyonundan kalan müşteriler skorlanır ve yazılır.
+    - top_k: olasılık index'i üzerinden en riskli k müşteri (tablo sıralanmaz).
+
+    WAL modunda açılır; ingestion başka bir process'te sürerken okumalar bloklanmaz.
+    Bağlantı thread'ler arasında paylaşılır; erişim kilitle sıralanır.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---------------- yazma ----------------
+
+    def ingest(
+        self,
+        customer_ids: Sequence[str],
+        X: np.ndarray,
+        model: CompiledModel,
+        model_version: str,
+    ) -> IngestStats:
+        """
+        X, model'in bağlı olduğu kolon sırasındadır. Aynı ID batch'te birden
+        fazla geçerse son satır kazanır.
+        """
+        if len(customer_ids) != len(X):
+            raise ValueError("customer_ids and X must have the same length.")
+
+        hashes = row_digests(X)
+        latest = {cid: i for i, cid in enumerate(customer_ids)}
+        positions = list(latest.values())
+
+        with self._lock:
+            pending = self._conn.execute(
+                PENDING_QUERY,
+                {
+                    "ids": json.dumps(list(latest)),
+                    "hashes": b"".join(hashes[i] for i in positions),
+                    "model_version": model_version,
+                },
+            ).fetchall()
+            todo = [positions[pos] for pos, _, _ in pending]
+            new = sum(1 for _, is_new, _ in pending if is_new)
+            changed = sum(1 for _, is_new, hash_changed in pending if not is_new and hash_changed)
+            stale = len(pending) - new - changed
+
+            if todo:
+                probs = model.predict_proba(X[todo])
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany(
+                        UPSERT,
+                        (
+                            (customer_ids[i], p, hashes[i], model_version, now)
+                            for i, p in zip(todo, probs.tolist())
+                        ),
+                    )
+
+        return IngestStats(len(X), new, changed, stale, len(latest) - len(todo))
+
+    # ---------------- okuma ----------------
+
+    def top_k(self, k: int, model_version: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Olasılığı en yüksek k müşteri, azalan sırada. model_version verilirse
+        sadece o versiyonla skorlanmış kayıtlar.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+
+        query = "SELECT customer_id, probability, model_version, scored_at FROM scores"
+        params: Tuple[Any, ...] = (k,)
+        if model_version is not None:
+            query += " WHERE model_version = ?"
+            params = (model_version, k)
+        query += " ORDER BY probability DESC LIMIT ?"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {"customer_id": cid, "probability": p, "model_version": version, "scored_at": at}
+            for cid, p, version, at in rows
+        ]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+
+# ======================================================
+# DOSYADAN INGESTION
+# ======================================================
+def ingest_file(
+    input_path: Path,
+    store_path: Path,
+    id_column: str,
+    model_version: Optional[str] = None,
+    chunksize: Optional[int] = None,
+) -> IngestStats:
+    """
+    CSV / Parquet / Feather dosyasını chunk'lar halinde okuyup depoya işler.
+    Feature kolonları /predict ile aynıdır (API veya model isimleri); ID
+    kolonu ayrıca verilir.
+    """
+    # Dosya okuma pandas gerektirir; API (/top-risk) sadece ScoreStore'u kullanır.
+    from src.score import DEFAULT_CHUNKSIZE, chunk_to_matrix, iter_input_chunks
+
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input not found: {input_path}")
+
+    model_version = model_version or settings.MODEL_VERSION
+    compiled, _ = load_compiled_version(model_version)
+    model = compiled.bind(API_FEATURE_NAMES)
+
+    store = ScoreStore(store_path)
+    start_time = time.perf_counter()
+    totals = EMPTY_STATS
+    try:
+        chunks = iter_input_chunks(
+            input_path, chunksize or DEFAULT_CHUNKSIZE, string_columns=(id_column,)
+        )
+        for chunk_index, chunk in enumerate(chunks):
+            if id_column not in chunk.columns:
+                raise ValueError(f"ID column not found: {id_column}")
+            ids = chunk[id_column].astype(str).tolist()
+            stats = store.ingest(ids, chunk_to_matrix(chunk), model, model_version)
+            totals += stats
+            logger.info(
+                "Chunk %d ingested. rows=%d scored=%d unchanged=%d",
+                chunk_index,
+                stats.rows,
+                stats.scored,
+                stats.unchanged,
+            )
+    finally:
+        store.close()
+
+    logger.info(
+        "Ingestion completed. rows=%d new=%d changed=%d stale=%d unchanged=%d "
+        "elapsed_s=%.2f model_version=%s store=%s",
+        *totals,
+        time.perf_counter() - start_time,
+        model_version,
+        store_path,
+    )
+    return totals
+
+
+# ======================================================
+# CLI ENTRYPOINT
+# ======================================================
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.score_store",
+        description="Maintain the incremental customer score store.",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=Path(settings.SCORE_STORE_PATH) if settings.SCORE_STORE_PATH else None,
+        help="SQLite file (default: CHURNGUARD_SCORE_STORE_PATH).",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest = subparsers.add_parser(
+        "ingest", help="Score new/changed/stale customers from a file into the store."
+    )
+    ingest.add_argument("input", type=Path, help="Input file (.csv, .parquet, .feather).")
+    ingest.add_argument("--id-column", default="CustomerID")
+    ingest.add_argument("--model-version", default=None)
+    ingest.add_argument("--chunksize", type=int, default=None)
+
+    top = subparsers.add_parser("top", help="Print the k customers most likely to churn.")
+    top.add_argument("k", type=int)
+    top.add_argument("--model-version", default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    configure_logging()
+    args = parse_args(argv)
+    if args.store is None:
+        raise SystemExit("--store or CHURNGUARD_SCORE_STORE_PATH is required.")
+
+    if args.command == "ingest":
+        ingest_file(
+            input_path=args.input,
+            store_path=args.store,
+            id_column=args.id_column,
+            model_version=args.model_version,
+            chunksize=args.chunksize,
+        )
+    else:
+        store = ScoreStore(args.store)
+        try:
+            for item in store.top_k(args.k, args.model_version):
+                print(json.dumps(item))
+        finally:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Dict, List, Optional, Set
+
+import uvicorn
+
+from app.config import settings
+from src.predict import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Hemen ölen worker'lar için yeniden başlatma beklemesi (crash loop'u yavaşlatır).
+RESPAWN_BACKOFF_SECONDS = 1.0
+POLL_INTERVAL_SECONDS = 0.2
+
+
+# ======================================================
+# PRELOAD
+# ======================================================
+def preload_app(workers: int = 1):
+    """
+    Uygulamayı ve aktif modeli fork'tan önce parent'ta yükler.
+
+    Worker'lar bu sayfaları copy-on-write ile paylaşır; startup hook'u modeli
+    registry'de bulduğu için tekrar yüklemez. gc.freeze() sonrası GC, paylaşılan
+    nesnelerin header'larına dokunmaz (sayfalar kopyalanmaz).
+
+    Birden fazla worker varsa /models/* değişiklikleri kapatılır; registry worker
+    başınadır ve değişiklik sadece isteği alan worker'a uygulanırdı.
+    """
+    from src import api
+    from src.api import app
+    from src.schemas import API_FEATURE_NAMES
+    from app.model_registry import registry
+
+    entry = registry.load(settings.MODEL_VERSION, activate=True)
+    entry.model.bind_cached(API_FEATURE_NAMES)
+    for version in settings.SHADOW_MODEL_VERSIONS:
+        try:
+            registry.load(version).model.bind_cached(API_FEATURE_NAMES)
+        except Exception:
+            # Shadow versiyon yüklenemezse servis yine açılır; o versiyon atlanır.
+            logger.exception("Failed to preload shadow model version. version=%s", version)
+
+    api.model_changes_locked = workers > 1
+
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    # Tek dinleyen socket; worker'lar aynı fd üzerinden accept eder.
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+# ======================================================
+# SUPERVISOR
+# ======================================================
+class PreforkServer:
+    """
+    Parent process: modeli bir kere yükler, socket'i açar ve N worker fork eder.
+
+    - Ölen / max_requests'e ulaşıp çıkan worker'ın yerine yenisi fork edilir.
+    - SIGTERM / SIGINT: worker'lara SIGTERM iletilir; uvicorn açık request'leri
+      bitirir. graceful_timeout sonunda kalanlar SIGKILL alır.
+    - SIGHUP: worker'lar sırayla yeniden başlatılır (rolling recycle).
+    """
+
+    def __init__(
+        self,
+        app,
+        sock: socket.socket,
+        workers: int,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        graceful_timeout: int = 30,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self._children: Dict[int, float] = {}
+        # Bizim SIGTERM gönderdiğimiz worker'lar; bu sinyalle çıkmaları normaldir.
+        self._terminating: Set[int] = set()
+        self._stopping = False
+        self._recycle = False
+
+    # ---------------- worker ----------------
+
+    def _run_worker(self) -> None:
+        config = uvicorn.Config(
+            self.app,
+            lifespan="on",
+            limit_max_requests=self.max_requests or None,
+            limit_max_requests_jitter=self.max_requests_jitter,
+            timeout_graceful_shutdown=self.graceful_timeout,
+        )
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def _spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            # Child: parent'ın sinyal handler'ları sıfırlanır; uvicorn kendi handler'larını kurar.
+            for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+                signal.signal(sig, signal.SIG_DFL)
+            code = 0
+            try:
+                self._run_worker()
+            except BaseException:
+                logger.exception("Worker crashed. pid=%d", os.getpid())
+                code = 1
+            finally:
+                # Parent'ın kodu child'da çalışmasın.
+                os._exit(code)
+
+        self._children[pid] = time.monotonic()
+        logger.info("Worker started. pid=%d", pid)
+        return pid
+
+    # ---------------- sinyaller ----------------
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _handle_recycle(self, signum, frame) -> None:
+        self._recycle = True
+
+    # ---------------- ana döngü ----------------
+
+    def _reap(self) -> List[int]:
+        """
+        Çıkmış worker'ları toplar ve pid'lerini döner.
+        """
+        exited = []
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            started_at = self._children.pop(pid, None)
+            exited.append(pid)
+            code = os.waitstatus_to_exitcode(status)
+            terminated = pid in self._terminating
+            self._terminating.discard(pid)
+            # uvicorn graceful shutdown'dan sonra aldığı sinyali yeniden yükseltir.
+            if code == 0 or (terminated and code == -signal.SIGTERM):
+                logger.info("Worker exited. pid=%d", pid)
+            else:
+                logger.warning("Worker died. pid=%d exit_code=%d", pid, code)
+                if started_at is not None and time.monotonic() - started_at < RESPAWN_BACKOFF_SECONDS:
+                    time.sleep(RESPAWN_BACKOFF_SECONDS)
+        return exited
+
+    def _terminate(self, pid: int) -> None:
+        self._terminating.add(pid)
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _rolling_recycle(self) -> None:
+        # Her seferinde bir worker: kapasite en fazla 1 worker kadar düşer.
+        for pid in list(self._children):
+            if self._stopping:
+                return
+            self._terminate(pid)
+            deadline = time.monotonic() + self.graceful_timeout
+            while pid in self._children and time.monotonic() < deadline and not self._stopping:
+                time.sleep(POLL_INTERVAL_SECONDS)
+                for _ in self._reap():
+                    self._spawn()
+
+    def _shutdown(self) -> None:
+        logger.info("Shutting down workers. count=%d", len(self._children))
+        for pid in list(self._children):
+            self._terminate(pid)
+
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self._children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(POLL_INTERVAL_SECONDS)
+
+        for pid in list(self._children):
+            logger.warning("Worker did not stop in time; killing. pid=%d", pid)
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self._children.pop(pid, None)
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_recycle)
+
+        for _ in range(self.workers):
+            self._spawn()
+
+        try:
+            while not self._stopping:
+                if self._recycle:
+                    self._recycle = False
+                    logger.info("Recycling workers.")
+                    self._rolling_recycle()
+
+                for _ in self._reap():
+                    if not self._stopping:
+                        self._spawn()
+                time.sleep(POLL_INTERVAL_SECONDS)
+        finally:
+            self._shutdown()
+            self.sock.close()
+
+
+# ======================================================
+# CLI ENTRYPOINT
+# ======================================================
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.serve",
+        description="Serve the API with preloaded, forked uvicorn workers.",
+    )
+    parser.add_argument("--host", default=settings.WEB_HOST)
+    parser.add_argument("--port", type=int, default=settings.WEB_PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    configure_logging()
+    args = parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    app = preload_app(workers)
+    logger.info(
+        "Application preloaded. version=%s elapsed_ms=%.1f",
+        settings.MODEL_VERSION,
+        (time.perf_counter() - start) * 1000,
+    )
+
+    sock = bind_socket(args.host, args.port)
+    logger.info("Listening on %s:%d with %d worker(s).", args.host, args.port, workers)
+
+    PreforkServer(
+        app,
+        sock,
+        workers=workers,
+        max_requests=settings.WORKER_MAX_REQUESTS,
+        max_requests_jitter=settings.WORKER_MAX_REQUESTS_JITTER,
+        graceful_timeout=settings.WORKER_GRACEFUL_TIMEOUT,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
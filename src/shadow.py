@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.compiled import DEFAULT_THRESHOLD, CompiledModel, sigmoid
+
+logger = logging.getLogger(__name__)
+
+# Versiyon bazlı olasılık dağılımı için kova üst sınırları (+Inf ayrıca tutulur).
+SCORE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+class StackedModel:
+    """
+    Aynı kolon sırasına bağlı birden fazla derlenmiş modelin ağırlıklarını
+    (n_features, n_versions) tek matriste tutar; tüm versiyonların logit'leri
+    tek matmul ile hesaplanır. İlk kolon birincil (aktif) versiyondur.
+    """
+
+    def __init__(self, versions: Sequence[str], models: Sequence[CompiledModel]) -> None:
+        if not models:
+            raise ValueError("At least one model is required.")
+        columns = models[0].feature_names
+        if any(m.feature_names != columns for m in models):
+            raise ValueError("Stacked models must be bound to the same column order.")
+
+        self.versions: Tuple[str, ...] = tuple(versions)
+        self.weights = np.ascontiguousarray(np.column_stack([m.weights for m in models]))
+        self.bias = np.array([m.bias for m in models], dtype=np.float64)
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        logits = X @ self.weights
+        logits += self.bias
+        return logits
+
+
+class _Batch(NamedTuple):
+    versions: Tuple[str, ...]
+    logits: np.ndarray
+
+
+class _VersionStats:
+    def __init__(self) -> None:
+        self.records = 0
+        self.score_sum = 0.0
+        # Son eleman +Inf kovası (olasılıkta boş kalır; Prometheus formatı için).
+        self.bucket_counts = [0] * (len(SCORE_BUCKETS) + 1)
+        # Sadece shadow versiyonlar için (birincil ile karşılaştırma).
+        self.disagreements = 0
+        self.abs_diff_sum = 0.0
+        self.max_abs_diff = 0.0
+
+
+class ShadowScorer:
+    """
+    Aktif versiyonun trafiğini shadow versiyonlarla aynı matmul'da skorlar.
+
+    Request tarafı: yığılmış ağırlıklarla tek matmul + birincil kolonun
+    sigmoid'i; logit matrisi sınırlı bir kuyruğa konur. Shadow sigmoid'leri,
+    dağılımlar ve uyuşmazlık oranları arka plan thread'inde hesaplanır.
+    Kuyruk doluysa batch düşürülür; response hiç beklemez.
+    """
+
+    def __init__(
+        self,
+        shadow_versions: Sequence[str],
+        queue_size: int = 1000,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> None:
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+        self.shadow_versions: Tuple[str, ...] = tuple(shadow_versions)
+        self.threshold = threshold
+        self._queue: "queue.Queue[Optional[_Batch]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        # Yığının kurulduğu model nesneleri; model yeniden yüklenince
+        # (yeni nesne) yığın yeniden kurulur.
+        self._stacked_models: Tuple[CompiledModel, ...] = ()
+        self._stacked: Optional[StackedModel] = None
+
+        self.stats_by_version: Dict[str, _VersionStats] = {}
+        self.batches = 0
+        self.dropped = 0
+
+    # ---------------- yaşam döngüsü ----------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Kuyruktaki batch'leri işleyip thread'i durdurur. Kuyruk timeout içinde
+        boşalmazsa beklenmez; thread kalanları işleyip kendisi çıkar.
+        """
+        if self._thread is None:
+            return
+        self._stopping.set()
+        try:
+            # Kuyruk doluysa thread boşalttıkça sentinel'e yer açılır.
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("Shadow scorer did not drain in time. queued=%d", self._queue.qsize())
+        else:
+            self._thread.join(timeout)
+        self._thread = None
+
+    # ---------------- request tarafı ----------------
+
+    def stacked_model(
+        self,
+        primary_version: str,
+        primary: CompiledModel,
+        shadows: Sequence[Tuple[str, CompiledModel]],
+    ) -> StackedModel:
+        models = (primary, *(m for _, m in shadows))
+        with self._lock:
+            stacked, stacked_models = self._stacked, self._stacked_models
+        if (
+            stacked is None
+            or len(stacked_models) != len(models)
+            or any(a is not b for a, b in zip(stacked_models, models))
+        ):
+            stacked = StackedModel([primary_version, *(v for v, _ in shadows)], models)
+            with self._lock:
+                self._stacked, self._stacked_models = stacked, models
+        return stacked
+
+    def predict_proba(
+        self,
+        X: np.ndarray,
+        primary_version: str,
+        primary: CompiledModel,
+        shadows: Sequence[Tuple[str, CompiledModel]],
+    ) -> np.ndarray:
+        """
+        Birincil versiyonun olasılıklarını döner; shadow'lar aynı matmul'da
+        hesaplanıp arka plana bırakılır. Modeller aynı kolon sırasına bağlı olmalıdır.
+        """
+        if not shadows:
+            return primary.predict_proba(X)
+
+        stacked = self.stacked_model(primary_version, primary, shadows)
+        logits = stacked.decision_function(X)
+        try:
+            self._queue.put_nowait(_Batch(stacked.versions, logits))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+        return sigmoid(logits[:, 0])
+
+    # ---------------- arka plan ----------------
+
+    def observe(self, versions: Sequence[str], logits: np.ndarray) -> None:
+        """
+        Bir batch'in (n, n_versions) logit matrisini istatistiklere işler.
+        """
+        probs = sigmoid(logits)
+        positive = probs >= self.threshold
+        primary_probs = probs[:, 0]
+        n = probs.shape[0]
+
+        with self._lock:
+            self.batches += 1
+            for j, version in enumerate(versions):
+                stats = self.stats_by_version.setdefault(version, _VersionStats())
+                column = probs[:, j]
+                counts = np.bincount(
+                    np.searchsorted(SCORE_BUCKETS, column), minlength=len(stats.bucket_counts)
+                )
+                stats.bucket_counts = [a + int(b) for a, b in zip(stats.bucket_counts, counts)]
+                stats.records += n
+                stats.score_sum += float(column.sum())
+
+                if j == 0 or n == 0:
+                    continue
+                diff = np.abs(column - primary_probs)
+                stats.disagreements += int(np.count_nonzero(positive[:, j] != positive[:, 0]))
+                stats.abs_diff_sum += float(diff.sum())
+                stats.max_abs_diff = max(stats.max_abs_diff, float(diff.max()))
+
+    def _run(self) -> None:
+        while True:
+            # Sentinel konamadıysa (kuyruk doluydu) kuyruk boşalınca stop bayrağıyla çıkılır.
+            if self._stopping.is_set() and self._queue.empty():
+                return
+            batch = self._queue.get()
+            if batch is None:
+                return
+            try:
+                self.observe(batch.versions, batch.logits)
+            except Exception:
+                # İstatistik hatası servisi etkilememeli.
+                logger.exception("Failed to process shadow batch.")
+
+    def histograms(self) -> List[Tuple[str, List[int], float]]:
+        """
+        (versiyon, kova sayaçları [+Inf dahil], olasılık toplamı) — /metrics için.
+        """
+        with self._lock:
+            return [
+                (version, list(s.bucket_counts), s.score_sum)
+                for version, s in self.stats_by_version.items()
+            ]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            versions = {}
+            for version, s in self.stats_by_version.items():
+                item: Dict[str, Any] = {
+                    "records": s.records,
+                    "mean_probability": s.score_sum / s.records if s.records else 0.0,
+                    "probability_histogram": {
+                        str(b): c for b, c in zip(SCORE_BUCKETS, s.bucket_counts)
+                    },
+                }
+                if version in self.shadow_versions:
+                    item["disagreement_rate"] = s.disagreements / s.records if s.records else 0.0
+                    item["mean_abs_diff"] = s.abs_diff_sum / s.records if s.records else 0.0
+                    item["max_abs_diff"] = s.max_abs_diff
+                versions[version] = item
+
+            return {
+                "shadow_versions": list(self.shadow_versions),
+                "threshold": self.threshold,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "queued": self._queue.qsize(),
+                "versions": versions,
+            }
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import logging
+from typing import AsyncIterator, Callable, List, Tuple
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from src.schemas import CustomerRecord
+
+logger = logging.getLogger(__name__)
+
+# Tek bir NDJSON satırı için üst sınır; sınırsız buffer büyümesini engeller.
+MAX_LINE_BYTES = 64 * 1024
+
+ScoreFn = Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+async def iter_body(receive: Receive) -> AsyncIterator[bytes]:
+    """
+    Request body'sini ASGI mesajları geldikçe parça parça üretir.
+    """
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise ClientDisconnected()
+        body = message.get("body", b"")
+        if body:
+            yield body
+        if not message.get("more_body", False):
+            return
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Byte parçalarını (satır numarası, satır) çiftlerine böler. Boş satırlar atlanır.
+    """
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+        if len(buffer) > MAX_LINE_BYTES:
+            raise ValueError(f"Line {line_no + 1} exceeds {MAX_LINE_BYTES} bytes.")
+
+    if buffer.strip():
+        yield line_no + 1, buffer
+
+
+async def iter_line_chunks(
+    lines: AsyncIterator[Tuple[int, bytes]],
+    chunk_size: int,
+) -> AsyncIterator[List[Tuple[int, bytes]]]:
+    chunk: List[Tuple[int, bytes]] = []
+    async for item in lines:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def score_line_chunk(chunk: List[Tuple[int, bytes]], score_fn: ScoreFn) -> bytes:
+    """
+    Bir chunk satırı doğrular, geçerli olanları tek çağrıda skorlar ve
+    NDJSON sonuç satırlarını (girdi sırasıyla) döner.
+    """
+    rows = []
+    valid_line_nos = []
+    errors = {}
+
+    for line_no, line in chunk:
+        try:
+            record = CustomerRecord.model_validate_json(line)
+        except ValidationError as e:
+            errors[line_no] = json.loads(e.json(include_url=False, include_input=False))
+            continue
+        rows.append(list(record.model_dump().values()))
+        valid_line_nos.append(line_no)
+
+    results = {}
+    if rows:
+        probs, preds = score_fn(np.array(rows, dtype=np.float64))
+        for line_no, prob, pred in zip(valid_line_nos, probs.tolist(), preds.tolist()):
+            results[line_no] = {"line": line_no, "probability": prob, "prediction": pred}
+
+    out = []
+    for line_no, _ in chunk:
+        if line_no in errors:
+            item = {"line": line_no, "error": errors[line_no]}
+        else:
+            item = results[line_no]
+        out.append(json.dumps(item))
+
+    return ("\n".join(out) + "\n").encode()
+
+
+class NDJSONScoringResponse(Response):
+    """
+    Request body'sini okurken sonuçları da akıtan NDJSON response.
+
+    Girdi chunk_size satırlık parçalar halinde doğrulanıp skorlanır; bellekte
+    her an en fazla bir chunk'ın girdisi ve çıktısı tutulur. StreamingResponse
+    kullanılmaz, çünkü disconnect dinleyicisi body mesajlarını tüketir.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def __init__(
+        self,
+        score_fn: ScoreFn,
+        chunk_size: int,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        # Response.__init__ çağrılmaz: body olmadığı için content-length
+        # yazılmamalı (chunked transfer).
+        self.status_code = 200
+        self.background = background
+        self.init_headers()
+        self.score_fn = score_fn
+        self.chunk_size = chunk_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": self.raw_headers,
+            }
+        )
+
+        try:
+            await self._stream(receive, send)
+        finally:
+            if self.background is not None:
+                await self.background()
+
+    async def _stream(self, receive: Receive, send: Send) -> None:
+        n_lines = 0
+        try:
+            lines = iter_lines(iter_body(receive))
+            async for chunk in iter_line_chunks(lines, self.chunk_size):
+                # Parse + skor CPU işi; event loop dışında yapılır.
+                body = await run_in_threadpool(score_line_chunk, chunk, self.score_fn)
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+                n_lines += len(chunk)
+        except ClientDisconnected:
+            logger.info("Client disconnected during streaming prediction. lines=%d", n_lines)
+            return
+        except ValueError as e:
+            # Header'lar gönderildi; hata son satır olarak bildirilir.
+            body = (json.dumps({"error": str(e)}) + "\n").encode()
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+        except Exception:
+            logger.exception("Unexpected error during streaming prediction.")
+            body = (json.dumps({"error": "Internal server error"}) + "\n").encode()
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+        logger.info("Streaming prediction completed. lines=%d", n_lines)
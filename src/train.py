@@ -1,14 +1,30 @@
 from __future__ import annotations
 
+import argparse
+import copy
+import itertools
+import json
 import logging
+import os
 import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import log_loss, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
 from sklearn.preprocessing import StandardScaler
 
+from src.artifact import write_compact_artifact
+from src.compiled import CompiledModel
+from src.drift import reference_statistics
+from src.predict import load_model
+
 # ======================================================
 # PATH TANIMLARI
 # ======================================================
@@ -19,6 +35,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 DEFAULT_X_PATH = BASE_DIR / "data/processed/X.csv"
 DEFAULT_Y_PATH = BASE_DIR / "data/processed/y.csv"
 DEFAULT_MODEL_PATH = BASE_DIR / "models/logistic_model.pkl"
+MODELS_DIR = BASE_DIR / "models"
 
 # ======================================================
 # MODEL HYPERPARAMETER DEFAULT'LARI
@@ -28,6 +45,22 @@ DEFAULT_MAX_ITER = 1000
 DEFAULT_SOLVER = "lbfgs"
 DEFAULT_RANDOM_STATE = 42
 
+# Incremental (out-of-core) eğitim
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_EPOCHS = 5
+DEFAULT_SGD_ALPHA = 1e-4
+# SGD dışı (örn. LogisticRegression) artifact'tan devam ederken sabit, küçük adım.
+WARM_START_ETA0 = 1e-4
+
+# Hiperparametre araması (k-fold CV)
+DEFAULT_CV_FOLDS = 5
+DEFAULT_SEARCH_GRID: Dict[str, List[Any]] = {
+    "C": [0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0],
+    "class_weight": ["balanced", None],
+    "solver": ["lbfgs", "liblinear", "newton-cholesky"],
+}
+MODEL_NAME = "churn_logistic_regression"
+
 logger = logging.getLogger(__name__)
 
 
@@ -99,6 +132,7 @@ def train_model(
     max_iter: int = DEFAULT_MAX_ITER,
     solver: str = DEFAULT_SOLVER,
     random_state: int = DEFAULT_RANDOM_STATE,
+    export_dir: Optional[Path] = None,
 ) -> Tuple[LogisticRegression, StandardScaler, List[str]]:
     """
     Uçtan uca eğitim fonksiyonu:
@@ -106,6 +140,7 @@ def train_model(
     - Scaler + model oluşturur
     - Fit eder
     - Artifact olarak kaydeder
+    - export_dir verilirse compact (mmap) artifact'ı da yazar
     """
 
     logger.info("Loading training data.")
@@ -128,6 +163,41 @@ def train_model(
 
     model.fit(X_scaled, y)
 
+    save_artifact(model, scaler, feature_names, model_path, export_dir)
+
+    if export_dir is not None:
+        probs = model.predict_proba(X_scaled)[:, 1]
+        metadata = version_metadata(
+            export_dir.name,
+            roc_auc=float(roc_auc_score(y, probs)),
+            feature_names=feature_names,
+            x_path=x_path,
+            y_path=y_path,
+            notes="Logistic regression; roc_auc is measured on the training data.",
+            hyperparameters={
+                "class_weight": class_weight,
+                "max_iter": max_iter,
+                "solver": solver,
+                "random_state": random_state,
+            },
+        )
+        metadata["reference_stats"] = reference_statistics(X.to_numpy(), feature_names, probs)
+        write_version_metadata(export_dir, metadata)
+
+    return model, scaler, feature_names
+
+
+def save_artifact(
+    model: Any,
+    scaler: StandardScaler,
+    feature_names: List[str],
+    model_path: Path,
+    export_dir: Optional[Path] = None,
+) -> None:
+    """
+    Artifact dict'ini pickle olarak yazar; export_dir verilirse compact
+    (mmap) artifact'ı da yazar.
+    """
     logger.info("Saving model artifact.")
 
     model_path.parent.mkdir(parents=True, exist_ok=True)
@@ -145,9 +215,546 @@ def train_model(
 
     logger.info("Model saved to %s", model_path)
 
+    if export_dir is not None:
+        binary_path = write_compact_artifact(model, scaler, feature_names, export_dir)
+        logger.info("Compact artifact exported to %s", binary_path)
+
+
+def version_metadata(
+    version: str,
+    roc_auc: float,
+    feature_names: List[str],
+    x_path: Path,
+    y_path: Path,
+    notes: str,
+    hyperparameters: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    models/<version>/metadata.json'ın zorunlu alanları + hiperparametreler.
+    roc_auc ölçülmüş değerdir (elle yazılmaz).
+    """
+    return {
+        "model_name": MODEL_NAME,
+        "version": version,
+        "roc_auc": round(roc_auc, 4),
+        "trained_on": f"{_relative(x_path)}, {_relative(y_path)}",
+        "features": feature_names,
+        "trained_at": date.today().isoformat(),
+        "notes": notes,
+        "hyperparameters": hyperparameters,
+    }
+
+
+def write_version_metadata(model_dir: Path, metadata: Dict[str, Any]) -> None:
+    model_dir.mkdir(parents=True, exist_ok=True)
+    (model_dir / "metadata.json").write_text(json.dumps(metadata, indent=2))
+    logger.info("Model version written to %s", model_dir)
+
+
+# ======================================================
+# INCREMENTAL (OUT-OF-CORE) TRAINING
+# ======================================================
+def iter_training_chunks(
+    x_path: Path,
+    y_path: Path,
+    chunksize: int,
+) -> Iterator[Tuple[pd.DataFrame, pd.Series]]:
+    """
+    X ve y'yi aynı satır aralıklarında, chunk chunk okur.
+    """
+    if not x_path.exists():
+        raise FileNotFoundError(f"X data not found: {x_path}")
+
+    if not y_path.exists():
+        raise FileNotFoundError(f"y data not found: {y_path}")
+
+    x_chunks = pd.read_csv(x_path, chunksize=chunksize)
+    y_chunks = pd.read_csv(y_path, chunksize=chunksize)
+    for X, y in zip(x_chunks, y_chunks):
+        if len(X) != len(y):
+            raise ValueError("X and y have different numbers of rows.")
+        yield X, y.iloc[:, 0]
+
+    # zip kısa olanda durur; artakalan satır varsa dosyalar uyumsuzdur.
+    if next(x_chunks, None) is not None or next(y_chunks, None) is not None:
+        raise ValueError("X and y have different numbers of rows.")
+
+
+def scan_training_data(
+    x_path: Path,
+    y_path: Path,
+    chunksize: int,
+    scaler: Optional[StandardScaler],
+) -> Tuple[List[str], Dict[int, int]]:
+    """
+    İlk geçiş: sınıf sayılarını toplar; scaler verilirse istatistiklerini
+    partial_fit ile biriktirir. (feature_names, {sınıf: satır sayısı}) döner.
+    """
+    feature_names: Optional[List[str]] = None
+    counts: Dict[int, int] = {}
+
+    for X, y in iter_training_chunks(x_path, y_path, chunksize):
+        if feature_names is None:
+            feature_names = list(X.columns)
+        elif list(X.columns) != feature_names:
+            raise ValueError("Feature columns differ between chunks.")
+
+        if scaler is not None:
+            scaler.partial_fit(X)
+        for label, count in y.value_counts().items():
+            counts[int(label)] = counts.get(int(label), 0) + int(count)
+
+    if feature_names is None:
+        raise ValueError(f"No training rows in: {x_path}")
+    return feature_names, counts
+
+
+def balanced_class_weights(counts: Dict[int, int]) -> Dict[int, float]:
+    """
+    class_weight="balanced" ile aynı formül: n / (n_classes * n_c).
+    SGDClassifier.partial_fit "balanced"ı desteklemediği için sample_weight olarak verilir.
+    """
+    total = sum(counts.values())
+    return {label: total / (len(counts) * count) for label, count in counts.items()}
+
+
+def build_sgd_model(
+    alpha: float = DEFAULT_SGD_ALPHA,
+    random_state: int = DEFAULT_RANDOM_STATE,
+) -> SGDClassifier:
+    """
+    partial_fit ile eğitilen, log_loss (lojistik) SGD modeli.
+    predict_proba desteklediği için serving değişmez. average=True (ASGD):
+    sınıfa göre sıralı dosyalarda son chunk'lara aşırı uyumu azaltır.
+    """
+    return SGDClassifier(loss="log_loss", alpha=alpha, average=True, random_state=random_state)
+
+
+def warm_start_model(base_model: Any, alpha: float, random_state: int) -> SGDClassifier:
+    """
+    Mevcut artifact modelinden partial_fit ile devam edilecek SGD modelini kurar.
+
+    - SGDClassifier: kopyalanır; ASGD ortalaması ve adım sayacı korunur.
+    - Diğer doğrusal modeller (LogisticRegression): ağırlıklar kopyalanır,
+      sabit küçük adımla ince ayar yapılır. "optimal" adım planı sıfırdan
+      başladığında ilk büyük adımlar başlangıç ağırlıklarını bozar.
+    """
+    if isinstance(base_model, SGDClassifier):
+        return copy.deepcopy(base_model)
+
+    if not hasattr(base_model, "coef_"):
+        raise ValueError(f"Cannot warm-start from model type: {type(base_model).__name__}")
+
+    model = SGDClassifier(
+        loss="log_loss",
+        alpha=alpha,
+        learning_rate="constant",
+        eta0=WARM_START_ETA0,
+        random_state=random_state,
+    )
+    model.coef_ = np.array(base_model.coef_, dtype=np.float64)
+    model.intercept_ = np.array(base_model.intercept_, dtype=np.float64)
+    return model
+
+
+def train_model_incremental(
+    x_path: Path = DEFAULT_X_PATH,
+    y_path: Path = DEFAULT_Y_PATH,
+    model_path: Path = DEFAULT_MODEL_PATH,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    epochs: int = DEFAULT_EPOCHS,
+    alpha: float = DEFAULT_SGD_ALPHA,
+    random_state: int = DEFAULT_RANDOM_STATE,
+    warm_start: Optional[Path] = None,
+    export_dir: Optional[Path] = None,
+) -> Tuple[SGDClassifier, StandardScaler, List[str]]:
+    """
+    Veriyi belleğe almadan, chunk'lar halinde eğitir:
+    - 1. geçiş: scaler partial_fit + sınıf sayıları
+    - Sonraki geçişler (epoch): SGD log_loss partial_fit, balanced sample weight
+    - warm_start: mevcut artifact'ın modelinden devam edilir. Ağırlıklar o
+      artifact'ın scaler uzayında olduğundan scaler olduğu gibi korunur.
+    Çıktı, train_model ile aynı artifact dict'idir.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if epochs < 1:
+        raise ValueError("epochs must be at least 1")
+
+    logger.info("Scanning training data. chunksize=%d", chunksize)
+    if warm_start is not None:
+        logger.info("Warm-starting from %s", warm_start)
+        base_model, scaler, base_features = load_model(warm_start)
+        feature_names, counts = scan_training_data(x_path, y_path, chunksize, None)
+        if base_features != feature_names:
+            raise ValueError("Warm-start artifact features do not match training data.")
+        model = warm_start_model(base_model, alpha=alpha, random_state=random_state)
+    else:
+        scaler = build_preprocessor()
+        feature_names, counts = scan_training_data(x_path, y_path, chunksize, scaler)
+        model = build_sgd_model(alpha=alpha, random_state=random_state)
+
+    if len(counts) != 2:
+        raise ValueError(f"Binary target expected, got classes: {sorted(counts)}")
+
+    classes = np.array(sorted(counts))
+    class_weights = balanced_class_weights(counts)
+    weight_by_class = np.array([class_weights[c] for c in classes])
+    rng = np.random.default_rng(random_state)
+
+    for epoch in range(1, epochs + 1):
+        n_rows = 0
+        total_loss = 0.0
+        for X, y in iter_training_chunks(x_path, y_path, chunksize):
+            X_scaled = scaler.transform(X[feature_names])
+            y_values = y.to_numpy()
+
+            # Dosya sırası (örn. sınıfa göre sıralı) SGD'yi yanıltmasın.
+            perm = rng.permutation(len(y_values))
+            X_scaled, y_values = X_scaled[perm], y_values[perm]
+            sample_weight = weight_by_class[np.searchsorted(classes, y_values)]
+
+            model.partial_fit(X_scaled, y_values, classes=classes, sample_weight=sample_weight)
+
+            probs = model.predict_proba(X_scaled)
+            total_loss += log_loss(y_values, probs, labels=classes) * len(y_values)
+            n_rows += len(y_values)
+
+        logger.info(
+            "Epoch %d/%d done. rows=%d train_log_loss=%.4f",
+            epoch,
+            epochs,
+            n_rows,
+            total_loss / n_rows,
+        )
+
+    save_artifact(model, scaler, feature_names, model_path, export_dir)
+
+    if export_dir is not None:
+        # Skorlar da chunk chunk hesaplanır; bellekte sadece olasılık + etiket kalır.
+        # reference_stats quantile için tüm matrisi ister; "reference" komutuyla yazılır.
+        probs, labels = [], []
+        for X, y in iter_training_chunks(x_path, y_path, chunksize):
+            probs.append(model.predict_proba(scaler.transform(X[feature_names]))[:, 1])
+            labels.append(y.to_numpy())
+        metadata = version_metadata(
+            export_dir.name,
+            roc_auc=float(roc_auc_score(np.concatenate(labels), np.concatenate(probs))),
+            feature_names=feature_names,
+            x_path=x_path,
+            y_path=y_path,
+            notes=(
+                f"SGD logistic regression trained incrementally ({epochs} epochs); "
+                "roc_auc is measured on the training data."
+            ),
+            hyperparameters={
+                "alpha": alpha,
+                "epochs": epochs,
+                "chunksize": chunksize,
+                "random_state": random_state,
+                "warm_start": str(warm_start) if warm_start is not None else None,
+            },
+        )
+        write_version_metadata(export_dir, metadata)
+
     return model, scaler, feature_names
 
 
+# ======================================================
+# HYPERPARAMETER SEARCH (CV)
+# ======================================================
+class Fold(NamedTuple):
+    X_train: np.ndarray
+    y_train: np.ndarray
+    X_val: np.ndarray
+    y_val: np.ndarray
+
+
+class CandidateResult(NamedTuple):
+    params: Dict[str, Any]
+    fold_roc_auc: List[float]
+    fit_seconds: List[float]
+
+    @property
+    def mean_roc_auc(self) -> float:
+        return float(np.mean(self.fold_roc_auc))
+
+
+# Her worker process'te initializer ile bir kere set edilir.
+_worker_folds: Optional[List[Fold]] = None
+_worker_random_state: int = DEFAULT_RANDOM_STATE
+
+
+def build_cv_folds(
+    X: np.ndarray,
+    y: np.ndarray,
+    n_folds: int = DEFAULT_CV_FOLDS,
+    random_state: int = DEFAULT_RANDOM_STATE,
+) -> List[Fold]:
+    """
+    Stratified k-fold bölmeleri kurar; scaler her fold'un train kısmına fit
+    edilir (val sızıntısı olmaz). Ölçeklenmiş matrisler bir kere hesaplanır,
+    tüm adaylar aynı fold'ları kullanır.
+    """
+    splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+    folds = []
+    for train_idx, val_idx in splitter.split(X, y):
+        scaler = build_preprocessor().fit(X[train_idx])
+        folds.append(
+            Fold(
+                np.ascontiguousarray(scaler.transform(X[train_idx])),
+                y[train_idx],
+                np.ascontiguousarray(scaler.transform(X[val_idx])),
+                y[val_idx],
+            )
+        )
+    return folds
+
+
+def search_candidates(
+    grid: Dict[str, List[Any]],
+    n_iter: int = 0,
+    random_state: int = DEFAULT_RANDOM_STATE,
+) -> List[Dict[str, Any]]:
+    """
+    Grid'in tüm kombinasyonlarını döner; n_iter > 0 ise aralarından
+    tekrarsız rastgele n_iter tanesini (random search).
+    """
+    names = list(grid)
+    candidates = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    if 0 < n_iter < len(candidates):
+        rng = np.random.default_rng(random_state)
+        picked = sorted(rng.choice(len(candidates), size=n_iter, replace=False))
+        candidates = [candidates[i] for i in picked]
+    return candidates
+
+
+def evaluate_candidate(
+    params: Dict[str, Any],
+    folds: List[Fold],
+    random_state: int = DEFAULT_RANDOM_STATE,
+) -> CandidateResult:
+    aucs, fit_seconds = [], []
+    for fold in folds:
+        # Solver seed'i (örn. liblinear) aramanın random_state'inden gelir; son fit ile aynı.
+        model = LogisticRegression(max_iter=DEFAULT_MAX_ITER, random_state=random_state, **params)
+        start = time.perf_counter()
+        model.fit(fold.X_train, fold.y_train)
+        fit_seconds.append(time.perf_counter() - start)
+        aucs.append(float(roc_auc_score(fold.y_val, model.decision_function(fold.X_val))))
+    return CandidateResult(params, aucs, fit_seconds)
+
+
+def _init_search_worker(folds: List[Fold], random_state: int) -> None:
+    global _worker_folds, _worker_random_state
+    _worker_folds = folds
+    _worker_random_state = random_state
+    # Paralellik process seviyesinde; BLAS thread'leri çekirdekleri aşırı doldurmasın.
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(1)
+
+
+def _evaluate_in_worker(params: Dict[str, Any]) -> CandidateResult:
+    return evaluate_candidate(params, _worker_folds, _worker_random_state)
+
+
+def run_search(
+    X: np.ndarray,
+    y: np.ndarray,
+    candidates: List[Dict[str, Any]],
+    n_folds: int = DEFAULT_CV_FOLDS,
+    workers: int = 1,
+    random_state: int = DEFAULT_RANDOM_STATE,
+) -> List[CandidateResult]:
+    """
+    Adayları k-fold CV ile process pool'da değerlendirir. Fold matrisleri
+    worker başına bir kere (initializer ile) aktarılır, aday başına değil.
+    Sonuçlar ortalama ROC-AUC'ye göre azalan sırada döner.
+    """
+    if not candidates:
+        raise ValueError("No hyperparameter candidates to evaluate.")
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    folds = build_cv_folds(X, y, n_folds=n_folds, random_state=random_state)
+
+    if workers == 1:
+        results = [evaluate_candidate(params, folds, random_state) for params in candidates]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_search_worker,
+            initargs=(folds, random_state),
+        ) as pool:
+            results = list(pool.map(_evaluate_in_worker, candidates))
+
+    # Eşitlikte grid'de önce gelen aday kazanır (sorted stabil).
+    return sorted(results, key=lambda r: -r.mean_roc_auc)
+
+
+def search_and_train(
+    version: str,
+    x_path: Path = DEFAULT_X_PATH,
+    y_path: Path = DEFAULT_Y_PATH,
+    models_dir: Path = MODELS_DIR,
+    grid: Optional[Dict[str, List[Any]]] = None,
+    n_iter: int = 0,
+    n_folds: int = DEFAULT_CV_FOLDS,
+    workers: Optional[int] = None,
+    random_state: int = DEFAULT_RANDOM_STATE,
+    overwrite: bool = False,
+) -> Dict[str, Any]:
+    """
+    CV ile en iyi LR hiperparametrelerini seçer, tüm veriyle yeniden eğitir ve
+    models/<version>/ altına model.pkl + compact artifact + metadata.json yazar.
+    metadata'daki roc_auc ölçülmüş CV ortalamasıdır. metadata dict'ini döner.
+    """
+    model_dir = models_dir / version
+    if model_dir.exists() and not overwrite:
+        raise FileExistsError(f"Model version already exists: {model_dir}")
+
+    workers = workers or os.cpu_count() or 1
+    candidates = search_candidates(grid or DEFAULT_SEARCH_GRID, n_iter, random_state)
+
+    logger.info("Loading training data.")
+    X_df, y_series = load_training_data(x_path, y_path)
+    feature_names = list(X_df.columns)
+    X = X_df.to_numpy(dtype=np.float64)
+    y = y_series.to_numpy()
+
+    logger.info(
+        "Searching hyperparameters. candidates=%d folds=%d workers=%d",
+        len(candidates),
+        n_folds,
+        workers,
+    )
+    search_start = time.perf_counter()
+    results = run_search(X, y, candidates, n_folds=n_folds, workers=workers, random_state=random_state)
+    search_seconds = time.perf_counter() - search_start
+
+    best = results[0]
+    logger.info(
+        "Best candidate. params=%s roc_auc=%.4f search_seconds=%.1f",
+        best.params,
+        best.mean_roc_auc,
+        search_seconds,
+    )
+
+    # Seçilen konfigürasyon tüm veriyle yeniden eğitilir.
+    scaler = build_preprocessor()
+    model = LogisticRegression(max_iter=DEFAULT_MAX_ITER, random_state=random_state, **best.params)
+    fit_start = time.perf_counter()
+    X_scaled = scaler.fit_transform(X_df)
+    model.fit(X_scaled, y)
+    final_fit_seconds = time.perf_counter() - fit_start
+
+    save_artifact(model, scaler, feature_names, model_dir / "model.pkl", export_dir=model_dir)
+
+    metadata = version_metadata(
+        version,
+        roc_auc=best.mean_roc_auc,
+        feature_names=feature_names,
+        x_path=x_path,
+        y_path=y_path,
+        notes=f"Logistic regression selected by {n_folds}-fold CV over {len(candidates)} candidates.",
+        hyperparameters={"max_iter": DEFAULT_MAX_ITER, "random_state": random_state, **best.params},
+    )
+    metadata.update({
+        "cv": {
+            "folds": n_folds,
+            "roc_auc_mean": round(best.mean_roc_auc, 6),
+            "roc_auc_std": round(float(np.std(best.fold_roc_auc)), 6),
+            "fold_roc_auc": [round(v, 6) for v in best.fold_roc_auc],
+        },
+        "timings": {
+            "search_seconds": round(search_seconds, 3),
+            "cv_fit_seconds_mean": round(float(np.mean(best.fit_seconds)), 4),
+            "final_fit_seconds": round(final_fit_seconds, 4),
+            "workers": workers,
+        },
+        "search": [
+            {"params": r.params, "roc_auc": round(r.mean_roc_auc, 6)}
+            for r in results
+        ],
+        "reference_stats": reference_statistics(
+            X, feature_names, model.predict_proba(X_scaled)[:, 1]
+        ),
+    })
+    write_version_metadata(model_dir, metadata)
+
+    return metadata
+
+
+def _relative(path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(BASE_DIR))
+    except ValueError:
+        return str(path)
+
+
+# ======================================================
+# COMPACT ARTIFACT EXPORT
+# ======================================================
+def export_version(version: str, models_dir: Path = MODELS_DIR) -> Path:
+    """
+    models/<version>/model.pkl'i, metadata.json'ın yanına pickle'sız
+    compact artifact olarak export eder.
+    """
+    model_dir = models_dir / version
+    model_path = model_dir / "model.pkl"
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model file not found: {model_path}")
+
+    with open(model_path, "rb") as f:
+        artifact = pickle.load(f)
+
+    binary_path = write_compact_artifact(
+        artifact["model"], artifact["scaler"], list(artifact["feature_names"]), model_dir
+    )
+    logger.info("Compact artifact exported to %s", binary_path)
+    return binary_path
+
+
+# ======================================================
+# DRIFT REFERANSI
+# ======================================================
+def write_reference_stats(
+    version: str,
+    x_path: Path = DEFAULT_X_PATH,
+    models_dir: Path = MODELS_DIR,
+) -> Dict[str, Any]:
+    """
+    Eğitim verisinin drift referans istatistiklerini (feature dağılımları +
+    model skor dağılımı) hesaplayıp models/<version>/metadata.json'a yazar.
+    Referansı olmadan eğitilmiş sürümler için.
+    """
+    model_dir = models_dir / version
+    metadata_path = model_dir / "metadata.json"
+    model_path = model_dir / "model.pkl"
+    if not metadata_path.exists():
+        raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model file not found: {model_path}")
+
+    metadata = json.loads(metadata_path.read_text())
+    with open(model_path, "rb") as f:
+        artifact = pickle.load(f)
+    model = CompiledModel.from_artifact(
+        artifact["model"], artifact["scaler"], list(artifact["feature_names"])
+    )
+
+    X_df = pd.read_csv(x_path)
+    feature_names = list(metadata["features"])
+    X = X_df[feature_names].to_numpy(dtype=np.float64)
+    probs = model.bind(feature_names).predict_proba(X)
+
+    metadata["reference_stats"] = reference_statistics(X, feature_names, probs)
+    metadata_path.write_text(json.dumps(metadata, indent=2))
+    logger.info("Reference statistics written to %s. rows=%d", metadata_path, len(X))
+    return metadata["reference_stats"]
+
+
 # ======================================================
 # LOGGING CONFIG
 # ======================================================
@@ -161,6 +768,115 @@ def configure_logging(level: int = logging.INFO) -> None:
 # ======================================================
 # CLI ENTRYPOINT
 # ======================================================
-if __name__ == "__main__":
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.train")
+    subparsers = parser.add_subparsers(dest="command")
+
+    fit = subparsers.add_parser("fit", help="Fit scaler + logistic regression (default).")
+    fit.add_argument(
+        "--export-version",
+        default=None,
+        help="Also write a compact artifact to models/<version>/.",
+    )
+
+    incremental = subparsers.add_parser(
+        "fit-incremental",
+        help="Stream the CSVs in chunks and train an SGD logistic model with partial_fit.",
+    )
+    incremental.add_argument("--x-path", type=Path, default=DEFAULT_X_PATH)
+    incremental.add_argument("--y-path", type=Path, default=DEFAULT_Y_PATH)
+    incremental.add_argument("--model-path", type=Path, default=DEFAULT_MODEL_PATH)
+    incremental.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    incremental.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS)
+    incremental.add_argument("--alpha", type=float, default=DEFAULT_SGD_ALPHA)
+    incremental.add_argument(
+        "--random-state",
+        type=int,
+        default=DEFAULT_RANDOM_STATE,
+        help="Seed for SGD and the per-chunk shuffles.",
+    )
+    incremental.add_argument(
+        "--warm-start",
+        type=Path,
+        default=None,
+        help="Continue from an existing artifact (model.pkl).",
+    )
+    incremental.add_argument(
+        "--export-version",
+        default=None,
+        help="Also write a compact artifact to models/<version>/.",
+    )
+
+    search = subparsers.add_parser(
+        "search",
+        help="Cross-validated hyperparameter search; writes the best model to models/<version>/.",
+    )
+    search.add_argument("version")
+    search.add_argument("--folds", type=int, default=DEFAULT_CV_FOLDS)
+    search.add_argument(
+        "--n-iter",
+        type=int,
+        default=0,
+        help="Randomly sample this many candidates from the grid (0 = full grid).",
+    )
+    search.add_argument("--workers", type=int, default=0, help="Process pool size (0 = cpu count).")
+    search.add_argument(
+        "--random-state",
+        type=int,
+        default=DEFAULT_RANDOM_STATE,
+        help="Seed for candidate sampling, CV folds and solvers.",
+    )
+    search.add_argument("--overwrite", action="store_true")
+
+    export = subparsers.add_parser("export", help="Export models/<version>/model.pkl as a compact artifact.")
+    export.add_argument("version")
+
+    reference = subparsers.add_parser(
+        "reference",
+        help="Write drift reference statistics of the training data to models/<version>/metadata.json.",
+    )
+    reference.add_argument("version")
+    reference.add_argument("--x-path", type=Path, default=DEFAULT_X_PATH)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args(["fit", *(argv or [])])
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     configure_logging()
-    train_model()
+    args = parse_args(argv)
+
+    if args.command == "export":
+        export_version(args.version)
+    elif args.command == "reference":
+        write_reference_stats(args.version, x_path=args.x_path)
+    elif args.command == "search":
+        search_and_train(
+            args.version,
+            n_iter=args.n_iter,
+            n_folds=args.folds,
+            workers=args.workers or None,
+            random_state=args.random_state,
+            overwrite=args.overwrite,
+        )
+    elif args.command == "fit-incremental":
+        train_model_incremental(
+            x_path=args.x_path,
+            y_path=args.y_path,
+            model_path=args.model_path,
+            chunksize=args.chunksize,
+            epochs=args.epochs,
+            alpha=args.alpha,
+            random_state=args.random_state,
+            warm_start=args.warm_start,
+            export_dir=MODELS_DIR / args.export_version if args.export_version else None,
+        )
+    else:
+        export_dir = MODELS_DIR / args.export_version if args.export_version else None
+        train_model(export_dir=export_dir)
+
+
+if __name__ == "__main__":
+    main()
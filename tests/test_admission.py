@@ -0,0 +1,150 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from src.admission import (
+    LARGE_LANE,
+    SMALL_LANE,
+    AdmissionController,
+    AdmissionRejected,
+    count_records,
+    estimate_records,
+    estimate_rows,
+)
+from src.api import API_COLUMNS, API_FEATURE_NAMES, app
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _records(n: int) -> list:
+    X = pd.read_csv(ROOT / "data/processed/X.csv").head(n)
+    return [dict(zip(API_COLUMNS, row)) for row in X[API_FEATURE_NAMES].to_numpy().tolist()]
+
+
+def test_estimates_count_records_without_parsing():
+    records = _records(7)
+    assert estimate_records(json.dumps({"records": records}).encode()) == 7
+    rows = [list(r.values()) for r in records]
+    assert estimate_rows(json.dumps({"columns": API_COLUMNS, "data": rows}).encode()) == 7
+
+
+def test_count_records_skips_braces_in_strings():
+    body = json.dumps({"records": [{"a": "{x}", "b": 'q"{'}, {"a": "\\{"}]}).encode()
+    assert estimate_records(body) == 5
+    assert count_records(body) == 2
+
+
+def test_controller_lanes_and_rejections():
+    controller = AdmissionController(
+        small_concurrency=1,
+        large_concurrency=1,
+        large_batch_min_records=10,
+        max_records_per_request=50,
+        max_queued_records=60,
+        queue_timeout_ms=20,
+        retry_after_seconds=2,
+    )
+
+    async def scenario():
+        async with controller.admit(5) as lane:
+            assert lane == SMALL_LANE
+            # Large lane ayrı: küçük request varken büyük batch kabul edilir.
+            async with controller.admit(50) as large:
+                assert large == LARGE_LANE
+                assert controller.queued_records == 55
+
+                with pytest.raises(AdmissionRejected) as too_large:
+                    async with controller.admit(51):
+                        pass
+                assert too_large.value.status_code == 413
+
+                with pytest.raises(AdmissionRejected) as queue_full:
+                    async with controller.admit(10):
+                        pass
+                assert (queue_full.value.status_code, queue_full.value.retry_after) == (503, 2)
+
+            # Small lane dolu; slot süre içinde boşalmaz → 429.
+            with pytest.raises(AdmissionRejected) as busy:
+                async with controller.admit(1):
+                    pass
+            assert (busy.value.status_code, busy.value.retry_after) == (429, 2)
+
+        # Slot bırakılınca bekleyene devredilir.
+        order = []
+
+        async def request(name, hold):
+            async with controller.admit(1):
+                order.append(name)
+                await asyncio.sleep(hold)
+
+        await asyncio.gather(request("a", 0.005), request("b", 0))
+        assert order == ["a", "b"]
+
+    asyncio.run(scenario())
+
+    snapshot = controller.snapshot()
+    assert snapshot["queued_records"] == 0
+    assert snapshot["rejected"] == {"too_large": 1, "queue_full": 1, "lane_busy": 1}
+    assert all(lane["active"] == 0 and lane["waiting"] == 0 for lane in snapshot["lanes"].values())
+
+
+def test_api_rejects_oversized_request_with_413(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMISSION_MAX_RECORDS_PER_REQUEST", 3)
+    records = _records(4)
+
+    with TestClient(app) as client:
+        ok = client.post("/predict", json={"records": records[:3]})
+        rejected = client.post("/predict", json={"records": records})
+        stats = client.get("/stats/admission").json()
+        metrics = client.get("/metrics").text
+
+    assert ok.status_code == 200
+    assert rejected.status_code == 413
+    assert stats["enabled"] is True
+    assert stats["rejected"]["too_large"] == 1
+    assert stats["lanes"]["small"]["admitted"] == 1
+    assert 'churnguard_admission_rejected{reason="too_large"} 1' in metrics
+
+
+def test_large_batches_scored_in_process_pool(monkeypatch):
+    records = _records(20)
+    rows = [list(r.values()) for r in records]
+
+    with TestClient(app) as client:
+        expected = client.post("/predict", json={"records": records}).json()
+
+    monkeypatch.setattr(settings, "ADMISSION_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMISSION_LARGE_BATCH_MIN_RECORDS", 10)
+    monkeypatch.setattr(settings, "ADMISSION_LARGE_BATCH_PROCESS_WORKERS", 1)
+
+    with TestClient(app) as client:
+        pooled = client.post("/predict", json={"records": records})
+        columnar = client.post("/predict/columnar", json={"columns": API_COLUMNS, "data": rows})
+        invalid = client.post("/predict", json={"records": [{"Gender": "x"}] * 10})
+        stats = client.get("/stats/admission").json()
+
+    assert pooled.json() == expected
+    assert columnar.json() == expected
+    # Validasyon hataları pool'dan aynı 422 formatıyla döner.
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"][0]["loc"][:2] == ["body", "records"]
+    assert stats["lanes"]["large"]["admitted"] == 3
+
+
+def test_raw_braces_in_strings_do_not_trigger_413(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMISSION_MAX_RECORDS_PER_REQUEST", 1)
+    record = json.loads((ROOT / "examples/raw_request.json").read_text())["records"][0]
+    record["Contract"] = "{{{"
+
+    with TestClient(app) as client:
+        response = client.post("/predict/raw", json={"records": [record]})
+
+    # Tahmin 413'e düşerdi; kesin sayım kaydı kabul eder, bilinmeyen kategori 400 döner.
+    assert response.status_code == 400
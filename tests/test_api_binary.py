@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import API_COLUMNS, API_FEATURE_NAMES, app
+from src.binary_transport import (
+    ARROW_STREAM_CONTENT_TYPE,
+    MAGIC,
+    PREFIX,
+    TENSOR_CONTENT_TYPE,
+    decode_tensor,
+    encode_arrow,
+    encode_tensor,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _frame(n: int) -> pd.DataFrame:
+    return pd.read_csv(ROOT / "data/processed/X.csv").head(n)
+
+
+def _post(client, body, content_type):
+    return client.post("/predict/binary", content=body, headers={"content-type": content_type})
+
+
+def _payload(n: int):
+    X = _frame(n)
+    records = [dict(zip(API_COLUMNS, row)) for row in X[API_FEATURE_NAMES].to_numpy().tolist()]
+    # Kolon sırası ve isimleri (API / model) serbest; farklı sıra toplama
+    # sırasını değiştirdiği için olasılıklar ulp düzeyinde farklı olabilir.
+    columns = list(X.columns[::-1])
+    arrays = [X[c].to_numpy(dtype=np.float64) for c in columns]
+    return records, columns, arrays
+
+
+def test_tensor_payload_matches_json_predict():
+    records, columns, arrays = _payload(30)
+
+    with TestClient(app) as client:
+        expected = client.post("/predict", json={"records": records}).json()
+        tensor = _post(client, encode_tensor(columns, arrays), TENSOR_CONTENT_TYPE)
+
+    assert tensor.headers["content-type"] == TENSOR_CONTENT_TYPE
+    out_columns, out = decode_tensor(tensor.content)
+    assert out_columns == ["probability", "prediction"]
+    np.testing.assert_allclose(out[:, 0], expected["probabilities"], rtol=1e-12)
+    assert out[:, 1].astype(int).tolist() == expected["predictions"]
+
+
+def test_arrow_payload_matches_tensor():
+    pa = pytest.importorskip("pyarrow")
+    _, columns, arrays = _payload(30)
+
+    with TestClient(app) as client:
+        tensor = _post(client, encode_tensor(columns, arrays), TENSOR_CONTENT_TYPE)
+        arrow = _post(client, encode_arrow(columns, arrays), ARROW_STREAM_CONTENT_TYPE)
+
+    _, out = decode_tensor(tensor.content)
+    table = pa.ipc.open_stream(arrow.content).read_all()
+    assert table.column("probability").to_pylist() == out[:, 0].tolist()
+    assert table.column("prediction").to_pylist() == out[:, 1].astype(int).tolist()
+
+
+def test_row_major_float32_tensor_is_accepted():
+    X = _frame(5)[API_FEATURE_NAMES]
+    # Header elle kurulur: satır-major, float32 payload (hizalama zorunlu değil).
+    header = json.dumps({"columns": API_COLUMNS, "rows": len(X), "dtype": "<f4", "order": "C"})
+    body = PREFIX.pack(MAGIC, len(header)) + header.encode() + X.to_numpy("<f4").tobytes()
+
+    with TestClient(app) as client:
+        response = _post(client, body, TENSOR_CONTENT_TYPE)
+
+    assert response.status_code == 200
+    assert decode_tensor(response.content)[1].shape == (5, 2)
+
+
+def test_binary_payload_errors():
+    X = _frame(3)
+    columns = list(X.columns)
+    arrays = [X[c].to_numpy(dtype=np.float64) for c in columns]
+    good = encode_tensor(columns, arrays)
+
+    non_integer = [a.copy() for a in arrays]
+    non_integer[columns.index("Gender")][0] = 0.5
+    not_finite = [a.copy() for a in arrays]
+    not_finite[columns.index("CLTV")][1] = np.nan
+
+    with TestClient(app) as client:
+        assert _post(client, good, "application/json").status_code == 415
+        assert _post(client, good[:-8], TENSOR_CONTENT_TYPE).status_code == 400
+        assert _post(client, b"XXXX" + good[4:], TENSOR_CONTENT_TYPE).status_code == 400
+        missing = _post(client, encode_tensor(columns[1:], arrays[1:]), TENSOR_CONTENT_TYPE)
+        assert "Schema mismatch" in missing.json()["detail"]
+        bad_int = _post(client, encode_tensor(columns, non_integer), TENSOR_CONTENT_TYPE)
+        assert "integer" in bad_int.json()["detail"]
+        assert _post(client, encode_tensor(columns, not_finite), TENSOR_CONTENT_TYPE).status_code == 400
+        assert _post(client, b"not arrow", ARROW_STREAM_CONTENT_TYPE).status_code == 400
@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import API_COLUMNS, API_FEATURE_NAMES, app
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _sample_rows(n: int = 20) -> list:
+    X = pd.read_csv(ROOT / "data/processed/X.csv").head(n)
+    return X[API_FEATURE_NAMES].to_numpy().tolist()
+
+
+def test_columnar_matches_record_predict():
+    rows = _sample_rows()
+    records = [dict(zip(API_COLUMNS, row)) for row in rows]
+
+    with TestClient(app) as client:
+        record_resp = client.post("/predict", json={"records": records})
+        columnar_resp = client.post(
+            "/predict/columnar", json={"columns": API_COLUMNS, "data": rows}
+        )
+
+    assert columnar_resp.status_code == 200
+    assert columnar_resp.json() == record_resp.json()
+
+
+def test_columnar_accepts_any_column_order():
+    rows = _sample_rows(5)
+    reversed_rows = [row[::-1] for row in rows]
+
+    with TestClient(app) as client:
+        base = client.post("/predict/columnar", json={"columns": API_COLUMNS, "data": rows})
+        reordered = client.post(
+            "/predict/columnar",
+            json={"columns": API_COLUMNS[::-1], "data": reversed_rows},
+        )
+
+    # Toplama sırası değiştiği için son basamakta fark olabilir.
+    assert reordered.json()["predictions"] == base.json()["predictions"]
+    assert reordered.json()["probabilities"] == pytest.approx(base.json()["probabilities"])
+
+
+def test_columnar_schema_errors_return_400():
+    payload = json.loads((ROOT / "examples/valid_request.json").read_text())
+    record = payload["records"][0]
+
+    with TestClient(app) as client:
+        missing = client.post(
+            "/predict/columnar",
+            json={"columns": API_COLUMNS[:-1], "data": [list(record.values())[:-1]]},
+        )
+        non_integer = client.post(
+            "/predict/columnar",
+            json={"columns": API_COLUMNS, "data": [[0.5] * len(API_COLUMNS)]},
+        )
+
+    assert missing.status_code == 400
+    assert non_integer.status_code == 400
@@ -0,0 +1,31 @@
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from src.api import app
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_stream_scores_every_line_in_order():
+    record = json.loads((ROOT / "examples/valid_request.json").read_text())["records"][0]
+    bad = dict(record, Gender="not-a-number")
+    lines = [json.dumps(record)] * 3 + [json.dumps(bad)] + [json.dumps(record)]
+    body = "\n".join(lines) + "\n"
+
+    with TestClient(app) as client:
+        expected = client.post("/predict", json={"records": [record]}).json()
+        response = client.post(
+            "/predict/stream",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [r["line"] for r in results] == [1, 2, 3, 4, 5]
+    assert "error" in results[3]
+    assert results[0]["probability"] == expected["probabilities"][0]
+    assert results[4]["prediction"] == expected["predictions"][0]
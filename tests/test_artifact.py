@@ -0,0 +1,70 @@
+import copy
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.model_loader import validate_metadata
+from src.artifact import load_compact_artifact, write_compact_artifact
+from src.compiled import CompiledModel
+from src.predict import DEFAULT_MODEL_PATH, load_model
+from src.train import train_model
+
+ROOT = DEFAULT_MODEL_PATH.parent.parent
+
+
+def test_compact_artifact_matches_pickle(tmp_path):
+    model, scaler, feature_names = load_model()
+    X = pd.read_csv(ROOT / "data/processed/X.csv")[feature_names].to_numpy()
+
+    write_compact_artifact(model, scaler, feature_names, tmp_path)
+    compact = load_compact_artifact(tmp_path)
+    compiled = CompiledModel.from_artifact(model, scaler, feature_names)
+
+    assert list(compact.feature_names) == feature_names
+    np.testing.assert_array_equal(compact.predict_proba(X), compiled.predict_proba(X))
+
+
+def test_compact_artifact_detects_tampering(tmp_path):
+    model, scaler, feature_names = load_model()
+    binary_path = write_compact_artifact(model, scaler, feature_names, tmp_path)
+
+    data = bytearray(binary_path.read_bytes())
+    data[0] ^= 0xFF
+    binary_path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="checksum"):
+        load_compact_artifact(tmp_path)
+
+
+def test_republish_switches_binary_through_header(tmp_path):
+    model, scaler, feature_names = load_model()
+    first = write_compact_artifact(model, scaler, feature_names, tmp_path)
+
+    shifted = copy.deepcopy(model)
+    shifted.intercept_ = shifted.intercept_ + 1.0
+    second = write_compact_artifact(shifted, scaler, feature_names, tmp_path)
+
+    # Yeni binary ayrı isimle yazılır; eski header'ı okumuş olan hâlâ eski dosyayı açabilir.
+    assert second != first and first.exists()
+    assert load_compact_artifact(tmp_path).intercept == pytest.approx(float(shifted.intercept_[0]))
+
+    write_compact_artifact(model, scaler, feature_names, tmp_path)
+    assert sorted(p.name for p in tmp_path.glob("*.f64")) == sorted([first.name, second.name])
+
+    shifted.intercept_ = shifted.intercept_ + 1.0
+    write_compact_artifact(shifted, scaler, feature_names, tmp_path)
+    assert not second.exists()
+
+
+def test_fit_export_writes_metadata(tmp_path):
+    export_dir = tmp_path / "churn_lr_test"
+    train_model(model_path=tmp_path / "model.pkl", export_dir=export_dir)
+
+    metadata = json.loads((export_dir / "metadata.json").read_text())
+    validate_metadata(metadata)
+    assert metadata["version"] == "churn_lr_test"
+    assert metadata["features"] == list(load_compact_artifact(export_dir).feature_names)
+    assert metadata["roc_auc"] > 0.8
+    assert metadata["reference_stats"]["records"] > 0
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from src.batching import MicroBatcher
+
+
+def test_concurrent_submits_are_merged_and_fanned_out():
+    seen_sizes = []
+
+    def score(X, key):
+        seen_sizes.append(len(X))
+        return X[:, 0] * 10
+
+    async def run():
+        batcher = MicroBatcher(score, max_batch_size=64, max_wait_us=50_000)
+        await batcher.start()
+        try:
+            inputs = [np.full((i % 3 + 1, 2), float(i)) for i in range(12)]
+            results = await asyncio.gather(*(batcher.submit(X) for X in inputs))
+        finally:
+            await batcher.stop()
+        return inputs, results, batcher.stats.snapshot()
+
+    inputs, results, stats = asyncio.run(run())
+
+    # Her request kendi satırlarının sonucunu almalı.
+    for X, probs in zip(inputs, results):
+        np.testing.assert_array_equal(probs, X[:, 0] * 10)
+
+    assert len(seen_sizes) < len(inputs)
+    assert stats["records"] == sum(len(X) for X in inputs)
+    assert stats["requests"] == len(inputs)
+
+
+def test_items_are_scored_with_their_own_key():
+    calls = []
+
+    def score(X, key):
+        calls.append((key["bias"], len(X)))
+        return X[:, 0] + key["bias"]
+
+    # Pencere içinde versiyon değişse bile her kayıt kendi key'iyle skorlanır.
+    old, new = {"bias": 100.0}, {"bias": 200.0}
+
+    async def run():
+        batcher = MicroBatcher(score, max_batch_size=64, max_wait_us=50_000)
+        await batcher.start()
+        try:
+            keys = [old, new, old, new, old]
+            inputs = [np.full((1, 2), float(i)) for i in range(len(keys))]
+            results = await asyncio.gather(
+                *(batcher.submit(X, key) for X, key in zip(inputs, keys))
+            )
+        finally:
+            await batcher.stop()
+        return keys, inputs, results
+
+    keys, inputs, results = asyncio.run(run())
+
+    for key, X, probs in zip(keys, inputs, results):
+        np.testing.assert_array_equal(probs, X[:, 0] + key["bias"])
+    assert sorted(calls) == [(100.0, 3), (200.0, 2)]
+
+
+def test_group_errors_and_stop_resolve_every_future():
+    started, unblock = threading.Event(), threading.Event()
+
+    def blocking_score(X, key):
+        started.set()
+        unblock.wait(5)
+        return X[:, 0]
+
+    async def run():
+        batcher = MicroBatcher(lambda X, key: X[:, 0], max_batch_size=64, max_wait_us=20_000)
+        await batcher.start()
+        # Aynı key'de farklı kolon sayısı: vstack hatası future'lara iletilir, task yaşar.
+        bad = await asyncio.gather(
+            batcher.submit(np.zeros((1, 2))),
+            batcher.submit(np.zeros((1, 3))),
+            return_exceptions=True,
+        )
+        ok = await batcher.submit(np.ones((1, 2)))
+
+        # Skor sırasında durdurulan pencere ve kuyrukta bekleyenler de hata alır.
+        batcher.score_fn = blocking_score
+        waiting = [asyncio.ensure_future(batcher.submit(np.zeros((1, 2)))) for _ in range(3)]
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        waiting.append(asyncio.ensure_future(batcher.submit(np.zeros((1, 2)))))
+        await asyncio.sleep(0)
+        await batcher.stop()
+        unblock.set()
+        stopped = await asyncio.wait_for(asyncio.gather(*waiting, return_exceptions=True), 5)
+        return bad, ok, stopped
+
+    bad, ok, stopped = asyncio.run(run())
+
+    assert all(isinstance(e, ValueError) for e in bad)
+    np.testing.assert_array_equal(ok, [1.0])
+    assert len(stopped) == 4
+    assert all(isinstance(e, RuntimeError) for e in stopped)
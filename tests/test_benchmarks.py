@@ -0,0 +1,48 @@
+import numpy as np
+
+from benchmarks.run import compare_to_baseline, peak_memory, time_callable
+
+
+def result(case, size, min_s):
+    return {"case": case, "size": size, "median_s": min_s, "min_s": min_s, "mean_s": min_s}
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = [
+        result("predict_churn", 1000, 0.010),
+        result("predict_churn", 1, 0.000010),
+        result("load_model", None, 0.001),
+    ]
+    current = [
+        # %60 yavaş → regresyon
+        result("predict_churn", 1000, 0.016),
+        # Oran büyük ama mutlak fark gürültü seviyesinde
+        result("predict_churn", 1, 0.000030),
+        result("load_model", None, 0.0011),
+        # Baseline'da yok → karşılaştırılmaz
+        result("predict_route", 10, 0.5),
+    ]
+
+    comparisons = {c["key"]: c for c in compare_to_baseline(current, baseline, tolerance=0.5)}
+
+    assert set(comparisons) == {"predict_churn[1000]", "predict_churn[1]", "load_model[-]"}
+    assert comparisons["predict_churn[1000]"]["regressed"]
+    assert not comparisons["predict_churn[1]"]["regressed"]
+    assert not comparisons["load_model[-]"]["regressed"]
+
+
+def test_time_callable_reports_repeats():
+    calls = []
+    # min_time'a ulaşılamaz; tekrar sayısı max_repeats ile sınırlanır.
+    timing = time_callable(lambda: calls.append(1), min_time=10.0, max_repeats=5)
+
+    assert timing["repeats"] == 5
+    # Isınma koşusu ölçüme dahil değil.
+    assert len(calls) == 6
+    assert timing["min_s"] <= timing["median_s"]
+
+
+def test_peak_memory_tracks_numpy_buffers():
+    # 8 MB'lık geçici dizi tepe belleğe yansımalı.
+    peak = peak_memory(lambda: np.ones(1_000_000).sum())
+    assert 8_000_000 <= peak < 9_000_000
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import src.api as api
+from src.cache import PredictionCache
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_lru_eviction_and_version_keys():
+    cache = PredictionCache(max_entries=2)
+    X = np.arange(6, dtype=float).reshape(3, 2)
+
+    _, miss_idx, keys = cache.get_many(X, "v1")
+    cache.put_many(keys, np.array([0.1, 0.2, 0.3]))
+
+    probs, miss_idx, _ = cache.get_many(X, "v1")
+    assert list(miss_idx) == [0]
+    np.testing.assert_array_equal(probs[1:], [0.2, 0.3])
+    assert cache.evictions == 1
+
+    # Farklı model versiyonu aynı vektör için hit vermemeli.
+    _, miss_idx, _ = cache.get_many(X, "v2")
+    assert len(miss_idx) == 3
+
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.cache.time.monotonic", lambda: now[0])
+    cache = PredictionCache(max_entries=10, ttl_seconds=5)
+    X = np.ones((1, 3))
+
+    _, _, keys = cache.get_many(X, "v1")
+    cache.put_many(keys, np.array([0.5]))
+    now[0] += 10
+
+    _, miss_idx, _ = cache.get_many(X, "v1")
+    assert list(miss_idx) == [0]
+    assert cache.expirations == 1
+
+
+def test_predict_uses_cache_for_repeated_records(monkeypatch):
+    monkeypatch.setattr(api.settings, "PREDICTION_CACHE_ENABLED", True)
+    monkeypatch.setattr(api, "prediction_cache", None)
+    payload = json.loads((ROOT / "examples/valid_request.json").read_text())
+
+    with TestClient(api.app) as client:
+        first = client.post("/predict", json=payload).json()
+        second = client.post("/predict", json=payload).json()
+        stats = client.get("/stats/cache").json()
+
+    assert first == second
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_reload_does_not_serve_scores_from_replaced_model(monkeypatch):
+    monkeypatch.setattr(api.settings, "PREDICTION_CACHE_ENABLED", True)
+    monkeypatch.setattr(api, "prediction_cache", None)
+    payload = json.loads((ROOT / "examples/valid_request.json").read_text())
+
+    with TestClient(api.app) as client:
+        X = api.records_to_matrix(api.PredictionRequest(**payload).records)
+        with api.registry.acquire() as old_entry:
+            # Request eski modeli aldıktan sonra aynı versiyon yeniden yüklenir.
+            new_entry = api.registry.load(old_entry.version)
+            api.score_matrix(X, old_entry)
+        stats_before = client.get("/stats/cache").json()
+        api.score_matrix(X, new_entry)
+        stats_after = client.get("/stats/cache").json()
+
+    assert stats_before["invalidations"] >= 1
+    assert stats_after["hits"] == stats_before["hits"]
+    assert stats_after["misses"] == stats_before["misses"] + len(X)
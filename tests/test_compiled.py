@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.compiled import (
+    COMPACT_BLOCK_ROWS,
+    COMPACT_MAX_PROBABILITY_DEVIATION,
+    CompactBatch,
+    CompiledModel,
+)
+from src.predict import DEFAULT_MODEL_PATH, load_model, predict_churn
+
+ROOT = DEFAULT_MODEL_PATH.parent.parent
+
+
+def test_compiled_model_matches_predict_churn():
+    # Derlenmiş çekirdek, pandas/sklearn yolu ile aynı sonuçları üretmeli.
+    model, scaler, feature_names = load_model()
+    X = pd.read_csv(ROOT / "data/processed/X.csv")
+
+    probs, preds = predict_churn(X, model, scaler, feature_names)
+
+    compiled = CompiledModel.from_artifact(model, scaler, feature_names)
+    fast_probs, fast_preds = compiled.predict(X[feature_names].to_numpy())
+
+    np.testing.assert_allclose(fast_probs, probs.to_numpy(), rtol=0, atol=1e-12)
+    assert (fast_preds == preds.to_numpy()).all()
+
+
+def test_bind_reorders_weights_instead_of_input():
+    model, scaler, feature_names = load_model()
+    X = pd.read_csv(ROOT / "data/processed/X.csv").head(50)
+
+    compiled = CompiledModel.from_artifact(model, scaler, feature_names)
+    reversed_cols = feature_names[::-1]
+    bound = compiled.bind(reversed_cols)
+
+    np.testing.assert_allclose(
+        bound.predict_proba(X[reversed_cols].to_numpy()),
+        compiled.predict_proba(X[feature_names].to_numpy()),
+    )
+
+
+def test_compact_model_stays_within_documented_deviation():
+    model, scaler, feature_names = load_model()
+    X = pd.read_csv(ROOT / "data/processed/X.csv")
+    # Birden fazla blok: blok sınırları sonucu değiştirmemeli.
+    X = X.iloc[np.arange(COMPACT_BLOCK_ROWS + 1000) % len(X)]
+    numeric = ["Tenure Months", "Monthly Charges", "Total Charges", "CLTV"]
+
+    compiled = CompiledModel.from_artifact(model, scaler, feature_names)
+    compact = compiled.compact(numeric)
+    batch = CompactBatch(
+        X[list(compact.binary_columns)].to_numpy(np.uint8),
+        X[list(compact.numeric_columns)].to_numpy(np.float32),
+    )
+
+    probs, preds = compiled.predict(X[feature_names].to_numpy())
+    compact_probs, compact_preds = compact.predict(batch)
+
+    assert compact.numeric_columns == tuple(numeric)
+    assert np.abs(compact_probs - probs).max() <= COMPACT_MAX_PROBABILITY_DEVIATION
+    assert (compact_preds == preds).all()
+
+    with pytest.raises(ValueError):
+        compact.predict_proba(CompactBatch(batch.binary.astype(np.float64), batch.numeric))
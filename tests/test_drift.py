@@ -0,0 +1,112 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.model_loader import load_metadata
+from app.model_registry import load_compiled_version
+from src.api import API_COLUMNS, API_FEATURE_NAMES, app
+from src.drift import DriftMonitor, bin_counts, psi, reference_statistics
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _training_matrix():
+    model, metadata = load_compiled_version("churn_lr_v1")
+    X = pd.read_csv(ROOT / "data/processed/X.csv")[API_FEATURE_NAMES].to_numpy(np.float64)
+    return model.bind(API_FEATURE_NAMES), metadata, X
+
+
+def test_bin_counts_matches_searchsorted_for_small_and_large_inputs():
+    rng = np.random.default_rng(0)
+    edges = [1.0, 2.5, 4.0]
+    for values in (rng.integers(0, 6, size=50).astype(float), rng.normal(2.5, 2, size=5000)):
+        expected = np.bincount(np.searchsorted(edges, values, side="right"), minlength=4)
+        np.testing.assert_array_equal(bin_counts(values, edges), expected)
+
+
+def test_monitor_on_training_data_matches_reference():
+    api_model, metadata, X = _training_matrix()
+    monitor = DriftMonitor.from_metadata("churn_lr_v1", metadata)
+
+    # Karışık batch boyutları: küçükler tampona, büyükler doğrudan.
+    start = 0
+    for size in [1, 3, 500, 7, 2000] * 10:
+        batch = X[start:start + size]
+        monitor.observe(batch, API_FEATURE_NAMES, api_model.predict_proba(batch))
+        start += size
+    rest = X[start:]
+    monitor.observe(rest, API_FEATURE_NAMES, api_model.predict_proba(rest))
+
+    report = monitor.report()
+    assert report["records"] == len(X)
+    assert report["drifted"] == []
+    assert max(monitor.psi_values().values()) < 1e-9
+    tenure = report["features"]["Tenure Months"]
+    assert tenure["live_mean"] == pytest.approx(tenure["reference_mean"])
+    assert tenure["live_std"] == pytest.approx(tenure["reference_std"])
+    assert sum(report["groups"]["Contract"]["live"].values()) == pytest.approx(1.0)
+
+
+def test_monitor_std_is_stable_for_large_offsets():
+    api_model, metadata, X = _training_matrix()
+    monitor = DriftMonitor.from_metadata("churn_lr_v1", metadata)
+    column = API_FEATURE_NAMES.index("Tenure Months")
+    shifted = X.copy()
+    # Σx² − n·mean² bu ölçekte iptal hatasıyla varyansı kaybeder.
+    shifted[:, column] += 1e9
+
+    for batch in np.array_split(shifted, 3):
+        monitor.observe(batch, API_FEATURE_NAMES, api_model.predict_proba(batch))
+
+    live_std = monitor.report()["features"]["Tenure Months"]["live_std"]
+    assert live_std == pytest.approx(X[:, column].std(), rel=1e-6)
+
+
+def test_monitor_flags_shifted_inputs_in_any_column_order():
+    api_model, metadata, X = _training_matrix()
+    monitor = DriftMonitor.from_metadata("churn_lr_v1", metadata)
+
+    shifted = X.copy()
+    shifted[:, API_FEATURE_NAMES.index("Monthly Charges")] *= 1.5
+    # Kolon sırası ters: istatistikler yine referans sırasına yazılır.
+    reversed_columns = API_FEATURE_NAMES[::-1]
+    monitor.observe(shifted[:, ::-1], reversed_columns, api_model.predict_proba(shifted))
+
+    report = monitor.report()
+    assert "Monthly Charges" in report["drifted"]
+    assert report["continuous"]["Monthly Charges"]["status"] == "drift"
+    assert report["continuous"]["Tenure Months"]["status"] == "ok"
+    assert report["features"]["Monthly Charges"]["mean_shift"] > 0.5
+
+
+def test_reference_statistics_and_psi():
+    X = np.column_stack([np.arange(1000.0), np.tile([0.0, 1.0], 500)])
+    reference = reference_statistics(X, ["CLTV", "Contract_One year"], probs=np.linspace(0, 1, 1000))
+
+    assert reference["records"] == 1000
+    assert reference["features"]["Contract_One year"]["mean"] == 0.5
+    assert sum(reference["bins"]["CLTV"]["proportions"]) == pytest.approx(1.0)
+    assert len(reference["bins"]["CLTV"]["edges"]) == 9
+    assert psi([0.5, 0.5], [0.5, 0.5]) == 0.0
+    assert psi([0.5, 0.5], [0.9, 0.1]) > 0.2
+
+
+def test_drift_endpoint_reports_live_traffic():
+    assert "reference_stats" in load_metadata("churn_lr_v1")
+    X = pd.read_csv(ROOT / "data/processed/X.csv")[API_FEATURE_NAMES].head(20)
+    records = [dict(zip(API_COLUMNS, row)) for row in X.to_numpy().tolist()]
+
+    with TestClient(app) as client:
+        before = client.get("/drift").json()
+        client.post("/predict", json={"records": records})
+        after = client.get("/drift").json()
+        metrics = client.get("/metrics").text
+
+    assert after["enabled"] is True
+    assert after["model_version"] == "churn_lr_v1"
+    assert after["records"] == before["records"] + 20
+    assert set(after["continuous"]) == {"Tenure Months", "Monthly Charges", "Total Charges", "CLTV"}
+    assert 'churnguard_drift_psi{model_version="churn_lr_v1",feature="Contract"}' in metrics
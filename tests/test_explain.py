@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import app
+from src.compiled import CompiledModel, sigmoid
+from src.schemas import API_COLUMNS
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_top_contributions_matches_full_sort():
+    rng = np.random.default_rng(0)
+    model = CompiledModel(
+        coef=rng.normal(size=8),
+        intercept=-0.3,
+        feature_names=[f"f{i}" for i in range(8)],
+        mean=rng.normal(size=8),
+        scale=rng.uniform(0.5, 2.0, size=8),
+    )
+    X = rng.normal(size=(50, 8))
+
+    C = model.contributions(X)
+    np.testing.assert_allclose(C.sum(axis=1) + model.intercept, model.decision_function(X))
+
+    idx, values = model.top_contributions(X, 3)
+    expected = np.argsort(-np.abs(C), axis=1, kind="stable")[:, :3]
+    np.testing.assert_array_equal(idx, expected)
+    np.testing.assert_array_equal(values, np.take_along_axis(C, expected, axis=1))
+
+    # k >= feature sayısı: tüm kolonlar sıralı döner.
+    idx_all, _ = model.top_contributions(X, 20)
+    assert idx_all.shape == (50, 8)
+
+    with pytest.raises(ValueError):
+        model.top_contributions(X, 0)
+
+
+def test_explain_endpoint():
+    body = (ROOT / "examples/valid_request.json").read_bytes()
+
+    with TestClient(app) as client:
+        predicted = client.post("/predict", content=body).json()
+        response = client.post(f"/explain?top_k={len(API_COLUMNS)}", content=body)
+        top3 = client.post("/explain?top_k=3", content=body).json()
+        invalid = client.post("/explain?top_k=0", content=body)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["probabilities"] == pytest.approx(predicted["probabilities"])
+    assert sorted(result["top_features"][0]) == sorted(API_COLUMNS)
+
+    # Tüm katkılar + intercept → logit → olasılık
+    logit = sum(result["top_contributions"][0]) + result["intercept"]
+    assert sigmoid(np.array([logit]))[0] == pytest.approx(result["probabilities"][0])
+
+    assert top3["top_features"][0] == result["top_features"][0][:3]
+    magnitudes = np.abs(top3["top_contributions"][0])
+    assert list(magnitudes) == sorted(magnitudes, reverse=True)
+    assert invalid.status_code == 422
@@ -0,0 +1,59 @@
+import gzip
+import json
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from src.api import app
+from src.fast_json import choose_encoding, dumps_predictions, json_response
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_dumps_predictions_matches_json_module():
+    probs = np.random.default_rng(0).random(1000)
+    preds = (probs >= 0.5).astype(int)
+
+    decoded = json.loads(dumps_predictions(probs, preds))
+
+    assert decoded == {"probabilities": probs.tolist(), "predictions": preds.tolist()}
+
+
+def test_choose_encoding_respects_q_zero():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, deflate") is None
+    assert choose_encoding("") is None
+
+
+def test_response_compressed_only_above_threshold():
+    probs = np.linspace(0, 1, 10_000)
+    preds = (probs >= 0.5).astype(int)
+
+    small = json_response(dumps_predictions(probs[:2], preds[:2]), "gzip", compression_min_bytes=1024)
+    large = json_response(dumps_predictions(probs, preds), "gzip", compression_min_bytes=1024)
+
+    assert "content-encoding" not in small.headers
+    assert large.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(large.body))["predictions"] == preds.tolist()
+
+
+def test_predict_validation_errors_keep_fastapi_format(monkeypatch):
+    payload = json.loads((ROOT / "examples/wrong_type.json").read_text())
+    monkeypatch.setattr(settings, "RESPONSE_COMPRESSION_ENABLED", True)
+    monkeypatch.setattr(settings, "RESPONSE_COMPRESSION_MIN_BYTES", 0)
+
+    with TestClient(app) as client:
+        bad = client.post("/predict", json=payload)
+        ok = client.post(
+            "/predict",
+            json=json.loads((ROOT / "examples/valid_request.json").read_text()),
+            headers={"accept-encoding": "gzip"},
+        )
+
+    assert bad.status_code == 422
+    assert all(err["loc"][0] == "body" for err in bad.json()["detail"])
+    assert ok.status_code == 200
+    assert ok.headers["content-encoding"] == "gzip"
+    assert set(ok.json()) == {"probabilities", "predictions"}
@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import app
+from src.inference_preprocess import CategoricalEncoder, preprocess_input
+from src.schemas import API_COLUMNS, API_FEATURE_NAMES
+
+ROOT = Path(__file__).resolve().parents[1]
+MODEL_COLUMNS = json.loads((ROOT / "models/churn_lr_v1/metadata.json").read_text())["features"]
+
+
+def _raw_record() -> dict:
+    return json.loads((ROOT / "examples/raw_request.json").read_text())["records"][0]
+
+
+def test_encoder_builds_model_ordered_matrix():
+    encoder = CategoricalEncoder(MODEL_COLUMNS)
+    other = dict(_raw_record(), Gender="Female", Contract="Two year")
+
+    X = encoder.encode([_raw_record(), other])
+
+    row = dict(zip(MODEL_COLUMNS, X[0]))
+    assert X.shape == (2, len(MODEL_COLUMNS))
+    assert row["Gender"] == 1
+    assert row["Monthly Charges"] == 53.85
+    assert row["Contract_Month-to-month"] == 1
+    assert row["Multiple Lines_No"] == 1 and row["Multiple Lines_Yes"] == 0
+    assert X[1, MODEL_COLUMNS.index("Contract_Two year")] == 1
+    assert X[1, MODEL_COLUMNS.index("Gender")] == 0
+    # Her one-hot grubunda tam bir kolon set edilmeli.
+    assert X[:, [i for i, c in enumerate(MODEL_COLUMNS) if c.startswith("Contract_")]].sum() == 2
+
+
+def test_encoder_rejects_unknown_category():
+    encoder = CategoricalEncoder(MODEL_COLUMNS)
+    with pytest.raises(ValueError, match="Contract"):
+        encoder.encode([dict(_raw_record(), Contract="Three year")])
+
+
+def test_preprocess_input_rejects_unknown_category():
+    # Eski davranış (sıfır doldurma) yerine hata: sessizce yanlış skor üretilmez.
+    df = preprocess_input(_raw_record(), MODEL_COLUMNS)
+    assert list(df.columns) == MODEL_COLUMNS
+    with pytest.raises(ValueError, match="Contract") as excinfo:
+        preprocess_input(dict(_raw_record(), Contract="Three year"), MODEL_COLUMNS)
+    assert isinstance(excinfo.value.__cause__, KeyError)
+    with pytest.raises(ValueError, match="Partner"):
+        preprocess_input(dict(_raw_record(), Partner="Maybe"), MODEL_COLUMNS)
+
+
+def test_raw_endpoint_matches_encoded_predict():
+    encoder = CategoricalEncoder(MODEL_COLUMNS)
+    encoded = dict(zip(MODEL_COLUMNS, encoder.encode([_raw_record()])[0]))
+    api_record = dict(zip(API_COLUMNS, (encoded[name] for name in API_FEATURE_NAMES)))
+
+    with TestClient(app) as client:
+        raw = client.post("/predict/raw", json={"records": [_raw_record()]})
+        bad = client.post("/predict/raw", json={"records": [dict(_raw_record(), Contract="?")]})
+        expected = client.post("/predict", json={"records": [api_record]})
+
+    assert raw.status_code == 200
+    assert bad.status_code == 400
+    np.testing.assert_allclose(raw.json()["probabilities"], expected.json()["probabilities"])
+    assert raw.json()["predictions"] == expected.json()["predictions"]
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from src.api import app
+from src.metrics import Histogram
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram("test_latency_seconds", "Test.", ("stage",), buckets=(0.1, 1.0))
+    hist.observe(0.05, stage="a")
+    hist.observe(0.1, stage="a")
+    hist.observe(0.5, stage="a")
+    hist.observe(3.0, stage="a")
+
+    lines = hist.render()
+    assert 'test_latency_seconds_bucket{stage="a",le="0.1"} 2' in lines
+    assert 'test_latency_seconds_bucket{stage="a",le="1.0"} 3' in lines
+    assert 'test_latency_seconds_bucket{stage="a",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_count{stage="a"} 4' in lines
+
+
+def test_metrics_endpoint_exposes_stages_and_counters():
+    payload = json.loads((ROOT / "examples/valid_request.json").read_text())
+    with TestClient(app) as client:
+        assert client.post("/predict", json=payload).status_code == 200
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    for stage in ("parse_validate", "to_matrix", "score", "serialize", "render"):
+        assert f'churnguard_stage_duration_seconds_count{{endpoint="/predict",stage="{stage}"}}' in text
+    assert 'churnguard_requests_total{endpoint="/predict",model_version="churn_lr_v1",status="200"}' in text
+    assert 'churnguard_in_flight_requests{endpoint="/predict"} 0' in text
+
+
+def test_request_records_histogram_recorded_without_batching():
+    payload = json.loads((ROOT / "examples/valid_request.json").read_text())
+    with TestClient(app) as client:
+        assert client.post("/predict", json=payload).status_code == 200
+        text = client.get("/metrics").text
+
+    assert "# TYPE churnguard_request_records histogram" in text
+    assert 'churnguard_request_records_bucket{endpoint="/predict",le="+Inf"}' in text
+    assert 'churnguard_request_records_count{endpoint="/predict"}' in text
+    assert "churnguard_batch_size_records" not in text
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.model_registry import ModelNotLoadedError, ModelRegistry
+from src.api import app
+from src.compiled import CompiledModel
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def fake_loader(version):
+    bias = float(version.rsplit("v", 1)[-1])
+    model = CompiledModel(coef=np.zeros(2), intercept=bias, feature_names=["a", "b"])
+    return model, {"version": version}
+
+
+def test_in_flight_versions_are_not_evicted():
+    registry = ModelRegistry(loader=fake_loader, max_versions=2)
+    registry.load("v1", activate=True)
+    registry.load("v2")
+
+    with registry.acquire("v2"):
+        registry.load("v3")
+        # v2 kullanımda olduğu için bellekte kalır.
+        assert registry.get("v2").version == "v2"
+
+    # Request bitince fazla versiyon boşaltılır.
+    loaded = {m["version"] for m in registry.describe()["loaded"]}
+    assert loaded == {"v1", "v3"}
+
+    with pytest.raises(ValueError):
+        registry.unload("v1")
+    with pytest.raises(ModelNotLoadedError):
+        registry.get("v2")
+
+
+def test_background_load_swaps_active_version():
+    registry = ModelRegistry(loader=fake_loader)
+    registry.load("v1", activate=True)
+    changes = []
+    registry.add_listener(changes.append)
+
+    async def run():
+        old = registry.acquire_entry()
+        task = await registry.load_in_background("v2", activate=True)
+        await task
+        return old
+
+    old = asyncio.run(run())
+
+    assert registry.active_version == "v2"
+    assert registry.get().model.bias == 2.0
+    # Önceden alınmış referans eski modeli kullanmaya devam eder.
+    assert old.model.bias == 1.0
+    assert changes == ["v2"]
+
+
+def test_request_selects_version_by_header_or_query():
+    payload = json.loads((ROOT / "examples/valid_request.json").read_text())
+
+    with TestClient(app) as client:
+        default = client.post("/predict", json=payload)
+        by_header = client.post("/predict", json=payload, headers={"X-Model-Version": "churn_lr_v1"})
+        unknown = client.post("/predict?model_version=missing_v9", json=payload)
+        models = client.get("/models").json()
+
+    assert by_header.json() == default.json()
+    assert unknown.status_code == 404
+    assert models["active_version"] == "churn_lr_v1"
+
+
+def test_pinned_versions_are_not_evicted():
+    registry = ModelRegistry(loader=fake_loader, max_versions=2, pinned_versions=["v2"])
+    registry.load("v1", activate=True)
+    registry.load("v2")
+    registry.load("v3")
+    registry.load("v4")
+
+    # v2 (shadow) hiç kullanılmasa da kalır; yer açmak için v3 çıkarılır.
+    loaded = {m["version"] for m in registry.describe()["loaded"]}
+    assert loaded == {"v1", "v2", "v4"}
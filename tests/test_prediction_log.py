@@ -0,0 +1,94 @@
+import json
+import logging
+import threading
+import time
+
+import numpy as np
+
+from src.prediction_log import PredictionLogger
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def make_output():
+    output = logging.getLogger("test.predictions")
+    output.setLevel(logging.INFO)
+    output.propagate = False
+    handler = ListHandler()
+    output.handlers = [handler]
+    return output, handler
+
+
+def test_logs_summary_instead_of_raw_probabilities():
+    output, handler = make_output()
+    pred_logger = PredictionLogger(output=output)
+    pred_logger.start()
+    probs = np.linspace(0.0, 1.0, 10_001)
+    assert pred_logger.submit("/predict", "v1", 3.5, probs)
+    pred_logger.stop()
+
+    assert len(handler.messages) == 1
+    payload = json.loads(handler.messages[0])
+    assert payload["n_records"] == 10_001
+    assert payload["model_version"] == "v1"
+    assert payload["probability"]["p50"] == 0.5
+    assert abs(payload["probability"]["mean"] - 0.5) < 1e-12
+    assert "sampled_records" not in payload
+    assert pred_logger.stats()["written"] == 1
+
+
+def test_full_queue_drops_instead_of_blocking():
+    output, _ = make_output()
+    # Thread başlatılmadığı için kuyruk boşalmaz.
+    pred_logger = PredictionLogger(queue_size=2, output=output)
+    results = [pred_logger.submit("/predict", "v1", 1.0, np.zeros(1)) for _ in range(5)]
+
+    assert results == [True, True, False, False, False]
+    assert pred_logger.stats()["dropped"] == 3
+
+
+def test_stop_with_saturated_queue_does_not_raise():
+    output, handler = make_output()
+    gate = threading.Event()
+    # Yazma bloklanır: kuyruk dolu kalır, sentinel timeout içinde giremez.
+    output.handlers[0].emit = lambda record: (gate.wait(), handler.messages.append(record.getMessage()))
+    pred_logger = PredictionLogger(queue_size=1, output=output)
+    pred_logger.start()
+    assert pred_logger.submit("/predict", "v1", 1.0, np.zeros(1))
+    while pred_logger.stats()["queued"]:
+        time.sleep(0.001)
+    # İlk olay yazılırken bekliyor; ikincisi kuyruğu doldurur.
+    assert pred_logger.submit("/predict", "v1", 1.0, np.zeros(1))
+    thread = pred_logger._thread
+
+    try:
+        pred_logger.stop(timeout=0.05)
+    finally:
+        # Yazma açılınca thread kalan olayları yazıp kendisi çıkar.
+        gate.set()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert len(handler.messages) == pred_logger.stats()["written"] == 2
+
+
+def test_request_and_record_sampling():
+    output, handler = make_output()
+    skipped = PredictionLogger(request_sample_rate=0.0, output=output)
+    assert not skipped.submit("/predict", "v1", 1.0, np.zeros(3))
+    assert skipped.stats()["sampled_out"] == 1
+
+    every_record = PredictionLogger(record_sample_rate=1.0, output=output)
+    assert every_record.submit("/predict", "v1", 1.0, np.array([0.2, 0.8]))
+    payload = json.loads(every_record.format_event(every_record._queue.get_nowait()))
+    assert payload["sampled_records"] == [
+        {"index": 0, "probability": 0.2},
+        {"index": 1, "probability": 0.8},
+    ]
+    assert payload["positive_rate"] == 0.5
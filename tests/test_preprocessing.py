@@ -0,0 +1,58 @@
+import json
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import preprocessing
+from src.inference_preprocess import CategoricalEncoder
+from src.preprocessing import run_pipeline
+
+ROOT = Path(__file__).resolve().parents[1]
+MODEL_COLUMNS = json.loads((ROOT / "models/churn_lr_v1/metadata.json").read_text())["features"]
+
+
+def test_encode_frame_matches_record_encoder():
+    records = json.loads((ROOT / "examples/raw_request.json").read_text())["records"]
+    records = records + [dict(records[0], Gender="Female", Contract="Two year")]
+    encoder = CategoricalEncoder(MODEL_COLUMNS)
+
+    np.testing.assert_array_equal(
+        encoder.encode_frame(pd.DataFrame(records)),
+        encoder.encode(records),
+    )
+
+    # Bilinmeyen kategori pandas uyarısına değil, açık kontrole takılır.
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with pytest.raises(ValueError, match="Unknown value 'Weekly' for Contract"):
+            encoder.encode_frame(pd.DataFrame([dict(records[0], Contract="Weekly")]))
+
+
+def test_pipeline_reproduces_processed_data_and_skips_unchanged_stages(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    output_dir = tmp_path / "processed"
+    cache_dir = tmp_path / "cache"
+
+    result = run_pipeline(output_dir=output_dir, cache_dir=cache_dir, features=MODEL_COLUMNS)
+
+    assert result.ran_stages == ["convert", "encode"]
+    X = pd.read_csv(result.X_path)
+    assert list(X.columns) == MODEL_COLUMNS
+    assert result.X_path.read_bytes() == (ROOT / "data/processed/X.csv").read_bytes()
+    assert result.y_path.read_bytes() == (ROOT / "data/processed/y.csv").read_bytes()
+
+    # Excel bir daha parse edilmemeli.
+    def fail(*args, **kwargs):
+        raise AssertionError("raw source re-read")
+
+    monkeypatch.setattr(preprocessing, "read_raw_source", fail)
+    assert run_pipeline(output_dir=output_dir, cache_dir=cache_dir, features=MODEL_COLUMNS).ran_stages == []
+
+    # Çıktı değişirse sadece encode aşaması (Parquet cache'ten) yeniden çalışır.
+    result.X_path.write_text("stale")
+    rerun = run_pipeline(output_dir=output_dir, cache_dir=cache_dir, features=MODEL_COLUMNS)
+    assert rerun.ran_stages == ["encode"]
+    assert result.X_path.read_bytes() == (ROOT / "data/processed/X.csv").read_bytes()
@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import app
+from src.schemas import API_COLUMNS, API_FEATURE_NAMES
+from src.compiled import COMPACT_MAX_PROBABILITY_DEVIATION
+from src.score import chunk_to_compact, score_file
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_score_file_matches_predict_and_resumes(tmp_path):
+    X = pd.read_csv(ROOT / "data/processed/X.csv").head(250)
+    input_path = tmp_path / "input.csv"
+    output_path = tmp_path / "scores.csv"
+    X.to_csv(input_path, index=False)
+
+    rows = score_file(input_path, output_path, chunksize=100, workers=1)
+    scored = pd.read_csv(output_path, float_precision="round_trip")
+
+    records = [dict(zip(API_COLUMNS, row)) for row in X[API_FEATURE_NAMES].to_numpy().tolist()]
+    with TestClient(app) as client:
+        expected = client.post("/predict", json={"records": records}).json()
+
+    assert rows == len(X)
+    assert scored["probability"].tolist() == expected["probabilities"]
+    assert scored["prediction"].tolist() == expected["predictions"]
+
+    # Tamamlanmış bir koşu resume edilirse çıktı değişmemeli.
+    before = output_path.read_bytes()
+    score_file(input_path, output_path, chunksize=100, workers=1, resume=True)
+    assert output_path.read_bytes() == before
+
+
+def test_compact_scoring_matches_float64_within_tolerance(tmp_path):
+    X = pd.read_csv(ROOT / "data/processed/X.csv").head(250)
+    input_path = tmp_path / "input.csv"
+    X.to_csv(input_path, index=False)
+
+    score_file(input_path, tmp_path / "scores.csv", chunksize=100, workers=1)
+    score_file(input_path, tmp_path / "compact.csv", chunksize=100, workers=1, compact=True)
+    expected = pd.read_csv(tmp_path / "scores.csv", float_precision="round_trip")
+    compact = pd.read_csv(tmp_path / "compact.csv", float_precision="round_trip")
+
+    deviation = np.abs(compact["probability"] - expected["probability"]).max()
+    assert deviation <= COMPACT_MAX_PROBABILITY_DEVIATION
+    assert compact["prediction"].tolist() == expected["prediction"].tolist()
+
+    # uint8 okunmamış (ör. Parquet) kaynakta binary kolonlar kontrol edilir.
+    bad = X.copy()
+    bad["Gender"] = 0.5
+    with pytest.raises(ValueError, match="0-255"):
+        chunk_to_compact(bad)
+
+
+def test_score_file_rejects_missing_values_and_mode_switch_on_resume(tmp_path):
+    X = pd.read_csv(ROOT / "data/processed/X.csv").head(50)
+    input_path = tmp_path / "input.csv"
+    output_path = tmp_path / "scores.csv"
+    X.to_csv(input_path, index=False)
+
+    score_file(input_path, output_path, chunksize=20, workers=1, compact=True)
+    # Progress --compact'ı kaydeder; float64 yoluyla devam edilemez.
+    with pytest.raises(ValueError, match="--compact"):
+        score_file(input_path, output_path, chunksize=20, workers=1, resume=True)
+
+    missing = X.astype({"CLTV": float})
+    missing.loc[30, "CLTV"] = np.nan
+    missing.to_csv(input_path, index=False)
+    for compact in (False, True):
+        with pytest.raises(ValueError, match="CLTV"):
+            score_file(input_path, output_path, chunksize=20, workers=1, compact=compact)
+
+
+def test_columnar_inputs_are_read_by_workers_in_ranges(tmp_path):
+    pytest.importorskip("pyarrow")
+    X = pd.read_csv(ROOT / "data/processed/X.csv").head(250)
+    X.to_csv(tmp_path / "input.csv", index=False)
+    X.to_parquet(tmp_path / "input.parquet", row_group_size=60)
+    X.to_feather(tmp_path / "input.feather")
+
+    outputs = {}
+    for name, workers in (("input.csv", 2), ("input.parquet", 1), ("input.feather", 1)):
+        output_path = tmp_path / f"{name}.scores.csv"
+        assert score_file(tmp_path / name, output_path, chunksize=100, workers=workers) == len(X)
+        outputs[name] = output_path.read_bytes()
+
+    assert outputs["input.parquet"] == outputs["input.csv"]
+    assert outputs["input.feather"] == outputs["input.csv"]
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.model_registry import load_compiled_version
+from src.api import app
+from src.schemas import API_FEATURE_NAMES
+from src.score_store import ScoreStore, ingest_file
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _inputs(n: int):
+    X = pd.read_csv(ROOT / "data/processed/X.csv").head(n)
+    ids = [f"{i:04d}" for i in range(n)]
+    return ids, X
+
+
+def test_ingest_rescores_only_new_changed_or_stale_customers(tmp_path):
+    ids, X = _inputs(50)
+    model = load_compiled_version("churn_lr_v1")[0].bind(API_FEATURE_NAMES)
+    matrix = X[API_FEATURE_NAMES].to_numpy(dtype=np.float64)
+    store = ScoreStore(tmp_path / "scores.sqlite")
+
+    first = store.ingest(ids, matrix, model, "v1")
+    assert (first.new, first.scored) == (50, 50)
+    assert store.ingest(ids, matrix, model, "v1").unchanged == 50
+
+    changed = matrix.copy()
+    changed[3, API_FEATURE_NAMES.index("Monthly Charges")] += 10.0
+    second = store.ingest(ids, changed, model, "v1")
+    assert (second.changed, second.unchanged, second.scored) == (1, 49, 1)
+
+    # Model versiyonu değişince feature'ları aynı olanlar da yeniden skorlanır.
+    third = store.ingest(ids[:10], changed[:10], model, "v2")
+    assert (third.stale, third.scored) == (10, 10)
+
+    probs = model.predict_proba(changed)
+    top = store.top_k(5)
+    assert [c["probability"] for c in top] == sorted(probs, reverse=True)[:5]
+    assert [c["customer_id"] for c in top] == [ids[i] for i in np.argsort(-probs, kind="stable")[:5]]
+    assert all(c["model_version"] == "v2" for c in store.top_k(50, model_version="v2"))
+    assert len(store.top_k(50, model_version="v2")) == 10
+    store.close()
+
+
+def test_ingest_file_and_top_risk_endpoint(tmp_path, monkeypatch):
+    ids, X = _inputs(40)
+    input_path = tmp_path / "customers.csv"
+    X.assign(CustomerID=ids).to_csv(input_path, index=False)
+    store_path = tmp_path / "scores.sqlite"
+
+    stats = ingest_file(input_path, store_path, id_column="CustomerID", chunksize=15)
+    assert (stats.rows, stats.new) == (40, 40)
+    assert ingest_file(input_path, store_path, id_column="CustomerID").scored == 0
+
+    with TestClient(app) as client:
+        assert client.get("/top-risk").status_code == 404
+
+    monkeypatch.setattr(settings, "SCORE_STORE_PATH", str(store_path))
+    monkeypatch.setattr(settings, "TOP_RISK_MAX_K", 20)
+    with TestClient(app) as client:
+        response = client.get("/top-risk", params={"k": 3})
+        too_many = client.get("/top-risk", params={"k": 21})
+        invalid = client.get("/top-risk", params={"k": 0})
+
+    body = response.json()
+    assert body["k"] == 3
+    # ID'ler sayıya çevrilmeden saklanır (baştaki sıfırlar korunur).
+    assert all(len(c["customer_id"]) == 4 for c in body["customers"])
+    probabilities = [c["probability"] for c in body["customers"]]
+    assert probabilities == sorted(probabilities, reverse=True)
+    assert too_many.status_code == 400
+    assert invalid.status_code == 422
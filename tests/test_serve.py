@@ -0,0 +1,82 @@
+import json
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/models", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError("server did not start")
+
+
+def test_prefork_workers_serve_and_stop_gracefully():
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.serve", "--workers", "2", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        wait_until_ready(port)
+        body = (ROOT / "examples/valid_request.json").read_bytes()
+        for _ in range(10):
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{port}/predict",
+                data=body,
+                headers={"content-type": "application/json"},
+            )
+            with urllib.request.urlopen(request, timeout=5) as response:
+                assert response.status == 200
+                assert "probabilities" in json.loads(response.read())
+
+        # Registry worker başına: çok worker'lı modda versiyon değişikliği reddedilir.
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{port}/models/v1/activate", data=b"", method="POST"
+        )
+        try:
+            urllib.request.urlopen(request, timeout=5)
+            raise AssertionError("expected 409")
+        except urllib.error.HTTPError as e:
+            assert e.code == 409
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        _, stderr = proc.communicate(timeout=30)
+
+    assert proc.returncode == 0
+    log = stderr.decode()
+    # Worker'lar modeli parent'tan devralır, tekrar yüklemez.
+    assert log.count("Using preloaded model artifacts") == 2
+    assert "Worker died" not in log
+
+
+def test_preload_skips_broken_shadow_version(monkeypatch, caplog):
+    from app.config import settings
+    from app.model_registry import registry
+    from src import serve
+
+    monkeypatch.setattr(settings, "SHADOW_MODEL_VERSIONS", ["does-not-exist"])
+    monkeypatch.setattr(serve.gc, "freeze", lambda: None)
+    serve.preload_app()
+
+    assert not registry.is_loaded("does-not-exist")
+    assert "Failed to preload shadow model version" in caplog.text
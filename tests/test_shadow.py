@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.model_registry import load_compiled_version, registry
+from src.api import app
+from src.compiled import CompiledModel
+from src.shadow import ShadowScorer, StackedModel
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _models():
+    rng = np.random.default_rng(0)
+    names = [f"f{i}" for i in range(6)]
+    primary = CompiledModel(rng.normal(size=6), 0.1, names, rng.normal(size=6), np.ones(6))
+    shadow = CompiledModel(rng.normal(size=6), -0.2, names, rng.normal(size=6), np.ones(6))
+    return primary, shadow, rng.normal(size=(200, 6))
+
+
+def test_stacked_model_scores_all_versions_in_one_matmul():
+    primary, shadow, X = _models()
+    stacked = StackedModel(["v1", "v2"], [primary, shadow])
+
+    logits = stacked.decision_function(X)
+
+    assert logits.shape == (200, 2)
+    np.testing.assert_allclose(logits[:, 0], primary.decision_function(X))
+    np.testing.assert_allclose(logits[:, 1], shadow.decision_function(X))
+
+
+def test_shadow_scorer_returns_primary_and_records_disagreement():
+    primary, shadow, X = _models()
+    scorer = ShadowScorer(["v2"], queue_size=1)
+
+    probs = scorer.predict_proba(X, "v1", primary, [("v2", shadow)])
+    np.testing.assert_allclose(probs, primary.predict_proba(X))
+
+    # Kuyruk dolu (thread başlatılmadı): batch düşürülür, response etkilenmez.
+    np.testing.assert_allclose(
+        scorer.predict_proba(X, "v1", primary, [("v2", shadow)]), primary.predict_proba(X)
+    )
+    assert scorer.snapshot()["dropped"] == 1
+
+    scorer.start()
+    scorer.stop()
+
+    stats = scorer.snapshot()["versions"]
+    expected = np.mean((primary.predict_proba(X) >= 0.5) != (shadow.predict_proba(X) >= 0.5))
+    assert stats["v1"]["records"] == stats["v2"]["records"] == 200
+    assert stats["v2"]["disagreement_rate"] == pytest.approx(expected)
+    assert sum(stats["v2"]["probability_histogram"].values()) == 200
+    assert "disagreement_rate" not in stats["v1"]
+
+
+def test_stop_with_saturated_queue_does_not_raise(monkeypatch):
+    primary, shadow, X = _models()
+    scorer = ShadowScorer(["v2"], queue_size=1)
+    gate = threading.Event()
+    observe = scorer.observe
+    # İşleme bloklanır: kuyruk dolu kalır, sentinel timeout içinde giremez.
+    monkeypatch.setattr(scorer, "observe", lambda *args: (gate.wait(), observe(*args)))
+    scorer.start()
+    scorer.predict_proba(X, "v1", primary, [("v2", shadow)])
+    while scorer.snapshot()["queued"]:
+        time.sleep(0.001)
+    # İlk batch işlenirken bekliyor; ikincisi kuyruğu doldurur.
+    scorer.predict_proba(X, "v1", primary, [("v2", shadow)])
+    thread = scorer._thread
+
+    try:
+        scorer.stop(timeout=0.05)
+    finally:
+        # İşleme açılınca thread kalan batch'leri işleyip kendisi çıkar.
+        gate.set()
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert scorer.snapshot()["batches"] == 2
+
+
+def test_predict_with_shadow_version(monkeypatch):
+    def loader(version):
+        if version != "shadow_test":
+            return load_compiled_version(version)
+        model, metadata = load_compiled_version(settings.MODEL_VERSION)
+        # Aynı model, kaydırılmış intercept: bazı kayıtlarda tahmin değişir.
+        shifted = CompiledModel(model.coef, model.intercept - 0.5, model.feature_names, model.mean, model.scale)
+        return shifted, dict(metadata, version=version)
+
+    monkeypatch.setattr(registry, "loader", loader)
+    monkeypatch.setattr(settings, "SHADOW_MODEL_VERSIONS", ["shadow_test"])
+    body = (ROOT / "examples/valid_request.json").read_bytes()
+    record = json.loads(body)["records"][0]
+    # Columnar request ters kolon sırasıyla; cache kapalıyken de shadow'a gitmeli.
+    columns = list(record)[::-1]
+    columnar = {"columns": columns, "data": [[record[c] for c in columns]]}
+
+    try:
+        with TestClient(app) as client:
+            primary = client.post("/predict", content=body).json()
+            columnar_primary = client.post("/predict/columnar", json=columnar).json()
+            deadline = time.monotonic() + 5
+            stats = client.get("/stats/shadow").json()
+            while stats["batches"] < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+                stats = client.get("/stats/shadow").json()
+            metrics = client.get("/metrics").text
+    finally:
+        registry.unload("shadow_test")
+
+    # Response sadece aktif versiyondan.
+    assert primary["probabilities"][0] == pytest.approx(0.5448857, abs=1e-6)
+    assert stats["enabled"] is True
+    shadow = stats["versions"]["shadow_test"]
+    assert columnar_primary["probabilities"] == pytest.approx(primary["probabilities"])
+    assert shadow["records"] == 2
+    assert shadow["mean_probability"] < primary["probabilities"][0]
+    assert 'churnguard_shadow_disagreement_ratio{model_version="shadow_test"}' in metrics
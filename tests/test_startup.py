@@ -0,0 +1,39 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+import src.api as api
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_api_import_does_not_load_heavy_dependencies():
+    # Temiz bir interpreter'da: test oturumunda pandas zaten yüklü olabilir.
+    code = (
+        "import sys; import src.api; "
+        "print(','.join(m for m in ('pandas', 'sklearn', 'joblib', 'scipy') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_health_and_readiness_endpoints():
+    client = TestClient(api.app)
+    # Startup çalışmadan: process canlı ama hazır değil.
+    assert client.get("/healthz").json() == {"status": "ok"}
+    assert client.get("/readyz").status_code == 503
+
+    with client:
+        ready = client.get("/readyz")
+        metrics = client.get("/metrics").text
+
+    assert ready.status_code == 200
+    body = ready.json()
+    assert body["model_version"] == "churn_lr_v1"
+    assert set(body["startup_seconds"]) == {"import", "model_load", "bind", "warmup", "startup"}
+    assert 'churnguard_startup_seconds{stage="warmup"}' in metrics
+    assert client.get("/readyz").status_code == 503
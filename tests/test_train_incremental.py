@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import roc_auc_score
+
+from app.model_loader import validate_metadata
+from src.compiled import CompiledModel
+from src.predict import DEFAULT_MODEL_PATH, load_model
+from src.train import DEFAULT_X_PATH, DEFAULT_Y_PATH, iter_training_chunks, train_model_incremental
+
+
+def _auc(model, scaler, feature_names) -> float:
+    X = pd.read_csv(DEFAULT_X_PATH)[feature_names]
+    y = pd.read_csv(DEFAULT_Y_PATH).iloc[:, 0]
+    return roc_auc_score(y, model.predict_proba(scaler.transform(X))[:, 1])
+
+
+def test_incremental_training_writes_same_artifact(tmp_path):
+    model_path = tmp_path / "model.pkl"
+    train_model_incremental(model_path=model_path, chunksize=2000, epochs=3)
+
+    model, scaler, feature_names = load_model(model_path)
+    X = pd.read_csv(DEFAULT_X_PATH)
+
+    assert feature_names == list(X.columns)
+    assert scaler.n_samples_seen_ == len(X)
+    np.testing.assert_allclose(scaler.mean_, X.to_numpy().mean(axis=0))
+    assert _auc(model, scaler, feature_names) > 0.75
+
+    # Serving tarafı değişmeden yükleyebilmeli.
+    compiled = CompiledModel.from_artifact(model, scaler, feature_names)
+    X_values = X.to_numpy()[:100]
+    np.testing.assert_allclose(
+        compiled.predict_proba(X_values),
+        model.predict_proba(scaler.transform(X.iloc[:100]))[:, 1],
+        rtol=1e-9,
+    )
+
+
+def test_incremental_export_writes_metadata(tmp_path):
+    export_dir = tmp_path / "churn_sgd_test"
+    train_model_incremental(
+        model_path=tmp_path / "model.pkl", chunksize=2000, epochs=1, export_dir=export_dir
+    )
+
+    metadata = json.loads((export_dir / "metadata.json").read_text())
+    validate_metadata(metadata)
+    assert metadata["version"] == "churn_sgd_test"
+    assert metadata["hyperparameters"]["epochs"] == 1
+    assert metadata["roc_auc"] > 0.75
+
+
+def test_warm_start_keeps_base_quality(tmp_path):
+    base_model, base_scaler, feature_names = load_model()
+    model_path = tmp_path / "model.pkl"
+
+    model, scaler, _ = train_model_incremental(
+        model_path=model_path,
+        chunksize=2000,
+        epochs=1,
+        warm_start=DEFAULT_MODEL_PATH,
+    )
+
+    assert scaler.n_samples_seen_ == base_scaler.n_samples_seen_
+    assert _auc(model, scaler, feature_names) > _auc(base_model, base_scaler, feature_names) - 0.01
+
+
+def test_iter_training_chunks_rejects_mismatched_rows(tmp_path):
+    x_path = tmp_path / "X.csv"
+    y_path = tmp_path / "y.csv"
+    pd.DataFrame({"a": range(5)}).to_csv(x_path, index=False)
+    pd.DataFrame({"y": [0, 1, 0]}).to_csv(y_path, index=False)
+
+    with pytest.raises(ValueError, match="different numbers of rows"):
+        list(iter_training_chunks(x_path, y_path, chunksize=2))
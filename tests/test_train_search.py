@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.artifact import load_compact_artifact
+from src.train import (
+    DEFAULT_SEARCH_GRID,
+    DEFAULT_X_PATH,
+    DEFAULT_Y_PATH,
+    build_cv_folds,
+    load_training_data,
+    search_and_train,
+    search_candidates,
+)
+
+
+def test_search_candidates_grid_and_random_sample():
+    grid = search_candidates(DEFAULT_SEARCH_GRID)
+    sample = search_candidates(DEFAULT_SEARCH_GRID, n_iter=5, random_state=0)
+
+    assert len(grid) == int(np.prod([len(v) for v in DEFAULT_SEARCH_GRID.values()]))
+    assert len(sample) == 5
+    assert all(c in grid for c in sample)
+    assert sample == search_candidates(DEFAULT_SEARCH_GRID, n_iter=5, random_state=0)
+
+
+def test_cv_folds_scale_on_train_part_only():
+    X, y = load_training_data(DEFAULT_X_PATH, DEFAULT_Y_PATH)
+    folds = build_cv_folds(X.to_numpy(dtype=np.float64), y.to_numpy(), n_folds=3)
+
+    assert sum(len(f.y_val) for f in folds) == len(y)
+    for fold in folds:
+        np.testing.assert_allclose(fold.X_train.mean(axis=0), 0.0, atol=1e-9)
+        # Pozitif oran her fold'da korunur (stratified).
+        assert abs(fold.y_val.mean() - y.mean()) < 0.01
+
+
+def test_search_writes_versioned_model_with_measured_metrics(tmp_path):
+    grid = {"C": [0.1, 1.0], "class_weight": ["balanced"], "solver": ["lbfgs"]}
+
+    metadata = search_and_train("churn_lr_test", models_dir=tmp_path, grid=grid, n_folds=3, workers=2)
+
+    model_dir = tmp_path / "churn_lr_test"
+    assert json.loads((model_dir / "metadata.json").read_text()) == metadata
+    assert metadata["roc_auc"] == pytest.approx(np.mean(metadata["cv"]["fold_roc_auc"]), abs=1e-4)
+    assert 0.8 < metadata["roc_auc"] < 0.95
+    assert metadata["hyperparameters"]["C"] in (0.1, 1.0)
+    assert len(metadata["search"]) == 2
+    assert metadata["timings"]["final_fit_seconds"] > 0
+    assert list(load_compact_artifact(model_dir).feature_names) == metadata["features"]
+    # Drift referansı eğitim anında yazılır.
+    assert metadata["reference_stats"]["records"] == 7043
+    assert set(metadata["reference_stats"]["features"]) == set(metadata["features"])
+
+    with pytest.raises(FileExistsError):
+        search_and_train("churn_lr_test", models_dir=tmp_path, grid=grid, n_folds=3, workers=1)
+
+
+def test_search_random_state_reaches_cv_solvers(monkeypatch):
+    from src import train
+
+    seeds = []
+    original = train.LogisticRegression
+
+    def recording(**kwargs):
+        seeds.append(kwargs["random_state"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(train, "LogisticRegression", recording)
+    X, y = load_training_data(DEFAULT_X_PATH, DEFAULT_Y_PATH)
+    grid = {"C": [1.0], "class_weight": ["balanced"], "solver": ["liblinear"]}
+
+    train.run_search(
+        X.to_numpy(dtype=np.float64),
+        y.to_numpy(),
+        search_candidates(grid),
+        n_folds=2,
+        random_state=7,
+    )
+
+    assert seeds == [7, 7]